@@ -1,10 +1,94 @@
+import glob
+import json
+from collections import OrderedDict
+
 import pygame
 
 
 class AudioManager():
+  # Channels kept out of pygame's automatic allocation, e.g. channel 0 for footsteps
+  RESERVED_CHANNELS: int = 1
+  # Upper bound for decoded sound data kept in the sound bank (bytes)
+  SOUND_CACHE_LIMIT: int = 32 * 1024 * 1024
+
+  sounds: OrderedDict[str, pygame.mixer.Sound] = OrderedDict()
+  sound_sizes: dict[str, int] = {}
+  sound_cache_size: int = 0
+  channels: dict[int, pygame.mixer.Channel] = {}
+
   @staticmethod
-  def init():
+  def init(preload: bool = True):
     pygame.mixer.init()
+    AudioManager.reserve_channels(AudioManager.RESERVED_CHANNELS)
+
+    if preload:
+      AudioManager.preload_map_sounds()
+
+  @staticmethod
+  def reserve_channels(count: int):
+    pygame.mixer.set_reserved(count)
+
+    for channel in range(count):
+      AudioManager.get_channel(channel)
+
+  @staticmethod
+  def get_channel(channel: int) -> pygame.mixer.Channel:
+    channel_obj = AudioManager.channels.get(channel)
+
+    if channel_obj is None:
+      channel_obj = pygame.mixer.Channel(channel)
+      AudioManager.channels[channel] = channel_obj
+
+    return channel_obj
+
+  @staticmethod
+  def get_sound(name: str) -> pygame.mixer.Sound:
+    sound = AudioManager.sounds.get(name)
+
+    if sound is not None:
+      AudioManager.sounds.move_to_end(name)
+      return sound
+
+    sound = pygame.mixer.Sound(f"./assets/audio/{name}.mp3")
+
+    frequency, size, channels = pygame.mixer.get_init()
+    sound_size = int(sound.get_length() * frequency * channels * abs(size) // 8)
+
+    AudioManager.sounds[name] = sound
+    AudioManager.sound_sizes[name] = sound_size
+    AudioManager.sound_cache_size += sound_size
+
+    # Evict least recently used sounds, but always keep the one just loaded
+    while AudioManager.sound_cache_size > AudioManager.SOUND_CACHE_LIMIT and len(AudioManager.sounds) > 1:
+      evicted, _ = AudioManager.sounds.popitem(last = False)
+      AudioManager.sound_cache_size -= AudioManager.sound_sizes.pop(evicted)
+
+    return sound
+
+  @staticmethod
+  def preload_map_sounds():
+    """Decode the walk sound of every map ahead of time"""
+    names: set[str] = set()
+
+    for path in glob.glob("./assets/map/*/map.meta.json"):
+      with open(path, "r", encoding = "utf-8") as f:
+        json_data = json.load(f)
+
+      walk_sound = json_data.get("walk_sound", "")
+      if walk_sound and walk_sound.strip() != "":
+        names.add(walk_sound)
+
+    for name in names:
+      try:
+        AudioManager.get_sound(name)
+      except FileNotFoundError:
+        continue
+
+  @staticmethod
+  def clear_sounds():
+    AudioManager.sounds.clear()
+    AudioManager.sound_sizes.clear()
+    AudioManager.sound_cache_size = 0
 
   @staticmethod
   def play_background_music(name: str):
@@ -17,19 +101,20 @@ class AudioManager():
   def play_sound(name: str, channel: int = 0, override: bool = False):
     if not name or name.strip() == "":
       return
-    sound = pygame.mixer.Sound(f"./assets/audio/{name}.mp3")
+    channel_obj = AudioManager.get_channel(channel)
     
-    if pygame.mixer.Channel(channel).get_busy():
-      if override:
-        pygame.mixer.Channel(channel).play(sound)
-      else:
-        return
-    else:
-      pygame.mixer.Channel(channel).play(sound)
+    if channel_obj.get_busy() and not override:
+      return
+
+    channel_obj.play(AudioManager.get_sound(name))
+
+  @staticmethod
+  def is_playing(channel: int = 0) -> bool:
+    return AudioManager.get_channel(channel).get_busy()
 
   @staticmethod
   def stop_sound(channel: int = 0):
-    pygame.mixer.Channel(channel).stop()
+    AudioManager.get_channel(channel).stop()
 
   @staticmethod
   def stop_background_music():
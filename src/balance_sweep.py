@@ -0,0 +1,224 @@
+import os
+# Worker processes import pygame too, keep the banner out of the output
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Iterator, List
+import argparse
+import csv
+import itertools
+import json
+import sys
+
+from src.battle_helper import BattleData
+from src.battle_simulator import POLICIES, BattleSimulator, derive_seed
+
+
+COLUMNS: List[str] = [
+  "key",
+  "boss",
+  "level",
+  "loadout",
+  "policy",
+  "seed",
+  "battles",
+  "wins",
+  "timeouts",
+  "win_rate",
+  "mean_turns",
+  "p50_turns",
+  "p90_turns",
+  "damage_per_turn",
+  "damage_taken_per_turn"
+]
+
+
+@dataclass(frozen = True)
+class SweepTask:
+  boss: str
+  level: int
+  # Skill ids, empty for the skills in player.meta.json
+  loadout: tuple[str, ...]
+  policy: str
+  seed: int
+  battles: int
+  max_turns: int
+
+  @property
+  def loadout_name(self) -> str:
+    return "+".join(self.loadout) if self.loadout else "default"
+
+  @property
+  def key(self) -> str:
+    """Identifies the task in the output file, finished keys are skipped when resuming"""
+    # Everything the result depends on, a run with another seed or turn limit starts over
+    return (
+      f"{self.boss}|{self.level}|{self.loadout_name}|{self.policy}|{self.battles}"
+      f"|{self.seed}|{self.max_turns}"
+    )
+
+
+def run_task(task: SweepTask) -> dict:
+  """Runs in a worker process"""
+  simulator = BattleSimulator(max_turns = task.max_turns)
+  result = simulator.simulate(
+    task.boss,
+    task.level,
+    battles = task.battles,
+    policy = task.policy,
+    skill_ids = list(task.loadout) if task.loadout else None,
+    seed = task.seed
+  )
+
+  row = result.to_dict()
+  row.update({
+    "key": task.key,
+    "loadout": task.loadout_name,
+    "seed": task.seed
+  })
+  return row
+
+
+class ResultWriter():
+  """Appends one row per finished task as CSV or JSON lines, depending on the file extension"""
+
+  def __init__(self, path: str):
+    self.path: str = path
+    self.is_csv: bool = path.lower().endswith(".csv")
+
+    self.finished: set[str] = self._read_finished()
+
+    new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+    self.file = open(path, "a", encoding = "utf-8", newline = "")
+    self.csv_writer: csv.DictWriter | None = None
+
+    if self.is_csv:
+      self.csv_writer = csv.DictWriter(self.file, fieldnames = COLUMNS)
+      if new_file:
+        self.csv_writer.writeheader()
+
+  def _read_finished(self) -> set[str]:
+    finished = set()
+    if not os.path.exists(self.path):
+      return finished
+
+    with open(self.path, "r", encoding = "utf-8", newline = "") as f:
+      if self.is_csv:
+        for row in csv.DictReader(f):
+          if row.get("key"):
+            finished.add(row["key"])
+      else:
+        for line in f:
+          try:
+            finished.add(json.loads(line)["key"])
+          except (ValueError, KeyError):
+            # A line cut off by an interrupted run, the task simply runs again
+            continue
+
+    return finished
+
+  def write(self, row: dict):
+    if self.csv_writer is not None:
+      self.csv_writer.writerow(row)
+    else:
+      self.file.write(json.dumps(row, ensure_ascii = False) + "\n")
+
+    # Rows written so far survive an interrupted sweep
+    self.file.flush()
+    self.finished.add(row["key"])
+
+  def close(self):
+    self.file.close()
+
+
+def build_tasks(args: argparse.Namespace) -> Iterator[SweepTask]:
+  bosses = args.boss if args.boss else BattleData.get_boss_names()
+  policies = args.policy if args.policy else ["all"]
+
+  loadouts: List[tuple[str, ...]] = []
+  for loadout in args.loadout or ["default"]:
+    loadouts.append(() if loadout == "default" else tuple(loadout.split(",")))
+  if args.loadout_size:
+    with open(BattleData.SKILLS_PATH, "r", encoding = "utf-8") as f:
+      skill_ids = list(json.load(f).keys())
+    loadouts.extend(itertools.combinations(skill_ids, args.loadout_size))
+
+  for boss in bosses:
+    for level in args.levels:
+      for loadout in loadouts:
+        for policy in policies:
+          yield SweepTask(
+            boss = boss,
+            level = level,
+            loadout = loadout,
+            policy = policy,
+            seed = derive_seed(args.seed, boss, level, "+".join(loadout), policy),
+            battles = args.battles,
+            max_turns = args.max_turns
+          )
+
+
+def parse_levels(text: str) -> List[int]:
+  """"1-7" or "1,3,5" """
+  levels = []
+  for part in text.split(","):
+    if "-" in part:
+      start, end = part.split("-")
+      levels.extend(range(int(start), int(end) + 1))
+    else:
+      levels.append(int(part))
+  return levels
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+  parser = argparse.ArgumentParser(description = "Simulate every boss against every player level on all CPU cores")
+  parser.add_argument("-o", "--output", default = "balance.csv", help = ".csv or .jsonl, existing results are kept and skipped")
+  parser.add_argument("--levels", type = parse_levels, default = parse_levels("1-7"))
+  parser.add_argument("--boss", action = "append", help = "repeatable, every boss with skills by default")
+  parser.add_argument("--loadout", action = "append", help = "comma separated skill ids or \"default\", repeatable")
+  parser.add_argument("--loadout-size", type = int, default = 0, help = "also try every combination of this many skills from skills.json")
+  parser.add_argument("--policy", action = "append", choices = sorted(POLICIES.keys()), help = "repeatable, \"all\" by default")
+  parser.add_argument("--battles", type = int, default = 1000, help = "battles per task")
+  parser.add_argument("--max-turns", type = int, default = 100)
+  parser.add_argument("--seed", type = int, default = 0)
+  parser.add_argument("--workers", type = int, default = os.cpu_count())
+  return parser.parse_args(argv)
+
+
+def main(argv: List[str] | None = None):
+  args = parse_args(argv)
+  writer = ResultWriter(args.output)
+
+  tasks = (task for task in build_tasks(args) if task.key not in writer.finished)
+  skipped = len(writer.finished)
+  done = 0
+
+  # Submit lazily, a loadout sweep can have far more tasks than fit in memory as futures
+  max_pending = max(args.workers, 1) * 4
+  pending: set[Future] = set()
+
+  executor = ProcessPoolExecutor(max_workers = args.workers)
+  try:
+    for task in itertools.chain(tasks, [None]):
+      if task is not None:
+        pending.add(executor.submit(run_task, task))
+        if len(pending) < max_pending:
+          continue
+
+      while pending and (task is None or len(pending) >= max_pending):
+        finished, pending = wait(pending, return_when = FIRST_COMPLETED)
+        for future in finished:
+          writer.write(future.result())
+          done += 1
+        print(f"\r{done} tasks done ({skipped} resumed)", end = "", file = sys.stderr, flush = True)
+  except KeyboardInterrupt:
+    print("\nInterrupted, run the same command again to resume", end = "", file = sys.stderr)
+  finally:
+    executor.shutdown(cancel_futures = True)
+    writer.close()
+    print(file = sys.stderr)
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,186 @@
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, List
+import itertools
+import math
+import random
+import time
+
+if TYPE_CHECKING:
+  from src.battle_helper import BattleEntity, BattleHelper
+
+
+class EnemyAI(ABC):
+  """Picks the skills of a computer controlled entity, selected per NPC with "ai" in npc.meta.json"""
+
+  def __init__(self, config: dict):
+    self.config: dict = config
+
+  @abstractmethod
+  def choose_skills(self, helper: "BattleHelper", entity: "BattleEntity") -> List[str]:
+    pass
+
+  @staticmethod
+  def get_available(entity: "BattleEntity") -> List[str]:
+    return [k for k, v in entity.skills.items() if v.current_cooldown == 0]
+
+
+class GreedyAI(EnemyAI):
+  """Everything that is ready, the behaviour without an AI profile"""
+
+  def choose_skills(self, helper: "BattleHelper", entity: "BattleEntity") -> List[str]:
+    return self.get_available(entity)
+
+
+class LookaheadAI(EnemyAI):
+  """
+  Monte Carlo search over the real battle rules.
+  Every subset of the ready skills is tried on a copy of the battle, followed by
+  `depth` rounds where both sides play greedily, the subset with the best average
+  outcome wins if it beats the greedy choice by more than the playouts' noise. Candidates are sampled with UCB1 until `budget_ms` runs out, if
+  not every candidate could be tried once the greedy choice is used instead.
+  Without a timed search (BattleHelper.timed_search) it runs all `max_playouts`.
+  """
+
+  def __init__(self, config: dict):
+    EnemyAI.__init__(self, config)
+
+    self.budget: float = config.get("budget_ms", 10) / 1000
+    self.depth: int = config.get("depth", 2)
+    # Upper bound for playouts, keeps simulations cheap when the budget is generous
+    self.max_playouts: int = config.get("max_playouts", 256)
+    self.max_candidates: int = config.get("max_candidates", 32)
+    self.exploration: float = config.get("exploration", 0.5)
+    # Standard errors a candidate has to beat the greedy choice by
+    self.confidence: float = config.get("confidence", 2.0)
+
+  def get_candidates(self, entity: "BattleEntity") -> List[List[str]]:
+    available = self.get_available(entity)
+    candidates = []
+
+    # Using everything first, so a short budget still compares against the greedy choice
+    for size in range(len(available), -1, -1):
+      for combination in itertools.combinations(available, size):
+        candidates.append(list(combination))
+        if len(candidates) >= self.max_candidates:
+          return candidates
+
+    return candidates
+
+  def choose_skills(self, helper: "BattleHelper", entity: "BattleEntity") -> List[str]:
+    deadline = time.perf_counter() + self.budget if helper.timed_search else math.inf
+    candidates = self.get_candidates(entity)
+
+    if len(candidates) <= 1:
+      return candidates[0] if candidates else []
+
+    # Own stream, searching must not change the battle's random numbers
+    rng = random.Random(helper.seed * 1000003 + helper.turn)
+    totals = [0.0] * len(candidates)
+    squares = [0.0] * len(candidates)
+    counts = [0] * len(candidates)
+    seeds = []
+
+    for playout in range(self.max_playouts):
+      if time.perf_counter() >= deadline:
+        break
+
+      if playout < len(candidates):
+        index = playout
+      else:
+        log_total = math.log(playout)
+        index = max(
+          range(len(candidates)),
+          key = lambda i: totals[i] / counts[i] + self.exploration * math.sqrt(log_total / counts[i])
+        )
+
+      # The n-th playout of every candidate sees the same random numbers, so
+      # candidates are compared on the same luck instead of on noise
+      while len(seeds) <= counts[index]:
+        seeds.append(rng.getrandbits(32))
+      score = self.playout(helper, entity, candidates[index], seeds[counts[index]])
+      totals[index] += score
+      squares[index] += score * score
+      counts[index] += 1
+
+    if 0 in counts:
+      # Budget ran out before every option was looked at
+      return self.get_available(entity)
+
+    best = max(range(len(candidates)), key = lambda i: totals[i] / counts[i])
+    if best == 0 or min(counts[0], counts[best]) < 2:
+      return candidates[best]
+
+    # Candidate 0 is the greedy choice, a few noisy playouts are not enough to leave it
+    def variance(i: int) -> float:
+      mean = totals[i] / counts[i]
+      return max(squares[i] / counts[i] - mean * mean, 0.0) / (counts[i] - 1)
+
+    gain = totals[best] / counts[best] - totals[0] / counts[0]
+    if gain <= self.confidence * math.sqrt(variance(0) + variance(best)):
+      return candidates[0]
+    return candidates[best]
+
+  def playout(
+    self,
+    helper: "BattleHelper",
+    entity: "BattleEntity",
+    skill_ids: List[str],
+    seed: int
+  ) -> float:
+    is_enemy = entity in helper.enemies
+    sim = helper.clone(seed)
+    sim.replay_choices[(sim.turn + 1, entity.role)] = skill_ids
+
+    result = sim.execute_enemy_turn() if is_enemy else sim.execute_player_turn(self.get_available(sim.player))
+    for _ in range(self.depth):
+      if result is not None:
+        break
+      if is_enemy:
+        result = sim.execute_player_turn(self.get_available(sim.player))
+        if result is None:
+          result = sim.execute_enemy_turn()
+      else:
+        result = sim.execute_enemy_turn()
+        if result is None:
+          result = sim.execute_player_turn(self.get_available(sim.player))
+
+    return self.evaluate(sim, is_enemy, result)
+
+  @staticmethod
+  def evaluate(sim: "BattleHelper", is_enemy: bool, result: bool | None) -> float:
+    """From the searching side's point of view, -1 (lost) to 1 (won)"""
+    if result is not None:
+      return 1.0 if result != is_enemy else -1.0
+
+    def health(entities: List["BattleEntity"]) -> float:
+      total = sum(entity.max_hp for entity in entities)
+      return sum(max(entity.current_hp, 0) + entity.shield for entity in entities) / total
+
+    mine, theirs = (sim.enemies, sim.allies) if is_enemy else (sim.allies, sim.enemies)
+    return max(min(health(mine) - health(theirs), 1.0), -1.0) * 0.5
+
+
+class BattleAI():
+  """AI profiles by name"""
+  profiles: dict[str, type[EnemyAI]] = {
+    "greedy": GreedyAI,
+    "lookahead": LookaheadAI
+  }
+
+  @staticmethod
+  def create(config: dict | str | None) -> EnemyAI | None:
+    """config is a profile name or {"profile": name, ...parameters}, None and greedy mean no AI"""
+    if config is None:
+      return None
+    if isinstance(config, str):
+      config = {"profile": config}
+
+    profile = config.get("profile", "greedy")
+    if profile == "greedy":
+      return None
+
+    ai_class = BattleAI.profiles.get(profile)
+    if ai_class is None:
+      raise KeyError(f"Unknown AI profile \"{profile}\", known profiles: {sorted(BattleAI.profiles.keys())}")
+
+    return ai_class(config)
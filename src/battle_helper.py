@@ -1,14 +1,22 @@
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, Callable, Iterator, List, NamedTuple
 from dataclasses import dataclass
+import copy
+import glob
 import json
+import os
 import random
 
 if TYPE_CHECKING:
   from src.game import Game
 from src.npc import Npc
+from src.battle_telemetry import BattleTelemetry
+from src.battle_ai import BattleAI, EnemyAI
 
 
-@dataclass
+# (helper, entity the effect is on, effect) -> None, called at the start of the entity's turn
+EffectHandler = Callable[["BattleHelper", "BattleEntity", "BattleEffect"], None]
+
+@dataclass(frozen = True)
 class SkillEffect:
   type: str
   name: str
@@ -17,6 +25,9 @@ class SkillEffect:
   chance: float
   value: int | None
   duration: int
+  # Resolved from the effect type in effects.json
+  handler: EffectHandler
+  params: dict
 
 @dataclass
 class BattleEffect:
@@ -26,6 +37,77 @@ class BattleEffect:
   hanging: bool
   value: int | None
   duration: int
+  handler: EffectHandler
+  params: dict
+
+class EffectSlots():
+  """Active effects of an entity, one stackable slot per effect type for lookups"""
+
+  def __init__(self):
+    # Every stack in the order it was applied, effects resolve and expire in this order
+    self.applied: List[BattleEffect] = []
+    self.slots: dict[str, List[BattleEffect]] = {}
+
+  def __iter__(self) -> Iterator[BattleEffect]:
+    return iter(self.applied)
+
+  def __len__(self) -> int:
+    return len(self.applied)
+
+  def __bool__(self) -> bool:
+    return bool(self.applied)
+
+  def has(self, type: str) -> bool:
+    return type in self.slots
+
+  def clone(self) -> "EffectSlots":
+    slots = EffectSlots()
+    for effect in self.applied:
+      slots.add(copy.copy(effect))
+    return slots
+
+  def count(self, type: str) -> int:
+    slot = self.slots.get(type)
+    return len(slot) if slot is not None else 0
+
+  def add(self, effect: BattleEffect):
+    self.applied.append(effect)
+    slot = self.slots.get(effect.type)
+    if slot is None:
+      self.slots[effect.type] = [effect]
+    else:
+      slot.append(effect)
+
+  def _keep(self, remaining: List[BattleEffect]):
+    self.applied = []
+    self.slots = {}
+    for effect in remaining:
+      self.add(effect)
+
+  def remove_negative(self) -> List[BattleEffect]:
+    removed = [effect for effect in self.applied if effect.negative]
+    if removed:
+      self._keep([effect for effect in self.applied if not effect.negative])
+    return removed
+
+  def tick(self) -> List[BattleEffect]:
+    """Count down durations except for effects applied this turn, returns the expired ones"""
+    expired = []
+    ended = False
+    for effect in self.applied:
+      if effect.hanging:
+        effect.hanging = False
+      else:
+        effect.duration -= 1
+        if effect.duration <= 0:
+          expired.append(effect)
+      # Includes effects that were applied without any duration
+      ended = ended or effect.duration <= 0
+
+    if ended:
+      self._keep([effect for effect in self.applied if effect.duration > 0])
+
+    return expired
 
 @dataclass
 class BattleSkill:
@@ -38,12 +120,16 @@ class BattleSkill:
   shield: int
   purify: bool
   effect: List[SkillEffect]
+  # single, all_opponents, all_allies or random
+  target: str
   hanging: bool
   cooldown: int
   current_cooldown: int
 
 @dataclass
 class BattleEntity:
+  # NPC name or "player"
+  id: str
   name: str
   max_hp: int
   current_hp: int
@@ -53,23 +139,195 @@ class BattleEntity:
   frozen: bool
   weakness: int
   skills: dict[str, BattleSkill]
-  effects: List[BattleEffect]
+  effects: EffectSlots
   reward: dict[str, int] | None
+  # Name in the event log, given by BattleHelper: player, ally1, enemy, enemy1, ...
+  role: str = ""
+  # None plays greedily, using every skill that is ready
+  ai: EnemyAI | None = None
+
+  def clone(self) -> "BattleEntity":
+    """Independent copy for searching ahead, skills and effects are copied, their data shared"""
+    entity = copy.copy(self)
+    entity.skills = {skill_id: copy.copy(skill) for skill_id, skill in self.skills.items()}
+    entity.effects = self.effects.clone()
+    return entity
+
+class BattleEvent(NamedTuple):
+  turn: int
+  # turn, ai, skill, frozen, damage, shield, heal, effect_applied, effect_expired, result
+  type: str
+  # Entity roles, see BattleEntity.role
+  actor: str
+  target: str
+  # Skill id, effect type, or comma separated skill ids (turn, ai)
+  key: str
+  value: float
+
+@dataclass
+class BattleLog:
+  """Everything needed to play a battle again"""
+  seed: int
+  player_hp: int
+  player_skills: List[str]
+  # NPC ids, the first enemy is the one the player talked to
+  enemies: List[str]
+  # NPC ids fighting alongside the player
+  allies: List[str]
+  # BattleEvent fields as plain tuples
+  events: List[tuple]
+
+  @property
+  def enemy(self) -> str:
+    return self.enemies[0]
+
+  def get_events(self) -> List[BattleEvent]:
+    return [BattleEvent._make(event) for event in self.events]
+
+  def to_dict(self) -> dict:
+    return {
+      "seed": self.seed,
+      "player_hp": self.player_hp,
+      "player_skills": self.player_skills,
+      "enemies": self.enemies,
+      "allies": self.allies,
+      "events": [list(event) for event in self.events]
+    }
 
-class BattleHelper:
-  def __init__(self, game: "Game", npc: Npc):
-    self.game = game
-    
-    self.enemy: BattleEntity = BattleHelper._load_npc_battle_data(npc)
-    self.player: BattleEntity = self._load_player_battle_data()
-  
   @staticmethod
-  def _load_skills(raw_skills: map) -> dict[str, BattleSkill]:
-    with open("./assets/effects.json", "r", encoding = "utf-8") as f:
-      effect_data = json.load(f)
-    
-    skills = {}
-    
+  def from_dict(data: dict) -> "BattleLog":
+    return BattleLog(
+      seed = data["seed"],
+      player_hp = data["player_hp"],
+      player_skills = data["player_skills"],
+      enemies = data["enemies"] if "enemies" in data else [data["enemy"]],
+      allies = data.get("allies", []),
+      events = [tuple(event) for event in data["events"]]
+    )
+
+@dataclass(frozen = True)
+class BattleTemplate:
+  """Compiled battle data of an entity, every battle gets a fresh copy"""
+  id: str
+  name: str
+  max_hp: int
+  skills: tuple[BattleSkill, ...]
+  reward: dict[str, int] | None
+  # NPC ids joining the fight on this entity's side
+  minions: tuple[str, ...] = ()
+  # Shared by every entity created from this template
+  ai: EnemyAI | None = None
+
+  def create_entity(self, max_hp: int | None = None) -> BattleEntity:
+    hp = self.max_hp if max_hp is None else max_hp
+
+    return BattleEntity(
+      id = self.id,
+      name = self.name,
+      max_hp = hp,
+      current_hp = hp,
+      shield = 0,
+      physical_buff = 0,
+      magical_buff = 0,
+      frozen = False,
+      weakness = 0,
+      # Skills carry cooldown state, the effect lists inside are never modified
+      skills = {skill.id: copy.copy(skill) for skill in self.skills},
+      effects = EffectSlots(),
+      reward = dict(self.reward) if self.reward is not None else None,
+      ai = self.ai
+    )
+
+class EffectEngine():
+  """Effect handlers by name, each type in effects.json uses "handler" or the handler named like the type"""
+  handlers: dict[str, EffectHandler] = {}
+
+  @staticmethod
+  def register(name: str) -> Callable[[EffectHandler], EffectHandler]:
+    def decorator(handler: EffectHandler) -> EffectHandler:
+      EffectEngine.handlers[name] = handler
+      return handler
+    return decorator
+
+  @staticmethod
+  def get(name: str) -> EffectHandler:
+    handler = EffectEngine.handlers.get(name)
+    if handler is None:
+      raise KeyError(f"No effect handler \"{name}\", known handlers: {sorted(EffectEngine.handlers.keys())}")
+    return handler
+
+@EffectEngine.register("damage")
+def _damage_effect(helper: "BattleHelper", entity: BattleEntity, effect: BattleEffect):
+  """params: ratio of "of" ("current_hp" or "max_hp"), or the effect value"""
+  ratio = effect.params.get("ratio")
+  if ratio is None:
+    damage = effect.value
+  else:
+    damage = getattr(entity, effect.params.get("of", "max_hp")) * ratio
+  helper._do_damage(entity, entity, damage, effect.type)
+
+@EffectEngine.register("heal")
+def _heal_effect(helper: "BattleHelper", entity: BattleEntity, effect: BattleEffect):
+  entity.current_hp += effect.value
+  helper._emit("heal", entity, entity, effect.type, effect.value)
+
+@EffectEngine.register("flag")
+def _flag_effect(helper: "BattleHelper", entity: BattleEntity, effect: BattleEffect):
+  """params: flag, a bool stat reset every turn such as "frozen" """
+  setattr(entity, effect.params["flag"], True)
+
+@EffectEngine.register("set_stat")
+def _set_stat_effect(helper: "BattleHelper", entity: BattleEntity, effect: BattleEffect):
+  """params: stat and amount, stacking doesn't add up"""
+  setattr(entity, effect.params["stat"], effect.params["amount"])
+
+@EffectEngine.register("add_stat")
+def _add_stat_effect(helper: "BattleHelper", entity: BattleEntity, effect: BattleEffect):
+  """params: stat, raised by the effect value (or amount) for every stack"""
+  stat = effect.params["stat"]
+  amount = effect.value if effect.value is not None else effect.params["amount"]
+  setattr(entity, stat, getattr(entity, stat) + amount)
+
+class BattleData():
+  """Battle definitions parsed once from the JSON assets and shared by every battle"""
+  EFFECTS_PATH: str = "./assets/effects.json"
+  SKILLS_PATH: str = "./assets/skills.json"
+  PLAYER_PATH: str = "./assets/player.meta.json"
+  NPC_PATH: str = "./assets/entity/npc/{name}/npc.meta.json"
+  DEFAULT_PLAYER_HP: int = 35
+  # Player HP for each level
+  LEVEL_HP: dict[int, int] = {
+    1: 35,
+    2: 45,
+    3: 55,
+    4: 65,
+    5: 78,
+    6: 90,
+    7: 100
+  }
+
+  effects: dict[str, dict] | None = None
+  # Keyed by the skill ids, None for the skills in player.meta.json
+  players: dict[tuple[str, ...] | None, BattleTemplate] = {}
+  npcs: dict[str, BattleTemplate] = {}
+
+  @staticmethod
+  def _read_json(path: str) -> dict:
+    with open(path, "r", encoding = "utf-8") as f:
+      return json.load(f)
+
+  @staticmethod
+  def get_effects() -> dict[str, dict]:
+    if BattleData.effects is None:
+      BattleData.effects = BattleData._read_json(BattleData.EFFECTS_PATH)
+    return BattleData.effects
+
+  @staticmethod
+  def compile_skills(raw_skills: dict) -> tuple[BattleSkill, ...]:
+    effect_data = BattleData.get_effects()
+
+    skills = []
+
     for skill_id, raw_skill in raw_skills.items():
       effects = []
       
@@ -89,118 +347,277 @@ class BattleHelper:
             target = raw_effect["target"],
             chance = raw_effect["chance"],
             value = raw_effect.get("value", None),
-            duration = duration
+            duration = duration,
+            handler = EffectEngine.get(effect_meta.get("handler", raw_effect["type"])),
+            params = effect_meta.get("params", {})
           )
         )
 
-      skills[skill_id] = BattleSkill(
-        id = skill_id,
-        name = raw_skill["name"],
-        description = raw_skill["description"],
-        physical_damage = raw_skill["physical_damage"],
-        magical_damage = raw_skill["magical_damage"],
-        heal = raw_skill["heal"],
-        shield = raw_skill["shield"],
-        purify = raw_skill["purify"],
-        effect = effects,
-        hanging = False,
-        cooldown = raw_skill["cooldown"],
-        current_cooldown = 0
+      skills.append(
+        BattleSkill(
+          id = skill_id,
+          name = raw_skill["name"],
+          description = raw_skill["description"],
+          physical_damage = raw_skill["physical_damage"],
+          magical_damage = raw_skill["magical_damage"],
+          heal = raw_skill["heal"],
+          shield = raw_skill["shield"],
+          purify = raw_skill["purify"],
+          effect = effects,
+          target = raw_skill.get("target", "single"),
+          hanging = False,
+          cooldown = raw_skill["cooldown"],
+          current_cooldown = 0
+        )
       )
-    
-    return skills
-  
+
+    return tuple(skills)
+
   @staticmethod
-  def _load_npc_battle_data(npc: Npc):
-    with open(f"./assets/entity/npc/{npc.name}/npc.meta.json", "r", encoding = "utf-8") as f:
-      data = json.load(f)
+  def get_player_template(skill_ids: List[str] | None = None) -> BattleTemplate:
+    """Player skills from player.meta.json or the given ids, the HP depends on the level and is given when creating the entity"""
+    key = tuple(skill_ids) if skill_ids is not None else None
+    template = BattleData.players.get(key)
+    if template is not None:
+      return template
 
-    entity = BattleEntity(
-      name = data.get("display_name", npc.name),
-      max_hp = data["hp"],
-      current_hp = data["hp"],
-      shield = 0,
-      physical_buff = 0,
-      magical_buff = 0,
-      frozen = False,
-      weakness = 0,
-      skills = BattleHelper._load_skills(data["skills"]),
-      effects = [],
-      reward = data.get("reward", None)
-    )
-    
-    return entity
-  
-  def _load_player_battle_data(self):
-    with open("./assets/player.meta.json", "r", encoding = "utf-8") as f:
-      data = json.load(f)
-      
-    with open("./assets/skills.json", "r", encoding = "utf-8") as f:
-      player_skill_meta = json.load(f)
-    
-    # Get HP based on player level
-    player_hp = self.game.level_hp.get(self.game.player_level, 35)
-      
-    entity = BattleEntity(
+    if skill_ids is None:
+      skill_ids = BattleData._read_json(BattleData.PLAYER_PATH)["skills"]
+    player_skill_meta = BattleData._read_json(BattleData.SKILLS_PATH)
+
+    template = BattleTemplate(
+      id = "player",
       name = "Player",
-      max_hp = player_hp,
-      current_hp = player_hp,
-      shield = 0,
-      physical_buff = 0,
-      magical_buff = 0,
-      frozen = False,
-      weakness = 0, 
-      skills = BattleHelper._load_skills(
-        {k: v for k, v in player_skill_meta.items() if k in data["skills"]}
+      max_hp = BattleData.DEFAULT_PLAYER_HP,
+      skills = BattleData.compile_skills(
+        {k: v for k, v in player_skill_meta.items() if k in skill_ids}
       ),
-      effects = [],
       reward = None
     )
-    
-    return entity
+    BattleData.players[key] = template
+
+    return template
+
+  @staticmethod
+  def get_boss_names() -> list[str]:
+    """Every fightable NPC that has battle data"""
+    names = []
+
+    for path in sorted(glob.glob(BattleData.NPC_PATH.format(name = "*"))):
+      data = BattleData._read_json(path)
+      if data.get("fightable", False) and "skills" in data:
+        names.append(os.path.basename(os.path.dirname(path)))
+
+    return names
+
+  @staticmethod
+  def get_npc_template(name: str, data: dict | None = None) -> BattleTemplate:
+    """NPC battle data, data is the already parsed npc.meta.json if the caller has it"""
+    template = BattleData.npcs.get(name)
+    if template is not None:
+      return template
+
+    if data is None:
+      data = BattleData._read_json(BattleData.NPC_PATH.format(name = name))
+
+    template = BattleTemplate(
+      id = name,
+      name = data.get("display_name", name),
+      max_hp = data["hp"],
+      skills = BattleData.compile_skills(data["skills"]),
+      reward = data.get("reward", None),
+      minions = tuple(data.get("minions", [])),
+      ai = BattleAI.create(data.get("ai", None))
+    )
+    BattleData.npcs[name] = template
+
+    return template
+
+  @staticmethod
+  def create_enemies(name: str, data: dict | None = None) -> List[BattleEntity]:
+    """An NPC followed by its minions"""
+    template = BattleData.get_npc_template(name, data)
+    return [template.create_entity()] + [
+      BattleData.get_npc_template(minion).create_entity() for minion in template.minions
+    ]
+
+  @staticmethod
+  def clear():
+    """Forget compiled data, e.g. after editing the JSON files"""
+    BattleData.effects = None
+    BattleData.players.clear()
+    BattleData.npcs.clear()
+
+class BattleHelper:
+  """Turn resolution for the player's side (player first) against the enemies (the NPC first)"""
+
+  def __init__(self, allies: List[BattleEntity], enemies: List[BattleEntity], seed: int | None = None):
+    self.allies: List[BattleEntity] = allies
+    self.enemies: List[BattleEntity] = enemies
+    self.player: BattleEntity = allies[0]
+    self.enemy: BattleEntity = enemies[0]
+
+    for i, entity in enumerate(allies):
+      entity.role = "player" if i == 0 else f"ally{i}"
+    for i, entity in enumerate(enemies):
+      entity.role = "enemy" if i == 0 else f"enemy{i}"
+
+    # Effect procs only draw from this, the same seed and choices give the same battle
+    self.seed: int = seed if seed is not None else random.getrandbits(32)
+    self.rng: random.Random = random.Random(self.seed)
+
+    self.turn: int = 0
+    self.log: BattleLog = BattleLog(
+      seed = self.seed,
+      player_hp = self.player.max_hp,
+      player_skills = list(self.player.skills.keys()),
+      enemies = [entity.id for entity in enemies],
+      allies = [entity.id for entity in allies[1:]],
+      events = []
+    )
+    self.events: List[tuple] = self.log.events
+    # Events before this index were already handed to the telemetry sink
+    self.telemetry_offset: int = 0
+
+    # Copies made by the AI to search ahead, they don't report or search themselves
+    self.is_simulation: bool = False
+    # Off in the balance simulator, AI searches then stop at their playout limit instead
+    # of a time budget and the same seed always gives the same battle
+    self.timed_search: bool = True
+    # (turn, role) -> skill ids used instead of asking the entity's AI, filled when replaying
+    self.replay_choices: dict[tuple[int, str], List[str]] = {}
+
+  @staticmethod
+  def for_npc(game: "Game", npc: Npc, seed: int | None = None) -> "BattleHelper":
+    return BattleHelper(
+      [
+        BattleData.get_player_template().create_entity(
+          game.level_hp.get(game.player_level, BattleData.DEFAULT_PLAYER_HP)
+        )
+      ],
+      BattleData.create_enemies(npc.name, npc.meta_data),
+      seed
+    )
+
+  @staticmethod
+  def replay(log: BattleLog) -> "BattleHelper":
+    """Play a logged battle again with the current data, raises AssertionError if anything differs"""
+    helper = BattleHelper(
+      [BattleData.get_player_template(log.player_skills).create_entity(log.player_hp)]
+      + [BattleData.get_npc_template(ally).create_entity() for ally in log.allies],
+      [BattleData.get_npc_template(enemy).create_entity() for enemy in log.enemies],
+      log.seed
+    )
+
+    for entity in helper.allies + helper.enemies:
+      # Searches depend on time, the decisions are taken from the log. Entities
+      # without logged decisions were greedy then, even if their NPC has an AI now
+      entity.ai = None
+    for event in log.get_events():
+      if event.type == "ai":
+        helper.replay_choices[(event.turn, event.actor)] = event.key.split(",") if event.key else []
+
+    for event in log.get_events():
+      if event.type != "turn":
+        continue
+      if event.actor == "player":
+        helper.execute_player_turn(event.key.split(",") if event.key else [], int(event.value))
+      else:
+        helper.execute_enemy_turn()
+
+    events = helper.log.events
+    for i, (expected, actual) in enumerate(zip(log.events, events)):
+      if tuple(expected) != actual:
+        raise AssertionError(
+          f"Replay differs at event {i}: expected {BattleEvent._make(expected)}, got {BattleEvent._make(actual)}"
+        )
+    if len(log.events) != len(events):
+      raise AssertionError(f"Replay has {len(events)} events, the log has {len(log.events)}")
+
+    return helper
+
+  def clone(self, seed: int) -> "BattleHelper":
+    """Copy of the current battle for searching ahead, with its own random numbers"""
+    sim = BattleHelper.__new__(BattleHelper)
+    sim.allies = [entity.clone() for entity in self.allies]
+    sim.enemies = [entity.clone() for entity in self.enemies]
+    sim.player = sim.allies[0]
+    sim.enemy = sim.enemies[0]
+    sim.seed = seed
+    sim.rng = random.Random(seed)
+    sim.turn = self.turn
+    sim.log = BattleLog(seed, self.log.player_hp, self.log.player_skills, self.log.enemies, self.log.allies, [])
+    sim.events = sim.log.events
+    sim.telemetry_offset = 0
+    sim.is_simulation = True
+    sim.timed_search = self.timed_search
+    sim.replay_choices = {}
+    return sim
+
+  def _plan(self, side: List[BattleEntity]) -> dict[str, List[str]]:
+    """Skills for every living entity of the side that has an AI, logged for replays"""
+    choices = {}
+
+    for entity in side:
+      if entity is self.player or entity.current_hp <= 0:
+        continue
+
+      skill_ids = self.replay_choices.pop((self.turn, entity.role), None)
+      if skill_ids is None:
+        if entity.ai is None:
+          continue
+        if self.is_simulation:
+          skill_ids = EnemyAI.get_available(entity)
+        else:
+          skill_ids = entity.ai.choose_skills(self, entity)
+
+      choices[entity.role] = skill_ids
+      if not self.is_simulation:
+        self._emit("ai", entity, entity, ",".join(skill_ids))
+
+    return choices
+
+  def _emit(self, type: str, actor: BattleEntity, target: BattleEntity, key: str = "", value: float = 0):
+    # Plain tuples keep logging cheap enough to leave on, see BattleLog.get_events
+    self.events.append((self.turn, type, actor.role, target.role, key, value))
 
   def check_next_round_frozen(self, entity: BattleEntity) -> bool:
-    return len(list(filter(lambda e: e.type == "frozen", entity.effects))) > 0
+    return entity.effects.has("frozen")
 
   def check_battle_result(self) -> bool:
     if self.player.current_hp <= 0:
       return False
-    if self.enemy.current_hp <= 0:
-      return True
-    return None
+    for enemy in self.enemies:
+      if enemy.current_hp > 0:
+        return None
+    return True
+
+  @staticmethod
+  def _alive(entities: List[BattleEntity]) -> List[BattleEntity]:
+    # Once everyone is down the front entity still takes the rest of the turn
+    return [entity for entity in entities if entity.current_hp > 0] or entities[:1]
 
   def _refresh_effects(self, entity: BattleEntity):
     entity.frozen = False
     entity.physical_buff = 0
     entity.magical_buff = 0
     entity.weakness = 0
-    
-    for effect in entity.effects:
-      match effect.type:
-        case "burning":
-          self._do_damage(entity, entity.current_hp * 0.05)
-        case "poisoned":
-          self._do_damage(entity, entity.max_hp * 0.1)
-        case "frozen":
-          entity.frozen = True
-        case "weakness":
-          entity.weakness = 2
-        case "healing":
-          entity.current_hp += effect.value
-        case "magic_boost":
-          entity.magical_buff += effect.value
-        case "physical_boost":
-          entity.physical_buff += effect.value
-
-  def _do_damage(self, entity: BattleEntity, damage: int):
+
+    for effect in entity.effects.applied:
+      effect.handler(self, entity, effect)
+
+  def _do_damage(self, source: BattleEntity, entity: BattleEntity, damage: int, key: str):
+    hp = entity.current_hp
+    shield = entity.shield
+
     remain_shield = round(entity.shield - damage)
-    
+
     if remain_shield <= 0:
       entity.current_hp += remain_shield
       entity.shield = 0
     else:
       entity.shield = remain_shield
-    
+
     entity.current_hp = round(
       max(
         entity.current_hp,
@@ -208,62 +625,113 @@ class BattleHelper:
       )
     )
 
-  def _use_skills(self, entity: BattleEntity, opponent: BattleEntity, skill_ids: List[str]):
-    if not entity.frozen:
-      for skill_id in skill_ids:
-        skill = entity.skills[skill_id]
-        
-        if skill.current_cooldown != 0:
-          continue
-        
-        total_damage = max(
-          (
-            (skill.physical_damage + entity.physical_buff)
-            + (skill.magical_damage + entity.magical_buff)
-            - entity.weakness
-          ),
-          0
-        )
-        
-        self._do_damage(opponent, total_damage)
-        
-        entity.current_hp = round(
+    if entity.shield != shield:
+      self._emit("shield", source, entity, key, entity.shield - shield)
+    if entity.current_hp != hp:
+      self._emit("damage", source, entity, key, hp - entity.current_hp)
+
+  def _pick_targets(
+    self,
+    skill: BattleSkill,
+    opponents: List[BattleEntity],
+    target: BattleEntity | None
+  ) -> List[BattleEntity]:
+    alive = self._alive(opponents)
+
+    match skill.target:
+      case "all_opponents":
+        return alive
+      case "random":
+        return [alive[0] if len(alive) == 1 else self.rng.choice(alive)]
+      case _:
+        # single, and the damage part of all_allies skills
+        return [target if target is not None and target in alive else alive[0]]
+
+  def _use_skills(
+    self,
+    entity: BattleEntity,
+    allies: List[BattleEntity],
+    opponents: List[BattleEntity],
+    skill_ids: List[str],
+    target: BattleEntity | None = None
+  ):
+    if entity.frozen:
+      self._emit("frozen", entity, entity)
+      return
+
+    for skill_id in skill_ids:
+      skill = entity.skills[skill_id]
+      
+      if skill.current_cooldown != 0:
+        continue
+
+      targets = opponents if len(opponents) == 1 else self._pick_targets(skill, opponents, target)
+      friends = self._alive(allies) if skill.target == "all_allies" and len(allies) > 1 else [entity]
+
+      self._emit("skill", entity, targets[0], skill_id)
+      
+      total_damage = max(
+        (
+          (skill.physical_damage + entity.physical_buff)
+          + (skill.magical_damage + entity.magical_buff)
+          - entity.weakness
+        ),
+        0
+      )
+      
+      for opponent in targets:
+        self._do_damage(entity, opponent, total_damage, skill_id)
+      
+      for friend in friends:
+        hp = friend.current_hp
+        friend.current_hp = round(
           min(
-            entity.max_hp,
-            entity.current_hp + skill.heal
+            friend.max_hp,
+            friend.current_hp + skill.heal
           ),
         )
-        entity.shield += skill.shield
+        if friend.current_hp != hp:
+          self._emit("heal", entity, friend, skill_id, friend.current_hp - hp)
+
+        if skill.shield != 0:
+          friend.shield += skill.shield
+          self._emit("shield", entity, friend, skill_id, skill.shield)
         
         if skill.purify:
-          entity.effects = list(filter(lambda e: not e.negative, entity.effects))
-        
-        for effect in skill.effect:
-          if random.random() <= effect.chance:
-            battle_effect = BattleEffect(
-              effect.type,
-              effect.name,
-              effect.negative,
-              True,
-              effect.value,
-              effect.duration
+          for effect in friend.effects.remove_negative():
+            self._emit("effect_expired", friend, friend, effect.type)
+      
+      for effect in skill.effect:
+        # Every recipient rolls on its own
+        if effect.target == "self":
+          recipients = friends
+        elif effect.target == "opponent":
+          recipients = targets
+        else:
+          continue
+
+        for recipient in recipients:
+          if self.rng.random() <= effect.chance:
+            recipient.effects.add(
+              BattleEffect(
+                effect.type,
+                effect.name,
+                effect.negative,
+                True,
+                effect.value,
+                effect.duration,
+                effect.handler,
+                effect.params
+              )
             )
-            if effect.target == "self":
-              entity.effects.append(battle_effect)
-            elif effect.target == "opponent":
-              opponent.effects.append(battle_effect)
-        
-        skill.hanging = True
-        skill.current_cooldown = skill.cooldown
+            self._emit("effect_applied", entity, recipient, effect.type, effect.duration)
+      
+      skill.hanging = True
+      skill.current_cooldown = skill.cooldown
 
   def _tick_effects(self, entity: BattleEntity):
-    for effect in entity.effects:
-      if effect.hanging:
-        effect.hanging = False
-      else:
-        effect.duration -= 1
-    
-    entity.effects = list(filter(lambda e: e.duration > 0, entity.effects))
+    for effect in entity.effects.tick():
+      self._emit("effect_expired", entity, entity, effect.type)
 
   def _tick_skills(self, entity: BattleEntity):
     for _, skill in entity.skills.items():
@@ -272,38 +740,71 @@ class BattleHelper:
       elif skill.current_cooldown != 0:
         skill.current_cooldown -= 1
 
-  def execute_player_turn(self, skill_ids: List[str]) -> bool | None:
-    self._refresh_effects(self.player)
-
-    self._use_skills(self.player, self.enemy, skill_ids)
-    
-    self._tick_effects(self.player)
-    self._tick_skills(self.player)
-    
-    print(self.enemy)
-    print()
-    print(self.player)
-    print()
-    print()
-    print()
-    
-    return self.check_battle_result()
+  def _execute_side(
+    self,
+    side: List[BattleEntity],
+    opponents: List[BattleEntity],
+    player_skill_ids: List[str] | None = None,
+    target: BattleEntity | None = None,
+    choices: dict[str, List[str]] | None = None
+  ):
+    """One turn for a whole side, each phase runs over every living member before the next"""
+    acting = [entity for entity in side if entity.current_hp > 0]
+
+    for entity in acting:
+      if entity.effects.applied:
+        self._refresh_effects(entity)
+      else:
+        # Nothing can have set these since the last refresh
+        entity.frozen = False
+        entity.physical_buff = 0
+        entity.magical_buff = 0
+        entity.weakness = 0
+
+    for entity in acting:
+      if entity is self.player and player_skill_ids is not None:
+        self._use_skills(entity, side, opponents, player_skill_ids, target)
+      elif choices and entity.role in choices:
+        self._use_skills(entity, side, opponents, choices[entity.role])
+      else:
+        # Computer controlled, everything that is ready
+        skill_ids = [k for k, v in entity.skills.items() if v.current_cooldown == 0]
+        self._use_skills(entity, side, opponents, skill_ids)
+
+    for entity in acting:
+      if entity.effects.applied:
+        self._tick_effects(entity)
+      self._tick_skills(entity)
+
+  def _end_turn(self) -> bool | None:
+    result = self.check_battle_result()
+    if result is not None:
+      self._emit("result", self.player, self.enemy, "win" if result else "lose")
+
+    sink = BattleTelemetry.sink
+    if sink is not None and not self.is_simulation:
+      sink.write(self.log, self.events[self.telemetry_offset:])
+      self.telemetry_offset = len(self.events)
+      if result is not None:
+        sink.flush()
+
+    return result
+
+  def execute_player_turn(self, skill_ids: List[str], target: int = 0) -> bool | None:
+    """target is the index in enemies for single target skills"""
+    self.turn += 1
+    target_entity = self.enemies[target] if 0 <= target < len(self.enemies) else self.enemy
+    self._emit("turn", self.player, target_entity, ",".join(skill_ids), target)
+
+    choices = self._plan(self.allies) if len(self.allies) > 1 else None
+    self._execute_side(self.allies, self.enemies, skill_ids, target_entity, choices)
+
+    return self._end_turn()
 
   def execute_enemy_turn(self) -> bool | None:
-    self._refresh_effects(self.enemy)
-    
-    skill_ids = [k for k, v in self.enemy.skills.items() if v.current_cooldown == 0]
-
-    self._use_skills(self.enemy, self.player, skill_ids)
-    
-    self._tick_effects(self.enemy)
-    self._tick_skills(self.enemy)
-    
-    print(self.enemy)
-    print()
-    print(self.player)
-    print()
-    print()
-    print()
-    
-    return self.check_battle_result()
+    self.turn += 1
+    self._emit("turn", self.enemy, self.player)
+
+    self._execute_side(self.enemies, self.allies, choices = self._plan(self.enemies))
+
+    return self._end_turn()
@@ -0,0 +1,277 @@
+from typing import Callable, List
+from dataclasses import dataclass, field
+import random
+import zlib
+
+from src.battle_helper import BattleData, BattleEntity, BattleHelper
+
+
+# (player, enemy, skill ids off cooldown, rng) -> skill ids used this turn
+Policy = Callable[[BattleEntity, BattleEntity, List[str], random.Random], List[str]]
+
+
+def _skill_damage(entity: BattleEntity, skill_id: str) -> int:
+  skill = entity.skills[skill_id]
+  return skill.physical_damage + skill.magical_damage
+
+def all_skills_policy(
+  player: BattleEntity,
+  enemy: BattleEntity,
+  available: List[str],
+  rng: random.Random
+) -> List[str]:
+  """Use everything that is ready, like a player selecting every skill"""
+  return available
+
+def damage_only_policy(
+  player: BattleEntity,
+  enemy: BattleEntity,
+  available: List[str],
+  rng: random.Random
+) -> List[str]:
+  """Only skills that deal damage, never shields or heals"""
+  return [skill_id for skill_id in available if _skill_damage(player, skill_id) > 0]
+
+def strongest_policy(
+  player: BattleEntity,
+  enemy: BattleEntity,
+  available: List[str],
+  rng: random.Random
+) -> List[str]:
+  """The single hardest hitting skill each turn"""
+  if not available:
+    return []
+  return [max(available, key = lambda skill_id: _skill_damage(player, skill_id))]
+
+def survival_policy(
+  player: BattleEntity,
+  enemy: BattleEntity,
+  available: List[str],
+  rng: random.Random
+) -> List[str]:
+  """Heal and shield below half HP, otherwise attack"""
+  if player.current_hp * 2 < player.max_hp:
+    defensive = [
+      skill_id for skill_id in available
+      if player.skills[skill_id].heal > 0 or player.skills[skill_id].shield > 0
+    ]
+    if defensive:
+      return defensive
+  return damage_only_policy(player, enemy, available, rng)
+
+def random_policy(
+  player: BattleEntity,
+  enemy: BattleEntity,
+  available: List[str],
+  rng: random.Random
+) -> List[str]:
+  """Each ready skill with a coin flip"""
+  return [skill_id for skill_id in available if rng.random() < 0.5]
+
+POLICIES: dict[str, Policy] = {
+  "all": all_skills_policy,
+  "damage": damage_only_policy,
+  "strongest": strongest_policy,
+  "survival": survival_policy,
+  "random": random_policy
+}
+
+
+def derive_seed(seed: int, *parts) -> int:
+  """Stable seed for one run, hash() of strings changes between processes"""
+  return zlib.crc32(":".join(str(part) for part in (seed, *parts)).encode("utf-8"))
+
+
+@dataclass
+class SimulationResult:
+  boss: str
+  level: int
+  policy: str
+  battles: int = 0
+  wins: int = 0
+  # Battles still running after max_turns, counted as losses
+  timeouts: int = 0
+  # Rounds (player turn + enemy turn) -> number of battles that lasted that long
+  turn_counts: dict[int, int] = field(default_factory = dict)
+  total_turns: int = 0
+  # HP removed from the enemies (net of their healing within a turn) / the player over every battle
+  damage_dealt: float = 0
+  damage_taken: float = 0
+
+  @property
+  def win_rate(self) -> float:
+    return self.wins / self.battles if self.battles > 0 else 0.0
+
+  @property
+  def mean_turns(self) -> float:
+    return self.total_turns / self.battles if self.battles > 0 else 0.0
+
+  @property
+  def damage_per_turn(self) -> float:
+    return self.damage_dealt / self.total_turns if self.total_turns > 0 else 0.0
+
+  @property
+  def damage_taken_per_turn(self) -> float:
+    return self.damage_taken / self.total_turns if self.total_turns > 0 else 0.0
+
+  def turn_percentile(self, percentile: float) -> int:
+    """Smallest round count that at least percentile (0 - 1) of the battles ended by"""
+    target = percentile * self.battles
+    seen = 0
+    for turns in sorted(self.turn_counts.keys()):
+      seen += self.turn_counts[turns]
+      if seen >= target:
+        return turns
+    return 0
+
+  def merge(self, other: "SimulationResult"):
+    """Add the battles of another run with the same boss, level and policy"""
+    self.battles += other.battles
+    self.wins += other.wins
+    self.timeouts += other.timeouts
+    for turns, count in other.turn_counts.items():
+      self.turn_counts[turns] = self.turn_counts.get(turns, 0) + count
+    self.total_turns += other.total_turns
+    self.damage_dealt += other.damage_dealt
+    self.damage_taken += other.damage_taken
+
+  def to_dict(self) -> dict:
+    return {
+      "boss": self.boss,
+      "level": self.level,
+      "policy": self.policy,
+      "battles": self.battles,
+      "wins": self.wins,
+      "timeouts": self.timeouts,
+      "win_rate": round(self.win_rate, 4),
+      "mean_turns": round(self.mean_turns, 3),
+      "p50_turns": self.turn_percentile(0.5),
+      "p90_turns": self.turn_percentile(0.9),
+      "damage_per_turn": round(self.damage_per_turn, 3),
+      "damage_taken_per_turn": round(self.damage_taken_per_turn, 3)
+    }
+
+
+class BattleSimulator():
+  """
+  Runs battles with the real BattleHelper rules, without a Game or a display.
+  Enemies pick their skills with the AI profile from their npc.meta.json, like in game.
+  """
+
+  def __init__(self, max_turns: int = 100, level_hp: dict[int, int] | None = None):
+    self.max_turns: int = max_turns
+    self.level_hp: dict[int, int] = level_hp if level_hp is not None else BattleData.LEVEL_HP
+
+  def simulate(
+    self,
+    boss: str,
+    level: int,
+    battles: int = 1000,
+    policy: str = "all",
+    skill_ids: List[str] | None = None,
+    seed: int | None = None,
+    allies: List[str] | None = None
+  ) -> SimulationResult:
+    """The boss brings its minions, allies are NPC ids fighting next to the player"""
+    # Battle seeds and policy choices come from one stream, the whole run is reproducible
+    rng = random.Random(seed)
+
+    player_template = BattleData.get_player_template(skill_ids)
+    player_hp = self.level_hp.get(level, BattleData.DEFAULT_PLAYER_HP)
+    choose_skills = POLICIES[policy]
+
+    result = SimulationResult(boss = boss, level = level, policy = policy)
+
+    for _ in range(battles):
+      helper = BattleHelper(
+        [player_template.create_entity(player_hp)]
+        + [BattleData.get_npc_template(ally).create_entity() for ally in allies or []],
+        BattleData.create_enemies(boss),
+        rng.getrandbits(32)
+      )
+      # Enemies with an AI profile search a fixed number of playouts, not a time budget
+      helper.timed_search = False
+      self._run_battle(helper, choose_skills, rng, result)
+
+    return result
+
+  @staticmethod
+  def _total_hp(entities: List[BattleEntity]) -> float:
+    if len(entities) == 1:
+      return entities[0].current_hp
+    return sum(entity.current_hp for entity in entities)
+
+  def _run_battle(
+    self,
+    helper: BattleHelper,
+    choose_skills: Policy,
+    rng: random.Random,
+    result: SimulationResult
+  ):
+    player = helper.player
+    enemy = helper.enemy
+    enemies = helper.enemies
+    won = False
+    turns = 0
+
+    while turns < self.max_turns:
+      turns += 1
+
+      # Same turn order as BattleState, the player always moves first
+      player_hp = player.current_hp
+      enemies_hp = self._total_hp(enemies)
+      available = [k for k, v in player.skills.items() if v.current_cooldown == 0]
+      outcome = helper.execute_player_turn(choose_skills(player, enemy, available, rng))
+      result.damage_dealt += max(enemies_hp - self._total_hp(enemies), 0)
+      result.damage_taken += max(player_hp - player.current_hp, 0)
+      if outcome is not None:
+        won = outcome
+        break
+
+      player_hp = player.current_hp
+      enemies_hp = self._total_hp(enemies)
+      outcome = helper.execute_enemy_turn()
+      result.damage_dealt += max(enemies_hp - self._total_hp(enemies), 0)
+      result.damage_taken += max(player_hp - player.current_hp, 0)
+      if outcome is not None:
+        won = outcome
+        break
+    else:
+      result.timeouts += 1
+
+    result.battles += 1
+    result.total_turns += turns
+    result.turn_counts[turns] = result.turn_counts.get(turns, 0) + 1
+    if won:
+      result.wins += 1
+
+  def sweep(
+    self,
+    bosses: List[str] | None = None,
+    levels: List[int] | None = None,
+    battles: int = 1000,
+    policy: str = "all",
+    skill_ids: List[str] | None = None,
+    seed: int = 0
+  ) -> List[SimulationResult]:
+    """Every boss against every level, each pair seeded on its own so results don't depend on order"""
+    if bosses is None:
+      bosses = BattleData.get_boss_names()
+    if levels is None:
+      levels = sorted(self.level_hp.keys())
+
+    results = []
+    for boss in bosses:
+      for level in levels:
+        results.append(
+          self.simulate(
+            boss,
+            level,
+            battles = battles,
+            policy = policy,
+            skill_ids = skill_ids,
+            seed = derive_seed(seed, boss, level)
+          )
+        )
+
+    return results
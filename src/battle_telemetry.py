@@ -0,0 +1,137 @@
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, List
+import atexit
+import json
+
+if TYPE_CHECKING:
+  from src.battle_helper import BattleLog
+
+
+class TelemetrySink(ABC):
+  """Receives the events of every battle turn, see BattleTelemetry"""
+
+  @abstractmethod
+  def write(self, log: "BattleLog", events: List[tuple]):
+    pass
+
+  def flush(self):
+    pass
+
+  def close(self):
+    self.flush()
+
+
+class RingBufferSink(TelemetrySink):
+  """Keeps the most recent events in memory, e.g. to dump after a bug report"""
+
+  def __init__(self, capacity: int = 4096):
+    # (battle seed, enemy id, event)
+    self.events: deque[tuple] = deque(maxlen = capacity)
+
+  def write(self, log: "BattleLog", events: List[tuple]):
+    for event in events:
+      self.events.append((log.seed, log.enemy, event))
+
+  def get_events(self) -> List[tuple]:
+    return list(self.events)
+
+  def clear(self):
+    self.events.clear()
+
+
+class FileSink(TelemetrySink):
+  """Appends JSON lines to a file, batches are written on a worker thread"""
+
+  def __init__(self, path: str, batch_size: int = 64):
+    self.path: str = path
+    self.batch_size: int = batch_size
+    self.buffer: List[str] = []
+
+    # One worker keeps batches in order and the file handle on a single thread
+    self.executor: ThreadPoolExecutor = ThreadPoolExecutor(
+      max_workers = 1,
+      thread_name_prefix = "battle-telemetry"
+    )
+    self.file = None
+
+  def write(self, log: "BattleLog", events: List[tuple]):
+    # Serialising a turn is cheap, the disk write is what could stall a frame
+    self.buffer.append(
+      json.dumps({"battle": log.seed, "enemy": log.enemy, "events": events}, ensure_ascii = False)
+    )
+
+    if len(self.buffer) >= self.batch_size:
+      self.flush()
+
+  def _write_batch(self, lines: List[str]):
+    if self.file is None:
+      self.file = open(self.path, "a", encoding = "utf-8")
+    self.file.write("\n".join(lines) + "\n")
+    self.file.flush()
+
+  def flush(self):
+    if not self.buffer:
+      return
+
+    lines = self.buffer
+    self.buffer = []
+    self.executor.submit(self._write_batch, lines)
+
+  def close(self):
+    # Let queued batches finish, the rest is written here since the worker may
+    # already be gone when this runs at interpreter exit
+    self.executor.shutdown(wait = True)
+
+    if self.buffer:
+      self._write_batch(self.buffer)
+      self.buffer = []
+
+    if self.file is not None:
+      self.file.close()
+      self.file = None
+
+
+class BattleTelemetry():
+  """Battle event output, off by default so battles pay nothing for it"""
+  LEVELS: tuple[str, ...] = ("off", "memory", "file")
+
+  sink: TelemetrySink | None = None
+
+  @staticmethod
+  def configure(level: str = "off", path: str = "battle_telemetry.jsonl") -> TelemetrySink | None:
+    if level not in BattleTelemetry.LEVELS:
+      raise ValueError(f"Unknown telemetry level \"{level}\", expected one of {BattleTelemetry.LEVELS}")
+
+    BattleTelemetry.close()
+
+    match level:
+      case "memory":
+        BattleTelemetry.set_sink(RingBufferSink())
+      case "file":
+        BattleTelemetry.set_sink(FileSink(path))
+
+    return BattleTelemetry.sink
+
+  @staticmethod
+  def set_sink(sink: TelemetrySink | None):
+    """Install a custom sink, None turns telemetry off"""
+    BattleTelemetry.close()
+    BattleTelemetry.sink = sink
+
+  @staticmethod
+  def flush():
+    if BattleTelemetry.sink is not None:
+      BattleTelemetry.sink.flush()
+
+  @staticmethod
+  def close():
+    sink = BattleTelemetry.sink
+    BattleTelemetry.sink = None
+    if sink is not None:
+      sink.close()
+
+
+# Buffered events would be lost when the game quits mid-batch
+atexit.register(BattleTelemetry.close)
@@ -0,0 +1,83 @@
+import pygame
+
+
+class Camera():
+  """
+  Top-left corner of the view in world pixels. The target can move freely inside
+  the deadzone, a box centered on the view, before the camera starts to scroll.
+  """
+
+  def __init__(
+    self,
+    view_width: int,
+    view_height: int,
+    deadzone: tuple[int, int] = (0, 0),
+    clamp: bool = True
+  ):
+    self.view_width: int = view_width
+    self.view_height: int = view_height
+    # Width and height of the deadzone, (0, 0) keeps the target centered
+    self.deadzone: tuple[int, int] = deadzone
+    # Keep the view inside the world, maps smaller than the view stay at the top-left
+    self.clamp: bool = clamp
+
+    self.world_width: int = view_width
+    self.world_height: int = view_height
+
+    self.x: float = 0
+    self.y: float = 0
+    # Position before the last update step, used to interpolate rendering like the player
+    self.prev_x: float = 0
+    self.prev_y: float = 0
+
+  def set_world_size(self, width: int, height: int):
+    self.world_width = width
+    self.world_height = height
+
+  def _clamp(self):
+    if not self.clamp:
+      return
+    self.x = min(max(self.x, 0), max(self.world_width - self.view_width, 0))
+    self.y = min(max(self.y, 0), max(self.world_height - self.view_height, 0))
+
+  def center_on(self, x: float, y: float):
+    """Jump to the target without scrolling, e.g. after a map change"""
+    self.x = x - self.view_width / 2
+    self.y = y - self.view_height / 2
+    self._clamp()
+    self.prev_x = self.x
+    self.prev_y = self.y
+
+  def follow(self, x: float, y: float):
+    """Scroll just enough to keep the target inside the deadzone, once per update step"""
+    self.prev_x = self.x
+    self.prev_y = self.y
+
+    half_width = self.deadzone[0] / 2
+    half_height = self.deadzone[1] / 2
+    center_x = self.x + self.view_width / 2
+    center_y = self.y + self.view_height / 2
+
+    if x < center_x - half_width:
+      self.x = x + half_width - self.view_width / 2
+    elif x > center_x + half_width:
+      self.x = x - half_width - self.view_width / 2
+
+    if y < center_y - half_height:
+      self.y = y + half_height - self.view_height / 2
+    elif y > center_y + half_height:
+      self.y = y - half_height - self.view_height / 2
+
+    self._clamp()
+
+  def get_offset(self, alpha: float = 1.0) -> tuple[int, int]:
+    """World position drawn at the canvas' top-left, whole pixels so tiles stay sharp"""
+    if alpha >= 1.0:
+      return (round(self.x), round(self.y))
+    return (
+      round(self.prev_x + (self.x - self.prev_x) * alpha),
+      round(self.prev_y + (self.y - self.prev_y) * alpha)
+    )
+
+  def get_view(self, offset: tuple[int, int]) -> pygame.Rect:
+    return pygame.Rect(offset, (self.view_width, self.view_height))
@@ -0,0 +1,95 @@
+from typing import Callable, Hashable
+
+import pygame
+
+
+class DirtyRenderer():
+  """
+  Redraws only what changed since the last frame, for a static background with a
+  few sprites and HUD elements on top. Everything is drawn again when the scene
+  key changes, e.g. another map or a camera that moved.
+
+  Every frame the caller describes what it draws as key -> (rect, look), where look
+  is anything that changes when the item looks different (an image, a coin count).
+  Areas an item left or entered are drawn again with the full render clipped to
+  them, so the result is the same as a full redraw.
+  """
+  # Every draw() walks the whole scene, past this many areas they are drawn as one
+  MAX_DRAWS: int = 4
+
+  def __init__(self):
+    self.drawn: dict[Hashable, tuple[pygame.Rect, object]] = {}
+    self.surface: pygame.Surface | None = None
+    self.scene: Hashable = None
+
+  def invalidate(self):
+    """Draw everything next frame, e.g. after another state drew on the canvas"""
+    self.surface = None
+
+  def skip(self, scene: Hashable):
+    """
+    The caller drew everything without items, e.g. while the camera scrolls. The
+    first frame that stays in this scene draws everything once more to track them.
+    """
+    self.surface = None
+    self.scene = scene
+
+  def render(
+    self,
+    surface: pygame.Surface,
+    scene: Hashable,
+    items: dict[Hashable, tuple[pygame.Rect, object]],
+    draw: Callable[[pygame.Surface], None]
+  ) -> list[pygame.Rect] | None:
+    """Returns the rects that changed, or None if the whole surface was drawn"""
+    if surface is not self.surface or scene != self.scene:
+      draw(surface)
+      self.surface = surface
+      self.scene = scene
+      self.drawn = items
+      return None
+
+    bounds = surface.get_rect()
+    dirty = []
+
+    for key, (rect, look) in items.items():
+      previous = self.drawn.get(key)
+      if previous == (rect, look):
+        continue
+
+      if previous is None:
+        dirty.append(rect)
+      elif rect.colliderect(previous[0]):
+        # Moved a few pixels, one rect covers both positions
+        dirty.append(rect.union(previous[0]))
+      else:
+        dirty.extend((rect, previous[0]))
+
+    for key, (rect, _) in self.drawn.items():
+      if key not in items:
+        dirty.append(rect)
+
+    dirty = self.merge([rect.clip(bounds) for rect in dirty if rect.colliderect(bounds)])
+    if len(dirty) > self.MAX_DRAWS:
+      dirty = [dirty[0].unionall(dirty[1:])]
+
+    for rect in dirty:
+      surface.set_clip(rect)
+      draw(surface)
+    surface.set_clip(None)
+
+    self.drawn = items
+    return dirty
+
+  @staticmethod
+  def merge(rects: list[pygame.Rect]) -> list[pygame.Rect]:
+    """Overlapping rects joined into one, an item and the HUD next to it are drawn once"""
+    merged = []
+    for rect in rects:
+      # A joined rect can reach others that were apart before
+      index = rect.collidelist(merged)
+      while index >= 0:
+        rect = rect.union(merged.pop(index))
+        index = rect.collidelist(merged)
+      merged.append(rect)
+    return merged
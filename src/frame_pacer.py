@@ -0,0 +1,73 @@
+import time
+
+import pygame
+
+
+class FramePacer():
+  """Frame rate cap and delta time measurement for the game loop"""
+
+  def __init__(
+    self,
+    target_fps: int = 60,
+    low_power_fps: int = 10,
+    max_delta_time: float = 0.1,
+    fixed_timestep: float | None = None,
+    max_steps: int = 5
+  ):
+    self.clock: pygame.time.Clock = pygame.time.Clock()
+
+    # 0 means uncapped
+    self.target_fps: int = target_fps
+    self.low_power_fps: int = low_power_fps
+    # Long stalls (loading, window drag) are clamped so movement can't tunnel through walls
+    self.max_delta_time: float = max_delta_time
+    # Seconds per update step, None to update once per rendered frame
+    self.fixed_timestep: float | None = fixed_timestep
+    self.max_steps: int = max_steps
+
+    self.delta_time: float = 0.0
+    self.accumulator: float = 0.0
+    # How far the rendered frame is between the last two update steps
+    self.alpha: float = 1.0
+    self.prev_time: float = time.perf_counter()
+
+  def tick(self, low_power: bool = False) -> float:
+    self.clock.tick(self.low_power_fps if low_power else self.target_fps)
+
+    now = time.perf_counter()
+    self.delta_time = min(max(now - self.prev_time, 0.0), self.max_delta_time)
+    self.prev_time = now
+
+    if self.fixed_timestep:
+      self.accumulator += self.delta_time
+
+    return self.delta_time
+
+  def consume_steps(self) -> int:
+    """Return how many update steps should run this frame"""
+    if not self.fixed_timestep:
+      return 1
+
+    steps = min(int(self.accumulator // self.fixed_timestep), self.max_steps)
+    self.accumulator -= steps * self.fixed_timestep
+
+    # Drop the backlog instead of spiralling when updates can't keep up
+    if steps == self.max_steps:
+      self.accumulator = min(self.accumulator, self.fixed_timestep)
+
+    self.alpha = self.accumulator / self.fixed_timestep
+
+    return steps
+
+  @property
+  def step_time(self) -> float:
+    return self.fixed_timestep if self.fixed_timestep else self.delta_time
+
+  def get_fps(self) -> float:
+    return self.clock.get_fps()
+
+  def reset(self):
+    self.prev_time = time.perf_counter()
+    self.delta_time = 0.0
+    self.accumulator = 0.0
+    self.alpha = 1.0
@@ -1,8 +1,11 @@
-import time
 import pygame
 
 from src.input_manager import InputManager
 from src.audio_manager import AudioManager
+from src.battle_helper import BattleData
+from src.battle_telemetry import BattleTelemetry
+from src.frame_pacer import FramePacer
+from src.text_renderer import TextRenderer
 from src.player import Player
 from src.inventory.inventory import Inventory
 from src.state.state import State
@@ -14,7 +17,11 @@ class Game():
     pygame.init()
     pygame.display.set_caption("PBL Game")
     
-    self.clock: pygame.time.Clock = pygame.time.Clock()
+    self.TARGET_FPS: int = 60
+    self.LOW_POWER_FPS: int = 10
+    self.FIXED_TIMESTEP: float | None = None  # e.g. 1 / 60 for fixed-step updates
+    # "off", "memory" (ring buffer) or "file" (battle_telemetry.jsonl)
+    self.BATTLE_TELEMETRY: str = "off"
     
     self.running: bool = True
     self.playing: bool = True
@@ -23,37 +30,52 @@ class Game():
     self.GAME_H: int = 720
     self.SCREEN_WIDTH: int = 1280
     self.SCREEN_HEIGHT: int = 720
+    # Scale the canvas by whole multiples only (pixel art), letterboxing the rest
+    self.INTEGER_SCALING: bool = False
+    # Let the overworld redraw and update only what changed each frame
+    self.DIRTY_RECTS: bool = False
+    # Size of the box around the screen center the player moves in before the camera scrolls
+    self.CAMERA_DEADZONE: tuple[int, int] = (160, 120)
+    # Never show the area outside of the map
+    self.CAMERA_CLAMP: bool = True
+    # Walk between maps stitched together with "stitch" in map.meta.json without loading screens
+    self.STREAM_WORLD: bool = False
+    # Seconds to fade out (and back in) while the next map loads in the background
+    self.MAP_FADE_TIME: float = 0.25
     
-    self.game_canvas: pygame.Surface = pygame.Surface(
-      (self.GAME_W, self.GAME_H)
-    )
     self.screen: pygame.Surface = pygame.display.set_mode(
       (self.SCREEN_WIDTH, self.SCREEN_HEIGHT),
       pygame.SCALED | pygame.RESIZABLE
     )
+    self.game_canvas: pygame.Surface | None = None
+    self.scaled_canvas: pygame.Surface | None = None
+    self.scaled_rect: pygame.Rect = self.screen.get_rect()
+    self.create_canvas()
     
     self.delta_time: float = 0.0
-    self.prev_time: float = 0.0
     self.state_stack: list[State] = []
+    # Set by the state while rendering, None means the whole canvas changed
+    self.dirty_rects: list[pygame.Rect] | None = None
+    self.last_rendered_state: State | None = None
     
     self.player: Player = Player()
     self.inventory: Inventory = Inventory()
     self.input_manager: InputManager = InputManager()
+    self.text_renderer: TextRenderer = TextRenderer()
     self.defeated_npcs: set[str] = set()  # Track defeated NPCs
     self.player_level: int = 1  # Player level (1-7)
     
     # HP for each level
-    self.level_hp = {
-      1: 35,
-      2: 45,
-      3: 55,
-      4: 65,
-      5: 78,
-      6: 90,
-      7: 100
-    }
+    self.level_hp: dict[int, int] = dict(BattleData.LEVEL_HP)
     
     AudioManager.init()
+    BattleTelemetry.configure(self.BATTLE_TELEMETRY)
+    
+    self.frame_pacer: FramePacer = FramePacer(
+      target_fps = self.TARGET_FPS,
+      low_power_fps = self.LOW_POWER_FPS,
+      fixed_timestep = self.FIXED_TIMESTEP
+    )
     
     self.load_assets()
     self.load_states()
@@ -63,9 +85,12 @@ class Game():
       self.get_delta_time()
       self.input_manager.capture()
       self.get_events()
-      self.update()
+      
+      for _ in range(self.frame_pacer.consume_steps()):
+        self.update()
+        self.input_manager.tick(self.delta_time)
+      
       self.render()
-      self.input_manager.tick(self.delta_time)
 
   def get_events(self):
     for event in pygame.event.get([pygame.QUIT]):
@@ -76,25 +101,64 @@ class Game():
   def update(self):
     self.state_stack[-1].update(self.delta_time)
 
-  def render(self):
-    self.state_stack[-1].render(self.game_canvas)
+  def create_canvas(self):
+    if (self.GAME_W, self.GAME_H) == (self.SCREEN_WIDTH, self.SCREEN_HEIGHT):
+      # Same size, draw straight onto the display surface
+      self.game_canvas = self.screen
+      self.scaled_canvas = None
+      self.scaled_rect = self.screen.get_rect()
+      return
+    
+    self.game_canvas = pygame.Surface((self.GAME_W, self.GAME_H)).convert()
+    
+    if self.INTEGER_SCALING:
+      factor = max(
+        min(self.SCREEN_WIDTH // self.GAME_W, self.SCREEN_HEIGHT // self.GAME_H),
+        1
+      )
+      scaled_size = (self.GAME_W * factor, self.GAME_H * factor)
+    else:
+      scaled_size = (self.SCREEN_WIDTH, self.SCREEN_HEIGHT)
+    
+    self.scaled_rect = pygame.Rect((0, 0), scaled_size)
+    self.scaled_rect.center = self.screen.get_rect().center
+    self.scaled_canvas = pygame.Surface(scaled_size).convert()
+    
+    # Letterbox bars never change, clear them once
+    self.screen.fill((0, 0, 0))
 
-    self.screen.blit(
+  def to_canvas_pos(self, pos: tuple[int, int]) -> tuple[int, int]:
+    """Convert a screen position (e.g. the mouse) to game canvas coordinates"""
+    return (
+      int((pos[0] - self.scaled_rect.x) * self.GAME_W / self.scaled_rect.width),
+      int((pos[1] - self.scaled_rect.y) * self.GAME_H / self.scaled_rect.height)
+    )
+
+  def render(self):
+    state = self.state_stack[-1]
+    self.dirty_rects = None
+    state.render(self.game_canvas)
+    self.last_rendered_state = state
+    
+    if self.scaled_canvas is not None:
+      # transform.scale is nearest-neighbour, and reuses the destination surface
       pygame.transform.scale(
         self.game_canvas,
-        (
-          self.SCREEN_WIDTH,
-          self.SCREEN_HEIGHT
-        )
-      ),
-      (0, 0)
-    )
-    pygame.display.flip()
+        self.scaled_rect.size,
+        self.scaled_canvas
+      )
+      self.screen.blit(self.scaled_canvas, self.scaled_rect)
+      pygame.display.flip()
+    elif self.dirty_rects is not None:
+      # The canvas is the display surface, only push what changed
+      pygame.display.update(self.dirty_rects)
+    else:
+      pygame.display.flip()
 
   def get_delta_time(self):
-    now = time.time()
-    self.delta_time = now - self.prev_time
-    self.prev_time = now
+    # Static menus don't need full frame rate
+    self.frame_pacer.tick(self.state_stack[-1].low_power)
+    self.delta_time = self.frame_pacer.step_time
 
   def draw_text(
     self,
@@ -107,23 +171,18 @@ class Game():
     if not text:
       return
     
-    # Handle line breaks in text
-    lines = str(text).split('\n')
-    
-    # Calculate total height for centering
-    line_height = self.font.get_height()
-    total_height = len(lines) * line_height
-    
-    # Start y position to center all lines
-    start_y = center[1] - total_height // 2
+    # Lines are wrapped and rendered once into a cached block
+    text_surface, line_count = self.text_renderer.render_block(
+      self.font,
+      str(text),
+      color,
+      max_width
+    )
     
-    for i, line in enumerate(lines):
-      if line.strip():  # Only render non-empty lines
-        text_surface = self.font.render(line, True, color)
-        text_rect = text_surface.get_rect()
-        text_rect.centerx = center[0]
-        text_rect.y = start_y + i * line_height
-        surface.blit(text_surface, text_rect)
+    # Lines are centered on the block's width // 2, not on its rect center
+    x = center[0] - text_surface.get_width() // 2
+    y = center[1] - line_count * self.font.get_height() // 2
+    surface.blit(text_surface, (x, y))
 
   def load_assets(self):
     # Load custom font file for Chinese support
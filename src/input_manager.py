@@ -15,9 +15,15 @@ class InputManager():
       
       if event.type == pygame.KEYDOWN:
         self.actions[event.key].pressed = True
+        self.actions[event.key].release_pending = False
 
       if event.type == pygame.KEYUP:
-        self.actions[event.key].clear()
+        action = self.actions[event.key]
+        if action.pressed and action.total_time == 0.0:
+          # Tapped within a single frame, let the next update see the press first
+          action.release_pending = True
+        else:
+          action.clear()
 
   def tick(self, delta_time: float):
     if self.paused:
@@ -29,7 +35,9 @@ class InputManager():
     
     for k in self.actions.keys():
       action = self.actions[k]
-      if action.pressed:
+      if action.release_pending:
+        action.clear()
+      elif action.pressed:
         action.total_time += delta_time
 
   def reset_keys(self):
@@ -88,8 +96,10 @@ class KeyState():
     self.pressed: bool = False
     self.last_triggered: float = 0.0
     self.total_time: float = 0.0
+    self.release_pending: bool = False
 
   def clear(self):
     self.pressed = False
+    self.release_pending = False
     self.total_time = 0.0
     self.last_triggered = 0.0
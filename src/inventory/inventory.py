@@ -1,7 +1,6 @@
-import json
-from typing import List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 
-from src.inventory.item import Item, ItemType
+from src.inventory.item_registry import ItemRegistry
 from src.inventory.item_stack import ItemStack
 
 
@@ -31,6 +30,45 @@ class Inventory:
     # 游標物品（滑鼠拿著的物品）
     self.cursor_stack: ItemStack = ItemStack()
 
+    # 道具欄索引：物品 ID → 總數量 / 所在格子
+    self.item_counts: Dict[str, int] = {}
+    self.item_slot_indices: Dict[str, Set[int]] = {}
+    # 每格上次同步時的內容 (物品 ID, 數量)，用於增量更新索引
+    self.slot_snapshots: List[Tuple[Optional[str], int]] = [
+      (None, 0) for _ in range(self.ITEM_SLOTS)
+    ]
+
+  def sync_slot(self, index: int):
+    """
+    道具欄格子內容改變後更新索引
+    直接修改 item_slots 的程式碼（例如游標拿起/放下）必須呼叫
+    """
+    slot = self.item_slots[index]
+    old_id, old_count = self.slot_snapshots[index]
+
+    if slot.is_empty():
+      new_id, new_count = None, 0
+    else:
+      new_id, new_count = slot.item.item_id, slot.count
+
+    if old_id == new_id and old_count == new_count:
+      return
+
+    if old_id is not None:
+      self.item_counts[old_id] -= old_count
+      if self.item_counts[old_id] <= 0:
+        del self.item_counts[old_id]
+
+      self.item_slot_indices[old_id].discard(index)
+      if not self.item_slot_indices[old_id]:
+        del self.item_slot_indices[old_id]
+
+    if new_id is not None:
+      self.item_counts[new_id] = self.item_counts.get(new_id, 0) + new_count
+      self.item_slot_indices.setdefault(new_id, set()).add(index)
+
+    self.slot_snapshots[index] = (new_id, new_count)
+
   def add_item(self, item_id: str, count: int = 1) -> int:
     """
     添加物品到道具欄
@@ -38,31 +76,21 @@ class Inventory:
     """
     remaining = count
 
-    with open("./assets/items.json", "r", encoding = "utf-8") as f:
-      items = json.load(f)
-
-    item = items[item_id]
-    item = Item(
-      item_id = item_id,
-      name = item["name"],
-      item_type = ItemType(item["item_type"]),
-      max_stack = item["max_stack"],
-      description = item["description"],
-      icon = item["icon"]
-    )
+    item = ItemRegistry.get(item_id)
 
     # 先嘗試堆疊到已有的格子
-    for slot in self.item_slots:
+    for index in sorted(self.item_slot_indices.get(item.item_id, ())):
       if remaining <= 0:
         break
 
-      if not slot.is_empty() and slot.item.item_id == item.item_id:
-        if slot.can_add(item, remaining):
-          added = slot.add(remaining)
-          remaining -= added
+      slot = self.item_slots[index]
+      if slot.can_add(item, remaining):
+        added = slot.add(remaining)
+        remaining -= added
+        self.sync_slot(index)
 
     # 如果還有剩餘，放入空格子
-    for slot in self.item_slots:
+    for index, slot in enumerate(self.item_slots):
       if remaining <= 0:
         break
 
@@ -70,6 +98,7 @@ class Inventory:
         amount_to_add = min(remaining, item.max_stack)
         slot.set_item(item, amount_to_add)
         remaining -= amount_to_add
+        self.sync_slot(index)
 
     return remaining
 
@@ -81,34 +110,24 @@ class Inventory:
     removed = 0
     remaining = count
 
-    for slot in self.item_slots:
+    for index in sorted(self.item_slot_indices.get(item_id, ())):
       if remaining <= 0:
         break
 
-      if not slot.is_empty() and slot.item.item_id == item_id:
-        actual_remove = slot.remove(remaining)
-        removed += actual_remove
-        remaining -= actual_remove
+      actual_remove = self.item_slots[index].remove(remaining)
+      removed += actual_remove
+      remaining -= actual_remove
+      self.sync_slot(index)
 
     return removed
 
   def has_item(self, item_id: str, count: int = 1) -> bool:
     """檢查是否擁有指定數量的物品"""
-    total = 0
-    for slot in self.item_slots:
-      if not slot.is_empty() and slot.item.item_id == item_id:
-        total += slot.count
-        if total >= count:
-          return True
-    return False
+    return self.item_counts.get(item_id, 0) >= count
 
   def count_item(self, item_id: str) -> int:
     """計算道具欄中某物品的總數"""
-    total = 0
-    for slot in self.item_slots:
-      if not slot.is_empty() and slot.item.item_id == item_id:
-        total += slot.count
-    return total
+    return self.item_counts.get(item_id, 0)
 
   def get_first_empty_slot(self) -> Optional[int]:
     """獲取第一個空格子的索引"""
@@ -129,6 +148,10 @@ class Inventory:
       slot.clear()
     self.cursor_stack.clear()
 
+    self.item_counts.clear()
+    self.item_slot_indices.clear()
+    self.slot_snapshots = [(None, 0) for _ in range(self.ITEM_SLOTS)]
+
   def __repr__(self):
     non_empty = sum(1 for slot in self.item_slots if not slot.is_empty())
     return f"Inventory({non_empty}/{self.ITEM_SLOTS} item slots used)"
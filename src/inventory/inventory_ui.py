@@ -6,6 +6,8 @@ if TYPE_CHECKING:
   from src.game import Game
 from src.inventory.inventory import Inventory
 from src.inventory.item_stack import ItemStack
+from src.texture_manager import TextureManager
+from src.surface_pool import SurfacePool
 
 
 class InventoryUI:
@@ -39,9 +41,9 @@ class InventoryUI:
     self.game = game
 
     # 載入背景圖片並裁切有效區域
-    full_image: pygame.Surface = pygame.image.load(
+    full_image: pygame.Surface = TextureManager.load(
       "./assets/ui/inventory-export.png"
-    ).convert_alpha()
+    )
 
     # 裁切左上角 176x94 的有效區域
     self.bg_image = full_image.subsurface((0, 0, self.UI_WIDTH, self.UI_HEIGHT))
@@ -74,13 +76,7 @@ class InventoryUI:
       self.small_font = pygame.font.SysFont("arial", 12)
 
   def render(self, surface: pygame.Surface):
-    """渲染整個背包介面"""
-    # 繪製半透明背景
-    overlay = pygame.Surface((self.game.GAME_W, self.game.GAME_H))
-    overlay.set_alpha(150)
-    overlay.fill((0, 0, 0))
-    surface.blit(overlay, (0, 0))
-
+    """渲染整個背包介面，半透明背景由 InventoryState 繪製"""
     # 繪製背包背景圖片
     surface.blit(self.bg_scaled, (self.ui_x, self.ui_y))
 
@@ -111,9 +107,7 @@ class InventoryUI:
 
       # 繪製高亮
       if is_hovered:
-        highlight = pygame.Surface((w, h), pygame.SRCALPHA)
-        highlight.fill((255, 255, 255, 80))
-        surface.blit(highlight, (x, y))
+        surface.blit(SurfacePool.get((w, h), (255, 255, 255, 80), flags = pygame.SRCALPHA), (x, y))
 
       # 繪製物品（填滿整個格子）
       if not slot.is_empty():
@@ -134,9 +128,7 @@ class InventoryUI:
 
         # 繪製高亮
         if is_hovered:
-          highlight = pygame.Surface((size, size), pygame.SRCALPHA)
-          highlight.fill((255, 255, 255, 80))
-          surface.blit(highlight, (x, y))
+          surface.blit(SurfacePool.get((size, size), (255, 255, 255, 80), flags = pygame.SRCALPHA), (x, y))
 
         # 繪製物品（填滿整個格子）
         if not slot.is_empty():
@@ -147,11 +139,7 @@ class InventoryUI:
     if self.game.inventory.cursor_stack.is_empty():
       return
 
-    mouse_x, mouse_y = pygame.mouse.get_pos()
-    scale_x = self.game.GAME_W / self.game.SCREEN_WIDTH
-    scale_y = self.game.GAME_H / self.game.SCREEN_HEIGHT
-    game_mouse_x = int(mouse_x * scale_x)
-    game_mouse_y = int(mouse_y * scale_y)
+    game_mouse_x, game_mouse_y = self.game.to_canvas_pos(pygame.mouse.get_pos())
 
     icon_size = self.ITEM_SLOT_SIZE * self.scale
     self.draw_item_icon(
@@ -183,16 +171,16 @@ class InventoryUI:
       slot.item.create_icon(32)
 
     # 縮放並繪製圖示
-    scaled_icon = pygame.transform.scale(slot.item.icon_surface, (width, height))
+    scaled_icon = slot.item.get_scaled_icon(width, height)
     surface.blit(scaled_icon, (x, y))
 
     # 繪製數量
     if draw_count and slot.count > 1:
       count_text = str(slot.count)
-      text_surface = self.small_font.render(count_text, True, (255, 255, 255))
+      text_surface = self.game.text_renderer.render(self.small_font, count_text, (255, 255, 255))
 
       # 繪製陰影
-      shadow_surface = self.small_font.render(count_text, True, (0, 0, 0))
+      shadow_surface = self.game.text_renderer.render(self.small_font, count_text, (0, 0, 0))
       surface.blit(shadow_surface, (x + width - text_surface.get_width() - 1, y + height - text_surface.get_height() + 1))
 
       # 繪製文字
@@ -204,11 +192,7 @@ class InventoryUI:
     if slot is None or slot.is_empty():
       return
 
-    mouse_x, mouse_y = pygame.mouse.get_pos()
-    scale_x = self.game.GAME_W / self.game.SCREEN_WIDTH
-    scale_y = self.game.GAME_H / self.game.SCREEN_HEIGHT
-    game_mouse_x = int(mouse_x * scale_x)
-    game_mouse_y = int(mouse_y * scale_y)
+    game_mouse_x, game_mouse_y = self.game.to_canvas_pos(pygame.mouse.get_pos())
 
     # 準備文字
     lines = [slot.item.name]
@@ -237,7 +221,7 @@ class InventoryUI:
 
     # 繪製文字
     for i, line in enumerate(lines):
-      text_surface = self.font.render(line, True, (255, 255, 255))
+      text_surface = self.game.text_renderer.render(self.font, line, (255, 255, 255))
       surface.blit(text_surface, (tooltip_x + padding, tooltip_y + padding + i * line_height))
 
   def get_slot_at_position(self, x: int, y: int) -> Optional[Tuple[str, int]]:
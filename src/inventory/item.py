@@ -3,6 +3,8 @@ from typing import Optional
 
 import pygame
 
+from src.texture_manager import TextureManager
+
 
 class ItemType(Enum):
   """物品類型"""
@@ -30,20 +32,48 @@ class Item:
     self.max_stack: int = max_stack
     self.description: str = description
 
-    # 圖示
-    self.icon_surface: Optional[pygame.Surface] = None
+    # 圖示（第一次使用時才載入）
+    self.icon: Optional[str] = icon
+    self.icon_path: Optional[str] = None
     self.icon_color: tuple = (100, 100, 100)
+    self._icon_surface: Optional[pygame.Surface] = None
+    self._icon_loaded: bool = False
+
+  @property
+  def icon_surface(self) -> Optional[pygame.Surface]:
+    if not self._icon_loaded:
+      self._icon_loaded = True
+      if self.icon:
+        self.load_icon(self.icon)
+    return self._icon_surface
 
-    if icon:
-      self.load_icon(icon)
+  @icon_surface.setter
+  def icon_surface(self, surface: Optional[pygame.Surface]):
+    self._icon_loaded = True
+    self._icon_surface = surface
+
+  def set_icon(self, icon: Optional[str]):
+    """更換圖示，下次使用時重新載入"""
+    self.icon = icon
+    self.icon_path = None
+    self._icon_surface = None
+    self._icon_loaded = False
 
   def load_icon(self, name: str):
     """載入物品圖示"""
     try:
-      self.icon_surface = pygame.image.load(f"./assets/icon/{name}.png").convert_alpha()
+      self.icon_path = f"./assets/icon/{name}.png"
+      self.icon_surface = TextureManager.load(self.icon_path)
     except Exception:
+      self.icon_path = None
       self.icon_surface = None
 
+  def get_scaled_icon(self, width: int, height: int) -> pygame.Surface:
+    """取得縮放後的圖示（共用快取）"""
+    if self.icon_surface is not None and self.icon_path is not None:
+      return TextureManager.load_scaled(self.icon_path, (width, height))
+    return pygame.transform.scale(self.icon_surface, (width, height))
+
   def create_icon(self, size: int = 32):
     """創建簡單的色塊圖示"""
     self.icon_surface = pygame.Surface((size, size), pygame.SRCALPHA)
@@ -0,0 +1,69 @@
+import json
+from typing import Dict, Optional
+
+from src.inventory.item import Item, ItemType
+
+
+class ItemRegistry:
+  """
+  物品定義註冊表
+  - items.json 只解析一次
+  - 每種物品共用同一個 Item 實例（圖示延遲載入並快取）
+  """
+
+  ITEMS_PATH = "./assets/items.json"
+
+  _definitions: Optional[Dict[str, dict]] = None
+  _items: Dict[str, Item] = {}
+
+  @staticmethod
+  def get_definitions() -> Dict[str, dict]:
+    """取得 items.json 的原始定義"""
+    if ItemRegistry._definitions is None:
+      with open(ItemRegistry.ITEMS_PATH, "r", encoding = "utf-8") as f:
+        ItemRegistry._definitions = json.load(f)
+    return ItemRegistry._definitions
+
+  @staticmethod
+  def has(item_id: str) -> bool:
+    """物品是否存在"""
+    return item_id in ItemRegistry.get_definitions()
+
+  @staticmethod
+  def get(item_id: str) -> Item:
+    """取得共用的物品實例，不存在時拋出 KeyError"""
+    item = ItemRegistry._items.get(item_id)
+    if item is not None:
+      return item
+
+    definition = ItemRegistry.get_definitions()[item_id]
+    item = Item(
+      item_id = item_id,
+      name = definition["name"],
+      item_type = ItemType(definition["item_type"]),
+      max_stack = definition["max_stack"],
+      description = definition["description"],
+      icon = definition["icon"]
+    )
+    ItemRegistry._items[item_id] = item
+    return item
+
+  @staticmethod
+  def reload():
+    """
+    重新讀取 items.json（開發用）
+    已建立的 Item 會就地更新，背包中的物品會直接套用新定義
+    """
+    ItemRegistry._definitions = None
+    definitions = ItemRegistry.get_definitions()
+
+    for item_id, item in ItemRegistry._items.items():
+      definition = definitions.get(item_id)
+      if definition is None:
+        continue
+
+      item.name = definition["name"]
+      item.item_type = ItemType(definition["item_type"])
+      item.max_stack = definition["max_stack"]
+      item.description = definition["description"]
+      item.set_icon(definition["icon"])
@@ -0,0 +1,143 @@
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+  from src.map_loader import MapData
+
+
+# Shared by every cache, a new game must not start another thread
+executor: ThreadPoolExecutor = ThreadPoolExecutor(
+  max_workers = 1,
+  thread_name_prefix = "map-prefetch"
+)
+
+
+class MapCache():
+  """
+  Recently visited maps plus neighbours prefetched on a worker thread.
+  build runs on the worker and returns a parsed map, it is finished (converted to
+  the display format) on the main thread when stored.
+  """
+
+  def __init__(
+    self,
+    build: Callable[[str, frozenset[str] | None], "MapData"],
+    memory_budget: int = 96 * 1024 * 1024
+  ):
+    self.build = build
+    self.memory_budget: int = memory_budget
+
+    # Only touched from the main thread, workers hand results back through futures
+    self.entries: OrderedDict[str, "MapData"] = OrderedDict()
+    self.sizes: dict[str, int] = {}
+    self.total_size: int = 0
+    self.pending: dict[str, Future] = {}
+    # The map on screen is never evicted
+    self.active: str | None = None
+    # Neither are maps streamed in around it
+    self.pinned: set[str] = set()
+
+  def get(self, name: str, defeated_npcs: frozenset[str] | None) -> "MapData":
+    self.active = name
+    self.collect()
+
+    data = self.entries.get(name)
+    if data is not None:
+      self.entries.move_to_end(name)
+      return data
+
+    future = self.pending.pop(name, None)
+    if future is not None:
+      try:
+        # Still loading, waiting is cheaper than starting over
+        data = future.result()
+      except Exception:
+        data = None
+
+    if data is None:
+      data = self.build(name, defeated_npcs)
+
+    self._store(name, data)
+    return data
+
+  def prefetch(self, names: list[str], defeated_npcs: frozenset[str] | None):
+    self.collect()
+
+    for name in names:
+      if name in self.entries or name in self.pending:
+        continue
+      self.pending[name] = executor.submit(self.build, name, defeated_npcs)
+
+  def collect(self, limit: int | None = None):
+    """Move finished prefetches into the cache, at most limit per call to spread the conversion over frames"""
+    for name, future in list(self.pending.items()):
+      if limit is not None and limit <= 0:
+        break
+      if not future.done():
+        continue
+
+      del self.pending[name]
+
+      try:
+        data = future.result()
+      except Exception:
+        # Loading again on demand will raise the error where it matters
+        continue
+
+      self._store(name, data)
+      if limit is not None:
+        limit -= 1
+
+  def is_loading(self, name: str) -> bool:
+    return name in self.pending
+
+  def _store(self, name: str, data: "MapData"):
+    if not data.finished:
+      data.finish()
+
+    if name in self.entries:
+      self.total_size -= self.sizes.pop(name)
+
+    size = data.get_size()
+    self.entries[name] = data
+    self.sizes[name] = size
+    self.total_size += size
+
+    # Evict least recently used maps, never the one being stored or the ones on screen
+    for evict_name in list(self.entries.keys()):
+      if self.total_size <= self.memory_budget:
+        break
+      if evict_name == name or evict_name == self.active or evict_name in self.pinned:
+        continue
+      self.entries.pop(evict_name).release()
+      self.total_size -= self.sizes.pop(evict_name)
+
+  def invalidate(self, name: str):
+    """Free a cached map, it must not be on screen"""
+    if name in self.entries:
+      self.entries.pop(name).release()
+      self.total_size -= self.sizes.pop(name)
+
+  def clear(self):
+    """Drop queued prefetches and free every cached map, e.g. when the game world is left"""
+    for future in self.pending.values():
+      if not future.cancel():
+        # Already parsing, give back the images it decodes once it is done
+        future.add_done_callback(MapCache._release_result)
+    self.pending.clear()
+    for data in self.entries.values():
+      data.release()
+    self.entries.clear()
+    self.sizes.clear()
+    self.total_size = 0
+
+  @staticmethod
+  def _release_result(future: Future):
+    if future.exception() is None:
+      future.result().release()
+
+  def close(self):
+    self.clear()
+    self.active = None
+    self.pinned.clear()
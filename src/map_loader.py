@@ -1,126 +1,520 @@
 import pygame
 import pytmx
+from pytmx.util_pygame import handle_transformation, smart_convert
 import json
 
 from src.npc import Npc
 from src.audio_manager import AudioManager
+from src.map_cache import MapCache
+from src.texture_manager import TextureManager
 
 
 class MapLoader():
   def __init__(self, name: str, game = None):
     self.game = game
-    self.tiles: pygame.sprite.Group[MapTile] = pygame.sprite.Group()
-    self.npcs: pygame.sprite.Group[Npc] = pygame.sprite.Group()
-    self.objects: pygame.sprite.Group[MapObject] = pygame.sprite.Group()
-    self.map: pytmx.TiledMap | None = None
-    self.metadata: MapMetadata = MapMetadata()
+    self.current: MapData | None = None
+    self.cache: MapCache = MapCache(self.build)
 
     self.change_map(name)
 
+  @property
+  def name(self) -> str:
+    return self.current.name
+
+  @property
+  def map(self) -> pytmx.TiledMap:
+    return self.current.map
+
+  @property
+  def metadata(self) -> "MapMetadata":
+    return self.current.metadata
+
+  @property
+  def tiles(self) -> pygame.sprite.Group:
+    return self.current.tiles
+
+  @property
+  def npcs(self) -> pygame.sprite.Group:
+    return self.current.npcs
+
+  @property
+  def objects(self) -> pygame.sprite.Group:
+    return self.current.objects
+
+  @property
+  def collision_grid(self) -> "CollisionGrid":
+    return self.current.collision_grid
+
+  @property
+  def npc_hash(self) -> "SpatialHash":
+    return self.current.npc_hash
+
+  @property
+  def solid_hash(self) -> "SpatialHash":
+    return self.current.solid_hash
+
+  @property
+  def exit_hash(self) -> "SpatialHash":
+    return self.current.exit_hash
+
+  @property
+  def pixel_size(self) -> tuple[int, int]:
+    return self.current.pixel_size
+
+  @property
+  def space(self) -> object:
+    """The coordinate space the player is in, the camera jumps when it changes"""
+    return self.current
+
+  def get_scene_key(self) -> tuple:
+    """Changes whenever the baked map changes"""
+    return (self.current, self.current.bake_count)
+
+  def get_tile_center(self, x: float, y: float) -> tuple[float, float]:
+    """World position of a tile of the current map"""
+    return (
+      self.current.origin[0] + x * self.map.tilewidth + self.map.tilewidth / 2,
+      self.current.origin[1] + y * self.map.tileheight + self.map.tileheight / 2
+    )
+
+  def build(self, name: str, defeated_npcs: frozenset[str] | None) -> "MapData":
+    """Runs on the cache's worker thread"""
+    return MapData.parse(name, defeated_npcs)
+
+  def update(self, focus: pygame.Rect, view: pygame.Rect):
+    """Called every update step with the player and camera rects, see StreamingMapLoader"""
+    pass
+
+  def get_defeated_npcs(self) -> frozenset[str] | None:
+    if self.game is None:
+      return None
+    return frozenset(self.game.defeated_npcs)
+
+  def request_map(self, name: str):
+    """Start loading a map on the worker thread, change_map is a pointer swap once is_ready"""
+    self.cache.prefetch([name], self.get_defeated_npcs())
+
+  def is_ready(self, name: str) -> bool:
+    """False while the requested map is still loading, True also when it failed to load"""
+    self.cache.collect()
+    return name in self.cache.entries or not self.cache.is_loading(name)
+
   def change_map(self, name: str):
-    self.tiles.empty()
-    self.npcs.empty()
-    self.objects.empty()
-    self.metadata.clear()
+    defeated_npcs = self.get_defeated_npcs()
+    previous_music = self.metadata.music if self.current is not None else ""
+    
+    # Usually a pointer swap, the map was prefetched while the player walked here
+    self.current = self.cache.get(name, defeated_npcs)
+    
+    if self.current.defeated_npcs != defeated_npcs:
+      self.current.refresh(defeated_npcs)
+    
+    # Maps sharing a track keep playing it instead of restarting
+    if self.metadata.music and self.metadata.music != previous_music:
+      AudioManager.play_background_music(self.metadata.music)
     
-    self.map = pytmx.load_pygame(f"./assets/map/{name}/map.tmx")
+    self.cache.prefetch(self.current.get_neighbours(), defeated_npcs)
+    
+    # Images only the previous map used are no longer referenced by any cached map
+    TextureManager.purge_unused()
+
+  def close(self):
+    """Stop prefetching and free every cached map, the loader is not used afterwards"""
+    self.cache.close()
+    self.current = None
+    TextureManager.purge_unused()
+
+  def remove_npc(self, name: str):
+    for npc in self.npcs:
+      if npc.name == name:
+        self.npcs.remove(npc)
+        self.npc_hash.remove(npc)
+        return
+
+  def reload_objects(self):
+    """Reload objects to reflect boss death status and rebuild the baked map"""
+    self.current.refresh(self.get_defeated_npcs())
+
+  def render(self, surface: pygame.Surface, offset: tuple[int, int] = (0, 0)):
+    """Draw the baked chunks in view, offset is the world position at the surface's top-left"""
+    view = pygame.Rect(offset, surface.get_size())
+    for rect, chunk in self.current.get_chunks(view):
+      surface.blit(chunk, (rect.x - offset[0], rect.y - offset[1]))
+
+def decode_tile_images(filename: str, colorkey: str | None, **kwargs):
+  """pytmx image loader like pytmx.load_pygame's, without the conversion that needs the display"""
+  image = pygame.image.load(filename)
+  if colorkey:
+    colorkey = pygame.Color(f"#{colorkey}")
+  
+  def load_image(rect = None, flags = None) -> pygame.Surface:
+    tile = image.subsurface(rect) if rect else image.copy()
+    if flags:
+      tile = handle_transformation(tile, flags)
+    if colorkey:
+      # Picked up again by smart_convert in MapData.finish
+      tile.set_colorkey(colorkey)
+    return tile
+  
+  return load_image
+
+class MapData():
+  """Everything built from one map's TMX and metadata"""
+  # Width and height of a baked chunk, only chunks in view are drawn
+  CHUNK_TILES: int = 16
+
+  def __init__(self, name: str):
+    self.name: str = name
+    # World position of the map's top-left in pixels, not (0, 0) when stitched into a world
+    self.origin: tuple[int, int] = (0, 0)
+    self.map: pytmx.TiledMap | None = None
+    self.metadata: MapMetadata = MapMetadata()
+    self.tiles: pygame.sprite.Group[MapTile] = pygame.sprite.Group()
+    self.npcs: pygame.sprite.Group[Npc] = pygame.sprite.Group()
+    self.objects: pygame.sprite.Group[MapObject] = pygame.sprite.Group()
+    self.collision_grid: CollisionGrid | None = None
+    # Baked tiles and objects, (chunk x, chunk y) -> (world rect, surface)
+    self.chunks: dict[tuple[int, int], tuple[pygame.Rect, pygame.Surface]] = {}
+    self.chunk_size: tuple[int, int] = (0, 0)
+    # Bumped by bake(), the chunks changed
+    self.bake_count: int = 0
+    # NPCs, blocking objects and exit objects by position, see build_spatial_hashes
+    self.npc_hash: SpatialHash | None = None
+    self.solid_hash: SpatialHash | None = None
+    self.exit_hash: SpatialHash | None = None
+    # Defeated NPCs the NPCs and objects were built for, None when there is no game
+    self.defeated_npcs: frozenset[str] | None = None
+    # NPC metadata read by parse(), the sprites are created by finish()
+    self.npc_data: dict[str, dict] = {}
+    # Textures held for the NPCs and the objects, given back by release() and load_objects()
+    self.npc_textures: list[tuple] = []
+    self.object_textures: list[tuple] = []
+    # Images decoded by parse(), held until finish() has loaded them
+    self.decoded_textures: list[tuple] = []
+    # False between parse() and finish(), the images aren't in the display format yet
+    self.finished: bool = False
+
+  @staticmethod
+  def load(
+    name: str,
+    defeated_npcs: frozenset[str] | None = None,
+    origin: tuple[int, int] = (0, 0)
+  ) -> "MapData":
+    """Parse and build a map in one go, on the main thread"""
+    data = MapData.parse(name, defeated_npcs, origin)
+    data.finish()
+    return data
+
+  @staticmethod
+  def parse(
+    name: str,
+    defeated_npcs: frozenset[str] | None = None,
+    origin: tuple[int, int] = (0, 0)
+  ) -> "MapData":
+    """
+    Everything that doesn't need the display, safe to run on a worker thread:
+    TMX and metadata, collision, tiles and baked tile chunks. Images stay in their
+    file format until finish() converts them.
+    """
+    data = MapData(name)
+    data.origin = origin
+    data.defeated_npcs = defeated_npcs
+    data.map = pytmx.TiledMap(f"./assets/map/{name}/map.tmx", image_loader = decode_tile_images)
     
     with open(f"./assets/map/{name}/map.meta.json", "r", encoding = "utf-8") as f:
       json_data = json.load(f)
       
-      self.metadata.collisions = json_data["collision_gid"]
+      data.metadata.collisions = set(json_data["collision_gid"])
       
       for exit in json_data["exit"]:
-        self.metadata.exits[(exit["source_x"], exit["source_y"])] = MapExit(
+        data.metadata.exits[(exit["source_x"], exit["source_y"])] = MapExit(
           exit["dist"],
           exit["dist_x"],
           exit["dist_y"]
         )
       
       entity_data = json_data.get("entity", {})
-      self.metadata.npc_names = entity_data.get("npc", [])
+      data.metadata.npc_names = entity_data.get("npc", [])
       
-      # Load objects
-      for obj_data in json_data.get("object", []):
-        show_when_boss_dead = obj_data.get("show_when_boss_dead", False)
-        hide_when_boss_dead = obj_data.get("hide_when_boss_dead", False)
-        
-        # Check if object should be shown based on boss status
-        should_skip = False
-        if self.game:
-          if show_when_boss_dead:
-            if isinstance(show_when_boss_dead, list):
-              # Check if all specified bosses are defeated
-              all_bosses_dead = all(boss in self.game.defeated_npcs for boss in show_when_boss_dead)
-              if not all_bosses_dead:
-                should_skip = True
-            else:
-              # Original logic for boolean or single boss
-              map_npc_names = entity_data.get("npc", [])
-              bosses_alive = any(npc not in self.game.defeated_npcs for npc in map_npc_names)
-              if bosses_alive:
-                should_skip = True
-          
-          if hide_when_boss_dead:
-            map_npc_names = entity_data.get("npc", [])
-            bosses_alive = any(npc not in self.game.defeated_npcs for npc in map_npc_names)
-            if not bosses_alive:
-              should_skip = True
-        
-        if should_skip:
-          continue
-        
-        # Get exit data if present
-        obj_exit = None
-        if "exit" in obj_data:
-          exit_data = obj_data["exit"]
-          obj_exit = MapExit(exit_data["dist"], exit_data["dist_x"], exit_data["dist_y"])
-        
-        map_obj = MapObject(
-          obj_data["img"],
-          obj_data["x"],
-          obj_data["y"],
-          obj_data.get("collision", True),
-          self.map.tilewidth,
-          self.map.tileheight,
-          obj_exit
-        )
-        self.objects.add(map_obj)
+      data.metadata.object_data = json_data.get("object", [])
       
-      self.metadata.music = json_data.get("music", "")
-      self.metadata.walk_sound = json_data.get("walk_sound", "")
-      self.metadata.boss_died_exit = json_data.get("boss_died_exit", False)
+      data.metadata.music = json_data.get("music", "")
+      data.metadata.walk_sound = json_data.get("walk_sound", "")
+      data.metadata.boss_died_exit = json_data.get("boss_died_exit", False)
       
       # Load entry point
       entry_point = json_data.get("entry_point", {"x": 16, "y": 9})  # Default center-ish position
-      self.metadata.entry_x = entry_point["x"]
-      self.metadata.entry_y = entry_point["y"]
+      data.metadata.entry_x = entry_point["x"]
+      data.metadata.entry_y = entry_point["y"]
     
-    if self.metadata.music:
-      AudioManager.play_background_music(self.metadata.music)
+    data.collision_grid = CollisionGrid(
+      data.map.width,
+      data.map.height,
+      data.map.tilewidth,
+      data.map.tileheight,
+      origin
+    )
     
-    for layer in self.map.visible_layers:
+    for layer in data.map.visible_layers:
       for x, y, gid in layer:
         tile = MapTile(
-          self.map.get_tile_image_by_gid(gid),
-          self.map.tiledgidmap[gid],
+          data.map.get_tile_image_by_gid(gid),
+          data.map.tiledgidmap[gid],
           x, y,
-          self.map.tilewidth,
-          self.map.tileheight
+          data.map.tilewidth,
+          data.map.tileheight
         )
+        tile.rect.move_ip(origin)
         
-        self.tiles.add(tile)
+        data.tiles.add(tile)
+        
+        if tile.gid in data.metadata.collisions:
+          data.collision_grid.set_flag(x, y, CollisionGrid.BLOCKED)
+    
+    for x, y in data.metadata.exits:
+      data.collision_grid.set_flag(x, y, CollisionGrid.EXIT)
+    
+    # NPC and object sprites are created by finish(), only read their files here
+    for npc_name in data.metadata.npc_names:
+      if defeated_npcs is not None and npc_name in defeated_npcs:
+        continue
+      data.npc_data[npc_name] = Npc.read_meta(npc_name)
+      TextureManager.decode(data.npc_data[npc_name]["source_img"], data.decoded_textures)
+    
+    for obj_data in data.metadata.object_data:
+      try:
+        TextureManager.decode(f"./assets/map/tileset/{obj_data['img']}.png", data.decoded_textures)
+      except FileNotFoundError:
+        # MapObject draws a placeholder
+        pass
+    
+    data.create_chunks()
+    data.draw_chunks(data.tiles)
     
+    return data
+
+  def finish(self):
+    """Convert the parsed map to the display format and add NPCs and objects, main thread only"""
+    converted: dict[int, pygame.Surface] = {}
+    for gid, image in enumerate(self.map.images):
+      if image is not None:
+        converted[id(image)] = smart_convert(image, image.get_colorkey(), True)
+        self.map.images[gid] = converted[id(image)]
+    
+    for tile in self.tiles:
+      tile.image = converted.get(id(tile.image), tile.image)
+    
+    for key, (rect, chunk) in self.chunks.items():
+      self.chunks[key] = (rect, chunk.convert())
+    
+    for npc_name, npc_data in self.npc_data.items():
+      npc = Npc(npc_name, self.map.tilewidth, self.map.tileheight, npc_data, self.npc_textures)
+      npc.move_to_world(self.origin)
+      self.npcs.add(npc)
+    self.npc_data.clear()
+    
+    self.load_objects()
+    self.build_spatial_hashes()
+    
+    # Objects go on top of the tiles baked by parse()
+    self.draw_chunks(self.objects)
+    self.bake_count += 1
+    self.finished = True
+    TextureManager.release(self.decoded_textures)
+
+  def refresh(self, defeated_npcs: frozenset[str] | None):
+    """Bring NPCs and boss dependent objects up to date with the defeated NPCs"""
+    self.defeated_npcs = defeated_npcs
+    
+    # Rebuilt from the map's NPC list, cached maps keep their NPC instances between visits
+    present = {npc.name: npc for npc in self.npcs}
+    self.npcs.empty()
     for npc_name in self.metadata.npc_names:
-      # Skip defeated NPCs
-      if self.game and npc_name in self.game.defeated_npcs:
+      if defeated_npcs is not None and npc_name in defeated_npcs:
         continue
-      npc = Npc(npc_name, self.map.tilewidth, self.map.tileheight)
+      npc = present.get(npc_name)
+      if npc is None:
+        npc = Npc(npc_name, self.map.tilewidth, self.map.tileheight, owner = self.npc_textures)
+        npc.move_to_world(self.origin)
       self.npcs.add(npc)
+    
+    self.load_objects()
+    self.build_spatial_hashes()
+    self.bake()
+
+  def build_spatial_hashes(self):
+    """Index NPCs and objects, maps can have hundreds of decorative objects"""
+    # A few tiles per cell, the player covers one or two cells
+    cell_size = max(self.map.tilewidth, self.map.tileheight) * 4
+    self.npc_hash = SpatialHash(cell_size)
+    self.solid_hash = SpatialHash(cell_size)
+    self.exit_hash = SpatialHash(cell_size)
+    
+    for npc in self.npcs:
+      self.npc_hash.add(npc)
+    
+    for obj in self.objects:
+      if obj.collision:
+        self.solid_hash.add(obj)
+      if obj.exit:
+        self.exit_hash.add(obj)
+
+  def load_objects(self):
+    self.objects.empty()
+    TextureManager.release(self.object_textures)
+    defeated_npcs = self.defeated_npcs
+    
+    for obj_data in self.metadata.object_data:
+      show_when_boss_dead = obj_data.get("show_when_boss_dead", False)
+      hide_when_boss_dead = obj_data.get("hide_when_boss_dead", False)
+      
+      # Check if object should be shown based on boss status
+      should_skip = False
+      if defeated_npcs is not None:
+        if show_when_boss_dead:
+          if isinstance(show_when_boss_dead, list):
+            # Check if all specified bosses are defeated
+            all_bosses_dead = all(boss in defeated_npcs for boss in show_when_boss_dead)
+            if not all_bosses_dead:
+              should_skip = True
+          else:
+            # Original logic for boolean or single boss
+            bosses_alive = any(npc not in defeated_npcs for npc in self.metadata.npc_names)
+            if bosses_alive:
+              should_skip = True
+        
+        if hide_when_boss_dead:
+          bosses_alive = any(npc not in defeated_npcs for npc in self.metadata.npc_names)
+          if not bosses_alive:
+            should_skip = True
+      
+      if should_skip:
+        continue
+      
+      # Get exit data if present
+      obj_exit = None
+      if "exit" in obj_data:
+        exit_data = obj_data["exit"]
+        obj_exit = MapExit(exit_data["dist"], exit_data["dist_x"], exit_data["dist_y"])
+      
+      map_obj = MapObject(
+        obj_data["img"],
+        obj_data["x"],
+        obj_data["y"],
+        obj_data.get("collision", True),
+        self.map.tilewidth,
+        self.map.tileheight,
+        obj_exit,
+        self.object_textures
+      )
+      map_obj.rect.move_ip(self.origin)
+      self.objects.add(map_obj)
+
+  @property
+  def pixel_size(self) -> tuple[int, int]:
+    return (self.map.width * self.map.tilewidth, self.map.height * self.map.tileheight)
+
+  @property
+  def bounds(self) -> pygame.Rect:
+    """Area of the map in world pixels"""
+    return pygame.Rect(self.origin, self.pixel_size)
+
+  def _iter_chunk_keys(self, rect: pygame.Rect):
+    """Keys of the chunks overlapping a rect in world pixels"""
+    chunk_width, chunk_height = self.chunk_size
+    width, height = self.pixel_size
+    rect = rect.move(-self.origin[0], -self.origin[1])
+    
+    left = max(rect.left // chunk_width, 0)
+    right = min((rect.right - 1) // chunk_width, (width - 1) // chunk_width)
+    top = max(rect.top // chunk_height, 0)
+    bottom = min((rect.bottom - 1) // chunk_height, (height - 1) // chunk_height)
+    
+    for y in range(top, bottom + 1):
+      for x in range(left, right + 1):
+        yield x, y
+
+  def bake(self):
+    """Pre-render all visible tile layers and objects into chunk surfaces"""
+    self.create_chunks()
+    for key, (rect, chunk) in self.chunks.items():
+      self.chunks[key] = (rect, chunk.convert())
+    
+    self.draw_chunks([*self.tiles, *self.objects])
+    self.bake_count += 1
+
+  def create_chunks(self):
+    """Blank chunk surfaces, in the file format until converted"""
+    chunk_width = self.map.tilewidth * MapData.CHUNK_TILES
+    chunk_height = self.map.tileheight * MapData.CHUNK_TILES
+    self.chunk_size = (chunk_width, chunk_height)
+    
+    bounds = self.bounds
+    chunks: dict[tuple[int, int], tuple[pygame.Rect, pygame.Surface]] = {}
+    for key in self._iter_chunk_keys(bounds):
+      rect = pygame.Rect(
+        bounds.x + key[0] * chunk_width,
+        bounds.y + key[1] * chunk_height,
+        chunk_width,
+        chunk_height
+      ).clip(bounds)
+      chunk = pygame.Surface(rect.size)
+      chunk.fill((255, 255, 255))
+      chunks[key] = (rect, chunk)
+    
+    self.chunks = chunks
+
+  def draw_chunks(self, sprites):
+    """Blit sprites in order, sprites on a border go into every chunk they touch"""
+    for sprite in sprites:
+      for key in self._iter_chunk_keys(sprite.rect):
+        rect, chunk = self.chunks[key]
+        chunk.blit(sprite.image, (sprite.rect.x - rect.x, sprite.rect.y - rect.y))
+
+  def get_chunks(self, view: pygame.Rect) -> list[tuple[pygame.Rect, pygame.Surface]]:
+    """(world rect, surface) of the chunks in view"""
+    return [self.chunks[key] for key in self._iter_chunk_keys(view)]
+
+  def release(self):
+    """Break the sprite <-> group reference cycles and give back the textures, the map is not used afterwards"""
+    self.tiles.empty()
+    self.npcs.empty()
+    self.objects.empty()
+    self.chunks.clear()
+    TextureManager.release(self.npc_textures)
+    TextureManager.release(self.object_textures)
+    TextureManager.release(self.decoded_textures)
 
-  def render(self, surface: pygame.Surface):
-    self.tiles.draw(surface)
-    self.objects.draw(surface)
+  def get_neighbours(self) -> list[str]:
+    """Maps reachable through this map's tile and object exits"""
+    names: list[str] = []
+    
+    for map_exit in self.metadata.exits.values():
+      if map_exit.dist not in names:
+        names.append(map_exit.dist)
+    
+    # Include exits of hidden objects, they appear once the boss is defeated
+    for obj_data in self.metadata.object_data:
+      if "exit" in obj_data and obj_data["exit"]["dist"] not in names:
+        names.append(obj_data["exit"]["dist"])
+    
+    if self.name in names:
+      names.remove(self.name)
+    
+    return names
+
+  def get_size(self) -> int:
+    """Rough memory use of the surfaces owned by this map, in bytes"""
+    surfaces = [chunk for _, chunk in self.chunks.values()]
+    surfaces.extend(image for image in self.map.images if image is not None)
+    surfaces.extend(obj.image for obj in self.objects)
+    surfaces.extend(npc.image for npc in self.npcs)
+    
+    return sum(
+      surface.get_width() * surface.get_height() * surface.get_bytesize()
+      for surface in surfaces
+      if surface is not None
+    )
 
 class MapTile(pygame.sprite.Sprite):
   def __init__(
@@ -145,11 +539,125 @@ class MapTile(pygame.sprite.Sprite):
     self.rect.width = width
     self.rect.height = height
 
+class CollisionGrid():
+  """Per-tile collision and exit flags for the current map"""
+  BLOCKED = 1
+  EXIT = 2
+
+  def __init__(
+    self,
+    width: int,
+    height: int,
+    tile_width: int,
+    tile_height: int,
+    origin: tuple[int, int] = (0, 0)
+  ):
+    self.width: int = width
+    self.height: int = height
+    self.tile_width: int = tile_width
+    self.tile_height: int = tile_height
+    # World position of cell (0, 0), rects are in world pixels and cells in map tiles
+    self.origin: tuple[int, int] = origin
+    self.cells: bytearray = bytearray(width * height)
+
+  def set_flag(self, x: int, y: int, flag: int):
+    if 0 <= x < self.width and 0 <= y < self.height:
+      self.cells[y * self.width + x] |= flag
+
+  def get_flags(self, x: int, y: int) -> int:
+    if 0 <= x < self.width and 0 <= y < self.height:
+      return self.cells[y * self.width + x]
+    return 0
+
+  def iter_cells(self, rect: pygame.Rect):
+    """Yield (x, y, flags) for every cell overlapping the rect"""
+    if rect.width <= 0 or rect.height <= 0:
+      return
+    
+    if self.origin != (0, 0):
+      rect = rect.move(-self.origin[0], -self.origin[1])
+    
+    left = max(rect.left // self.tile_width, 0)
+    right = min((rect.right - 1) // self.tile_width, self.width - 1)
+    top = max(rect.top // self.tile_height, 0)
+    bottom = min((rect.bottom - 1) // self.tile_height, self.height - 1)
+    
+    for y in range(top, bottom + 1):
+      row = y * self.width
+      for x in range(left, right + 1):
+        yield x, y, self.cells[row + x]
+
+  def is_blocked(self, rect: pygame.Rect) -> bool:
+    for _, _, flags in self.iter_cells(rect):
+      if flags & CollisionGrid.BLOCKED:
+        return True
+    return False
+
+  def get_exits(self, rect: pygame.Rect) -> list[tuple[int, int]]:
+    return [
+      (x, y) for x, y, flags in self.iter_cells(rect)
+      if flags & CollisionGrid.EXIT
+    ]
+
+class SpatialHash():
+  """Sprites bucketed by the grid cells their rects cover, for lookups near a rect"""
+
+  def __init__(self, cell_size: int):
+    self.cell_size: int = cell_size
+    self.cells: dict[tuple[int, int], list[pygame.sprite.Sprite]] = {}
+    # Insertion order, results keep the order the sprites were added in like a Group
+    self.order: dict[pygame.sprite.Sprite, int] = {}
+
+  def _iter_keys(self, rect: pygame.Rect):
+    if rect.width <= 0 or rect.height <= 0:
+      return
+    
+    size = self.cell_size
+    for y in range(rect.top // size, (rect.bottom - 1) // size + 1):
+      for x in range(rect.left // size, (rect.right - 1) // size + 1):
+        yield x, y
+
+  def add(self, sprite: pygame.sprite.Sprite):
+    """The sprite's rect must not change while it is in the hash"""
+    self.order[sprite] = len(self.order)
+    for key in self._iter_keys(sprite.rect):
+      self.cells.setdefault(key, []).append(sprite)
+
+  def remove(self, sprite: pygame.sprite.Sprite):
+    if self.order.pop(sprite, None) is None:
+      return
+    for key in self._iter_keys(sprite.rect):
+      self.cells[key].remove(sprite)
+
+  def query(self, rect: pygame.Rect) -> list[pygame.sprite.Sprite]:
+    """Sprites colliding with the rect, same result as spritecollide against a Group"""
+    found = set()
+    for key in self._iter_keys(rect):
+      for sprite in self.cells.get(key, ()):
+        if sprite not in found and rect.colliderect(sprite.rect):
+          found.add(sprite)
+    
+    if len(found) <= 1:
+      return list(found)
+    return sorted(found, key = self.order.__getitem__)
+
+  def collides(self, rect: pygame.Rect) -> bool:
+    for key in self._iter_keys(rect):
+      for sprite in self.cells.get(key, ()):
+        if rect.colliderect(sprite.rect):
+          return True
+    return False
+
+  def clear(self):
+    self.cells.clear()
+    self.order.clear()
+
 class MapMetadata():
   def __init__(self):
-    self.collisions: list[int] = []
+    self.collisions: set[int] = set()
     self.exits: dict[tuple[int], MapExit] = {}
     self.npc_names: list[str] = []
+    self.object_data: list[dict] = []
     self.music: str = ""
     self.walk_sound: str = ""
     self.entry_x: int = 16
@@ -160,6 +668,7 @@ class MapMetadata():
     self.collisions.clear()
     self.exits.clear()
     self.npc_names.clear()
+    self.object_data.clear()
     self.music = ""
     self.walk_sound = ""
     self.entry_x = 16
@@ -175,7 +684,8 @@ class MapObject(pygame.sprite.Sprite):
     collision: bool,
     tile_width: int,
     tile_height: int,
-    exit: "MapExit" = None
+    exit: "MapExit" = None,
+    owner: list[tuple] | None = None
   ):
     pygame.sprite.Sprite.__init__(self)
     
@@ -186,7 +696,7 @@ class MapObject(pygame.sprite.Sprite):
     
     # Load the image
     try:
-      self.image: pygame.Surface = pygame.image.load(f"./assets/map/tileset/{image_name}.png")
+      self.image: pygame.Surface = TextureManager.load(f"./assets/map/tileset/{image_name}.png", owner = owner)
     except FileNotFoundError:
       # Create a placeholder if image not found
       self.image = pygame.Surface((tile_width, tile_height))
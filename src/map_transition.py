@@ -0,0 +1,51 @@
+from typing import TYPE_CHECKING
+
+import pygame
+
+if TYPE_CHECKING:
+  from src.map_loader import MapExit
+
+
+class MapTransition():
+  """
+  Fade to black while the destination map loads on the worker thread, switch once
+  it is ready and the screen is dark, then fade back in. The screen stays black
+  for as long as loading takes longer than the fade.
+  """
+
+  def __init__(self, map_exit: "MapExit", fade_time: float = 0.25):
+    self.exit: MapExit = map_exit
+    # Seconds for each of fading out and fading in
+    self.fade_time: float = fade_time
+    self.elapsed: float = 0.0
+    # Fading in on the new map
+    self.switched: bool = False
+
+  def update(self, delta_time: float):
+    self.elapsed += delta_time
+
+  def can_switch(self) -> bool:
+    """Faded out, the map can change without being seen"""
+    return not self.switched and self.elapsed >= self.fade_time
+
+  def switch(self):
+    self.switched = True
+    self.elapsed = 0.0
+
+  def is_done(self) -> bool:
+    return self.switched and self.elapsed >= self.fade_time
+
+  def get_darkness(self) -> int:
+    """0 (no fade) - 255 (black)"""
+    if self.fade_time <= 0:
+      return 0 if self.switched else 255
+
+    progress = min(self.elapsed / self.fade_time, 1.0)
+    if self.switched:
+      progress = 1.0 - progress
+    return round(progress * 255)
+
+  def render(self, surface: pygame.Surface):
+    # Multiplying darkens in place, no overlay surface per fade level
+    level = 255 - self.get_darkness()
+    surface.fill((level, level, level), special_flags = pygame.BLEND_RGB_MULT)
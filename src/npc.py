@@ -2,6 +2,8 @@ import pygame
 import json
 from dataclasses import dataclass
 
+from src.texture_manager import TextureManager
+
 
 @dataclass
 class DialogueOption:
@@ -16,15 +18,25 @@ class Dialogue:
 
 
 class Npc(pygame.sprite.Sprite):
-  def __init__(self, name: str, tile_width: int, tile_height: int):
+  def __init__(
+    self,
+    name: str,
+    tile_width: int,
+    tile_height: int,
+    json_data: dict | None = None,
+    owner: list[tuple] | None = None
+  ):
     pygame.sprite.Sprite.__init__(self)
 
     self.name: str = name
     self.tile_width: int = tile_width
     self.tile_height: int = tile_height
 
-    with open(f"./assets/entity/npc/{name}/npc.meta.json", "r", encoding = "utf-8") as f:
-      json_data = json.load(f)
+    if json_data is None:
+      json_data = Npc.read_meta(name)
+
+    # Kept so battles can compile their data without reading the file again
+    self.meta_data: dict = json_data
 
     self.display_name: str = json_data.get("display_name", name)
 
@@ -35,8 +47,12 @@ class Npc(pygame.sprite.Sprite):
     self.y: float = self.spawn_y * tile_height + tile_height / 2
 
     self.scale: float = json_data.get("scale", 3)
-    original_image = pygame.image.load(json_data["source_img"])
-    self.image: pygame.Surface = pygame.transform.scale(original_image, (int(tile_width * self.scale), int(tile_height * self.scale)))
+    self.source_img: str = json_data["source_img"]
+    self.image: pygame.Surface = TextureManager.load_scaled(
+      self.source_img,
+      (int(tile_width * self.scale), int(tile_height * self.scale)),
+      owner = owner
+    )
     self.rect: pygame.Rect = self.image.get_rect()
     self.rect.center = (self.x, self.y)
 
@@ -45,6 +61,12 @@ class Npc(pygame.sprite.Sprite):
 
     self.current_dialogue_id: str | None = None
 
+  @staticmethod
+  def read_meta(name: str) -> dict:
+    """npc.meta.json, safe to read on a worker thread"""
+    with open(f"./assets/entity/npc/{name}/npc.meta.json", "r", encoding = "utf-8") as f:
+      return json.load(f)
+
   def _load_dialogue(self, dialogue_data: dict):
     for node_id, node_data in dialogue_data.items():
       options = None
@@ -87,8 +109,14 @@ class Npc(pygame.sprite.Sprite):
   def end_dialogue(self):
     self.current_dialogue_id = None
 
-  def render(self, surface: pygame.Surface):
-    surface.blit(self.image, self.rect)
+  def move_to_world(self, origin: tuple[int, int]):
+    """Spawn positions are map tiles, shift them when the map is stitched into a world"""
+    self.x += origin[0]
+    self.y += origin[1]
+    self.rect.move_ip(origin)
+
+  def render(self, surface: pygame.Surface, offset: tuple[int, int] = (0, 0)):
+    surface.blit(self.image, (self.rect.x - offset[0], self.rect.y - offset[1]))
 
   def update(self, delta_time: float):
     pass
@@ -2,7 +2,8 @@ import pygame
 
 from src.input_manager import InputManager
 from src.audio_manager import AudioManager
-from src.map_loader import MapMetadata, MapTile, MapObject
+from src.texture_manager import TextureManager
+from src.map_loader import MapMetadata, CollisionGrid, SpatialHash
 
 
 class Player(pygame.sprite.Sprite):
@@ -13,26 +14,26 @@ class Player(pygame.sprite.Sprite):
     
     self.x: int = 0
     self.y: int = 0
+    # Position before the last update step, used to interpolate rendering
+    self.prev_x: int = 0
+    self.prev_y: int = 0
     
     self.in_exit: bool = False
     
     # Load player character sprites for 8 directions and scale them
     original_sprites = {
-      'south': pygame.image.load("./assets/icon/south.png"),
-      'south-east': pygame.image.load("./assets/icon/south-east.png"),
-      'east': pygame.image.load("./assets/icon/east.png"),
-      'north-east': pygame.image.load("./assets/icon/north-east.png"),
-      'north': pygame.image.load("./assets/icon/north.png"),
-      'north-west': pygame.image.load("./assets/icon/north-west.png"),
-      'west': pygame.image.load("./assets/icon/west.png"),
-      'south-west': pygame.image.load("./assets/icon/south-west.png")
+      direction: TextureManager.load(f"./assets/icon/{direction}.png")
+      for direction in [
+        'south', 'south-east', 'east', 'north-east',
+        'north', 'north-west', 'west', 'south-west'
+      ]
     }
     
     # Scale all sprites by 1.75x
-    self.sprites = {}
-    for direction, sprite in original_sprites.items():
-      scaled_size = (int(sprite.get_width() * 1.75), int(sprite.get_height() * 1.75))
-      self.sprites[direction] = pygame.transform.scale(sprite, scaled_size)
+    self.sprites = {
+      direction: TextureManager.load_scaled_by(f"./assets/icon/{direction}.png", 1.75)
+      for direction in original_sprites
+    }
     
     self.current_direction = 'south'
     self.image: pygame.Surface = self.sprites[self.current_direction]
@@ -70,23 +71,35 @@ class Player(pygame.sprite.Sprite):
     # Update sprite
     self.image = self.sprites[self.current_direction]
 
-  def render(self, surface: pygame.Surface):
+  def get_render_rect(self, alpha: float = 1.0) -> pygame.Rect:
     # Center the scaled image on the collision rect
     image_rect = self.image.get_rect()
-    image_rect.center = self.rect.center
+    if alpha >= 1.0:
+      image_rect.center = self.rect.center
+    else:
+      image_rect.center = (
+        self.prev_x + (self.x - self.prev_x) * alpha,
+        self.prev_y + (self.y - self.prev_y) * alpha
+      )
+    return image_rect
+
+  def render(self, surface: pygame.Surface, alpha: float = 1.0, offset: tuple[int, int] = (0, 0)):
     surface.blit(
       self.image,
-      image_rect
+      self.get_render_rect(alpha).move(-offset[0], -offset[1])
     )
   
   def handle_movement(
     self,
     delta_time: float,
     input_manager: InputManager,
-    tiles: pygame.sprite.Group[MapTile],
-    objects: pygame.sprite.Group[MapObject],
+    collision_grid: CollisionGrid,
+    solids: SpatialHash,
     metadata: MapMetadata
-  ) -> list[MapTile]:
+  ) -> list[tuple[int, int]]:
+    self.prev_x = self.x
+    self.prev_y = self.y
+    
     dx = 0
     dy = 0
     
@@ -102,22 +115,17 @@ class Player(pygame.sprite.Sprite):
     # Update direction based on movement
     self.update_direction(dx, dy)
     
-    hit_tiles_set: set[MapTile] = set()
+    hit_exits: set[tuple[int, int]] = set()
     
     if dx != 0:
       old_x = self.x
       self.x += dx
       self.rect.centerx = self.x
       
-      hit_tiles = pygame.sprite.spritecollide(self, tiles, False)
-      hit_tiles_set.update(hit_tiles)
-      blocked_tiles = [t for t in hit_tiles if t.gid in metadata.collisions]
-      
-      # Check collision with objects
-      hit_objects = pygame.sprite.spritecollide(self, objects, False)
-      blocked_objects = [o for o in hit_objects if o.collision]
+      hit_exits.update(collision_grid.get_exits(self.rect))
       
-      if len(blocked_tiles) > 0 or len(blocked_objects) > 0:
+      # Check collision with nearby blocking objects
+      if collision_grid.is_blocked(self.rect) or solids.collides(self.rect):
         self.x = old_x
         self.rect.centerx = self.x
     
@@ -126,29 +134,24 @@ class Player(pygame.sprite.Sprite):
       self.y += dy
       self.rect.centery = self.y
       
-      hit_tiles = pygame.sprite.spritecollide(self, tiles, False)
-      hit_tiles_set.update(hit_tiles)
-      blocked_tiles = [t for t in hit_tiles if t.gid in metadata.collisions]
-      
-      # Check collision with objects
-      hit_objects = pygame.sprite.spritecollide(self, objects, False)
-      blocked_objects = [o for o in hit_objects if o.collision]
+      hit_exits.update(collision_grid.get_exits(self.rect))
       
-      if len(blocked_tiles) > 0 or len(blocked_objects) > 0:
+      # Check collision with nearby blocking objects
+      if collision_grid.is_blocked(self.rect) or solids.collides(self.rect):
         self.y = old_y
         self.rect.centery = self.y
     
     self.rect.center = (self.x, self.y)
     
     if dx == 0 and dy == 0:
-      hit_tiles_set.update(pygame.sprite.spritecollide(self, tiles, False))
+      hit_exits.update(collision_grid.get_exits(self.rect))
     
     if dx == 0 and dy == 0:
       AudioManager.stop_sound()
     else:
       AudioManager.play_sound(metadata.walk_sound)
     
-    return list(hit_tiles_set)
+    return list(hit_exits)
 
   def update(self, delta_time: float):
     pass
@@ -156,3 +159,5 @@ class Player(pygame.sprite.Sprite):
   def set_position(self, x: int, y: int):
     self.x = x
     self.y = y
+    self.prev_x = x
+    self.prev_y = y
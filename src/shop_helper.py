@@ -5,6 +5,7 @@ from dataclasses import dataclass
 if TYPE_CHECKING:
   from src.game import Game
 from src.npc import Npc
+from src.inventory.item_registry import ItemRegistry
 
 
 @dataclass
@@ -21,8 +22,7 @@ class ShopHelper:
     self.game = game
     self.npc = npc
 
-    with open("./assets/items.json", "r") as f:
-      self.item_definitions = json.load(f)
+    self.item_definitions = ItemRegistry.get_definitions()
 
     self.shop_items: List[ShopItem] = []
     self._load_shop_data()
@@ -7,6 +7,8 @@ if TYPE_CHECKING:
 from src.battle_helper import BattleHelper, BattleEntity, BattleSkill
 from src.state.state import State
 from src.npc import Npc
+from src.texture_manager import TextureManager
+from src.surface_pool import SurfacePool
 
 
 class BattleState(State):
@@ -16,9 +18,11 @@ class BattleState(State):
     self.game = game
     self.npc = npc
     
-    self.battle_helper = BattleHelper(self.game, self.npc)
+    self.battle_helper = BattleHelper.for_npc(self.game, self.npc)
     
     self.skill_index: int = 0
+    # Index in battle_helper.enemies hit by single target skills
+    self.target_index: int = 0
     self.selected_skills: List[str] = []
     self.is_player_turn: bool = True
     self.battle_over: bool = False
@@ -31,33 +35,25 @@ class BattleState(State):
     self.bar_height: int = 20
     self.padding: int = 20
     
+    # Textures held while the battle is on the stack, given back in close()
+    self.textures: list[tuple] = []
+    
     # Load player sprite and scale it 3x (south-east facing enemy)
-    original_player_sprite = pygame.image.load("./assets/icon/south-east.png")
-    original_size = original_player_sprite.get_size()
-    self.player_sprite = pygame.transform.scale(
-      original_player_sprite, 
-      (original_size[0] * 3, original_size[1] * 3)
-    )
+    self.player_sprite = TextureManager.load_scaled_by("./assets/icon/south-east.png", 3, owner = self.textures)
     
     # Scale enemy sprite - max 8x from original image
-    # Get the original image before NPC scaling was applied
-    original_enemy_image = pygame.image.load(f"./assets/entity/npc/{self.npc.name}/npc.meta.json".replace("npc.meta.json", "").rstrip("/") + "/../../../" + "entity/boss/" + self.npc.name + "/rotations/south.png")
-    import json
-    with open(f"./assets/entity/npc/{self.npc.name}/npc.meta.json", "r", encoding = "utf-8") as f:
-      npc_data = json.load(f)
     # Load south-west facing image for battle
-    enemy_img_path = npc_data["source_img"].replace("south.png", "south-west.png")
-    original_enemy_image = pygame.image.load(enemy_img_path)
+    enemy_img_path = self.npc.source_img.replace("south.png", "south-west.png")
     
     # Calculate battle scale: use npc scale but cap at 8
     battle_scale = min(self.npc.scale, 8)
-    self.enemy_sprite = pygame.transform.scale(
-      original_enemy_image,
-      (int(original_enemy_image.get_width() * battle_scale), int(original_enemy_image.get_height() * battle_scale))
-    )
+    self.enemy_sprite = TextureManager.load_scaled_by(enemy_img_path, battle_scale, owner = self.textures)
 
     self.reward_given: bool = False
   
+  def close(self):
+    TextureManager.release(self.textures)
+  
   def _get_available_skills(self) -> List[BattleSkill]:
     return [
       skill for skill in self.battle_helper.player.skills.values()
@@ -128,6 +124,12 @@ class BattleState(State):
     if i_m.is_key_down_delayed(pygame.K_s, 0.15) or i_m.is_key_down_delayed(pygame.K_DOWN, 0.15):
       self.skill_index = (self.skill_index + 1) % len(skill_list)
     
+    if len(self.battle_helper.enemies) > 1:
+      if i_m.is_key_down_once(pygame.K_a) or i_m.is_key_down_once(pygame.K_LEFT):
+        self._cycle_target(-1)
+      if i_m.is_key_down_once(pygame.K_d) or i_m.is_key_down_once(pygame.K_RIGHT):
+        self._cycle_target(1)
+    
     if i_m.is_key_down_once(pygame.K_SPACE):
       current_skill = skill_list[self.skill_index]
       if current_skill.current_cooldown == 0:
@@ -137,7 +139,8 @@ class BattleState(State):
           self.selected_skills.append(current_skill.id)
     
     if i_m.is_key_down_once(pygame.K_RETURN):
-      result = self.battle_helper.execute_player_turn(self.selected_skills)
+      self._cycle_target(0)
+      result = self.battle_helper.execute_player_turn(self.selected_skills, self.target_index)
       self.selected_skills = []
       
       if result is not None:
@@ -147,6 +150,46 @@ class BattleState(State):
         self.is_player_turn = False
         self.turn_delay = 1.0  
 
+  def _cycle_target(self, step: int):
+    """Move the target by step, skipping defeated enemies (0 only moves off a defeated one)"""
+    enemies = self.battle_helper.enemies
+    index = self.target_index
+    
+    for _ in range(len(enemies)):
+      index = (index + step) % len(enemies)
+      if enemies[index].current_hp > 0:
+        self.target_index = index
+        return
+      step = step or 1
+
+  def _draw_roster(
+    self,
+    surface: pygame.Surface,
+    entities: List[BattleEntity],
+    x: int,
+    first_index: int,
+    is_enemy: bool
+  ):
+    """Minions and allies beside the main sprites, name plus HP bar"""
+    for i, entity in enumerate(entities):
+      y = 150 + i * 70
+      is_target = is_enemy and first_index + i == self.target_index
+      
+      if entity.current_hp <= 0:
+        color = (120, 120, 120)
+      elif is_target:
+        color = (255, 255, 100)
+      else:
+        color = (255, 100, 100) if is_enemy else (255, 255, 255)
+      
+      self.game.draw_text(
+        surface,
+        f"> {entity.name}" if is_target else entity.name,
+        color,
+        (x + self.bar_width // 2, y)
+      )
+      self._draw_hp_bar(surface, entity, x, y + 15)
+
   def _draw_hp_bar(
     self,
     surface: pygame.Surface,
@@ -187,14 +230,14 @@ class BattleState(State):
       )
     
     hp_text = f"{int(entity.current_hp)} / {entity.max_hp}"
-    text_surface = self.game.font.render(hp_text, True, (255, 255, 255))
+    text_surface = self.game.text_renderer.render(self.game.font, hp_text, (255, 255, 255))
     text_rect = text_surface.get_rect()
     text_rect.center = (bar_x + self.bar_width // 2, y + self.bar_height // 2)
     surface.blit(text_surface, text_rect)
     
     if entity.shield > 0:
       shield_text = f"+{entity.shield} Shield"
-      shield_surface = self.game.font.render(shield_text, True, (150, 200, 255))
+      shield_surface = self.game.text_renderer.render(self.game.font, shield_text, (150, 200, 255))
       shield_rect = shield_surface.get_rect()
       shield_rect.center = (bar_x + self.bar_width // 2, y + self.bar_height + 20)
       surface.blit(shield_surface, shield_rect)
@@ -214,7 +257,7 @@ class BattleState(State):
     effect_str = ", ".join(effect_texts)
     
     color = (255, 200, 100) if any(e.negative for e in entity.effects) else (100, 255, 200)
-    text_surface = self.game.font.render(effect_str, True, color)
+    text_surface = self.game.text_renderer.render(self.game.font, effect_str, color)
     text_rect = text_surface.get_rect()
     
     if align_right:
@@ -229,10 +272,7 @@ class BattleState(State):
     panel_height = 180
     panel_y = self.game.GAME_H - panel_height
     
-    panel_surface = pygame.Surface((self.game.GAME_W, panel_height))
-    panel_surface.fill((30, 30, 50))
-    panel_surface.set_alpha(240)
-    surface.blit(panel_surface, (0, panel_y))
+    SurfacePool.fill(surface, (0, panel_y, self.game.GAME_W, panel_height), (30, 30, 50), 240)
     
     pygame.draw.line(
       surface,
@@ -242,7 +282,12 @@ class BattleState(State):
       2
     )
     
-    turn_text = "你的回合 - 選擇技能 (空白鍵切換，Enter 確認)" if self.is_player_turn else "敵人回合..."
+    if not self.is_player_turn:
+      turn_text = "敵人回合..."
+    elif len(self.battle_helper.enemies) > 1:
+      turn_text = "你的回合 - 選擇技能 (空白鍵切換，A/D 選擇目標，Enter 確認)"
+    else:
+      turn_text = "你的回合 - 選擇技能 (空白鍵切換，Enter 確認)"
     self.game.draw_text(
       surface,
       turn_text,
@@ -286,7 +331,7 @@ class BattleState(State):
         prefix = "  " + prefix
       
       skill_text = f"{prefix}{skill.name}"
-      text_surface = self.game.font.render(skill_text, True, color)
+      text_surface = self.game.text_renderer.render(self.game.font, skill_text, color)
       surface.blit(text_surface, (x, y))
 
   def render(self, surface: pygame.Surface):
@@ -323,10 +368,12 @@ class BattleState(State):
       100
     )
     
+    enemies = self.battle_helper.enemies
+    targeting = len(enemies) > 1 and self.target_index == 0
     self.game.draw_text(
       surface,
-      self.battle_helper.enemy.name,
-      (255, 100, 100),
+      f"> {self.battle_helper.enemy.name}" if targeting else self.battle_helper.enemy.name,
+      (255, 255, 100) if targeting else (255, 100, 100),
       (enemy_x, 30)
     )
     self._draw_hp_bar(
@@ -342,6 +389,11 @@ class BattleState(State):
       100
     )
     
+    if len(enemies) > 1:
+      self._draw_roster(surface, enemies[1:], self.game.GAME_W - self.bar_width - 20, 1, True)
+    if len(self.battle_helper.allies) > 1:
+      self._draw_roster(surface, self.battle_helper.allies[1:], 20, 1, False)
+    
     if self.battle_helper.player.frozen:
       self.game.draw_text(
         surface,
@@ -361,10 +413,7 @@ class BattleState(State):
       self._draw_skill_panel(surface)
     
     if self.battle_over:
-      overlay = pygame.Surface((self.game.GAME_W, self.game.GAME_H))
-      overlay.fill((0, 0, 0))
-      overlay.set_alpha(180)
-      surface.blit(overlay, (0, 0))
+      SurfacePool.fill(surface, surface.get_rect(), (0, 0, 0), 180)
       
       if self.player_won:
         result_text = "您贏了！"
@@ -482,8 +531,10 @@ class BattleState(State):
         
         # Reset player position to village entry point
         self.game.player.set_position(
-          state.map_loader.metadata.entry_x * state.map_loader.map.tilewidth + state.map_loader.map.tilewidth // 2,
-          state.map_loader.metadata.entry_y * state.map_loader.map.tileheight + state.map_loader.map.tileheight // 2
+          *state.map_loader.get_tile_center(
+            state.map_loader.metadata.entry_x,
+            state.map_loader.metadata.entry_y
+          )
         )
         
         # Player respawns with full health (handled in next battle)
@@ -496,63 +547,8 @@ class BattleState(State):
     for state in self.game.state_stack:
       if isinstance(state, GameWorldState):
         # Remove this NPC from the map's NPC group
-        for npc in state.map_loader.npcs:
-          if npc.name == self.npc.name:
-            state.map_loader.npcs.remove(npc)
-            break
+        state.map_loader.remove_npc(self.npc.name)
         
         # Reload objects to update show_when_boss_dead / hide_when_boss_dead
-        self._reload_objects(state.map_loader)
+        state.map_loader.reload_objects()
         break
-
-  def _reload_objects(self, map_loader):
-    """Reload objects to reflect boss death status"""
-    import json
-    from src.map_loader import MapObject, MapExit
-    
-    # Get current map name from path
-    # Find the map name by checking map file path
-    map_path = None
-    for layer in map_loader.map.visible_layers:
-      break  # Just need to confirm map is loaded
-    
-    # Get map name from the map loader's map filename
-    map_name = map_loader.map.filename.split("/")[-2]
-    
-    with open(f"./assets/map/{map_name}/map.meta.json", "r", encoding = "utf-8") as f:
-      json_data = json.load(f)
-    
-    # Get entity data for boss status check
-    entity_data = json_data.get("entity", {})
-    map_npc_names = entity_data.get("npc", [])
-    bosses_alive = any(npc not in self.game.defeated_npcs for npc in map_npc_names)
-    
-    # Clear existing objects and reload
-    map_loader.objects.empty()
-    
-    for obj_data in json_data.get("object", []):
-      show_when_boss_dead = obj_data.get("show_when_boss_dead", False)
-      hide_when_boss_dead = obj_data.get("hide_when_boss_dead", False)
-      
-      # Skip objects based on boss status
-      if show_when_boss_dead and bosses_alive:
-        continue
-      if hide_when_boss_dead and not bosses_alive:
-        continue
-      
-      # Get exit data if present
-      obj_exit = None
-      if "exit" in obj_data:
-        exit_data = obj_data["exit"]
-        obj_exit = MapExit(exit_data["dist"], exit_data["dist_x"], exit_data["dist_y"])
-      
-      map_obj = MapObject(
-        obj_data["img"],
-        obj_data["x"],
-        obj_data["y"],
-        obj_data.get("collision", True),
-        map_loader.map.tilewidth,
-        map_loader.map.tileheight,
-        obj_exit
-      )
-      map_loader.objects.add(map_obj)
@@ -8,6 +8,7 @@ from src.npc import Npc
 from src.state.state import State
 from src.state.battle_state import BattleState
 from src.state.shop_state import ShopState
+from src.surface_pool import SurfacePool
 
 
 class DialogueState(State):
@@ -77,12 +78,7 @@ class DialogueState(State):
         self.exit_state()
 
   def render(self, surface: pygame.Surface):
-    self.prev_state.render(surface)
-
-    overlay = pygame.Surface((self.game.GAME_W, self.game.GAME_H))
-    overlay.fill((0, 0, 0))
-    overlay.set_alpha(100)
-    surface.blit(overlay, (0, 0))
+    self.render_prev_state(surface, dim_alpha = 100)
 
     box_rect = pygame.Rect(
       self.box_margin,
@@ -91,12 +87,7 @@ class DialogueState(State):
       self.box_height,
     )
 
-    box_surface = pygame.Surface((box_rect.width, box_rect.height))
-    box_surface.fill((40, 40, 60))
-    box_surface.set_alpha(230)
-    surface.blit(box_surface, box_rect)
-
-    pygame.draw.rect(surface, (100, 100, 140), box_rect, 3, border_radius=8)
+    SurfacePool.draw_panel(surface, box_rect)
 
     if self.current_dialogue is None:
       return
@@ -109,7 +100,12 @@ class DialogueState(State):
     )
 
     # Calculate text height for dynamic option positioning
-    text_lines = str(self.current_dialogue.text).split('\n')
+    text_max_width = box_rect.width - self.padding * 2
+    text_lines = self.game.text_renderer.wrap(
+      self.game.font,
+      str(self.current_dialogue.text),
+      text_max_width
+    )
     line_height = self.game.font.get_height()
     text_height = len([line for line in text_lines if line.strip()]) * line_height
     
@@ -118,6 +114,7 @@ class DialogueState(State):
       self.current_dialogue.text,
       (255, 255, 255),
       (box_rect.centerx, box_rect.top + 60),
+      text_max_width
     )
 
     # Position options with extra padding based on text height
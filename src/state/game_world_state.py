@@ -7,34 +7,63 @@ if TYPE_CHECKING:
 from src.state.state import State
 from src.state.dialogue_state import DialogueState
 from src.state.inventory_state import InventoryState
-from src.map_loader import MapLoader
+from src.map_loader import MapExit, MapLoader
+from src.map_transition import MapTransition
+from src.world_stream import StreamingMapLoader
 from src.state.pause_menu_state import PauseMenuState
 from src.npc import Npc
+from src.texture_manager import TextureManager
+from src.dirty_renderer import DirtyRenderer
+from src.camera import Camera
 
 
 class GameWorldState(State):
   def __init__(self, game: "Game"):
     State.__init__(self, game)
     
-    self.map_loader: MapLoader = MapLoader("awakening-room", self.game)
+    loader_class = StreamingMapLoader if self.game.STREAM_WORLD else MapLoader
+    self.map_loader: MapLoader = loader_class("awakening-room", self.game)
+    self.dirty_renderer: DirtyRenderer = DirtyRenderer()
+    self.camera: Camera = Camera(
+      self.game.GAME_W,
+      self.game.GAME_H,
+      deadzone = self.game.CAMERA_DEADZONE,
+      clamp = self.game.CAMERA_CLAMP
+    )
+    # Map (or stitched world) the camera was last placed in, it jumps instead of scrolling to a new one
+    self.camera_space: object | None = None
+    # Fade while the next map loads, None when not changing maps
+    self.transition: MapTransition | None = None
     
     # Load coin icon
-    self.coin_icon = pygame.image.load("./assets/icon/coin.png").convert_alpha()
-    self.coin_icon = pygame.transform.scale(self.coin_icon, (20, 20))  # Scale to appropriate size
+    self.coin_icon = TextureManager.load_scaled("./assets/icon/coin.png", (20, 20))  # Scale to appropriate size
     
     # Set player position to entry point
     self.game.player.set_position(
-      self.map_loader.metadata.entry_x * self.map_loader.map.tilewidth + self.map_loader.map.tilewidth // 2,
-      self.map_loader.metadata.entry_y * self.map_loader.map.tileheight + self.map_loader.map.tileheight // 2
+      *self.map_loader.get_tile_center(
+        self.map_loader.metadata.entry_x,
+        self.map_loader.metadata.entry_y
+      )
     )
+    self.update_camera()
 
   def update(self, delta_time: float):
     i_m = self.game.input_manager
     
     self.game.player.update(delta_time)
-    self.check_exit(delta_time)
     
-    self.check_npc_interaction()
+    if self.transition is not None:
+      self.update_transition(delta_time)
+    
+    # The player stays put until the new map has faded in, arriving on an exit must not leave again
+    if self.transition is None:
+      self.check_exit(delta_time)
+    
+    self.map_loader.update(self.game.player.rect, self.camera.get_view(self.camera.get_offset()))
+    self.update_camera()
+    
+    if self.transition is None:
+      self.check_npc_interaction()
 
     if i_m.is_key_down_once(pygame.K_ESCAPE):
       new_state = PauseMenuState(self.game)
@@ -44,27 +73,115 @@ class GameWorldState(State):
       new_state = InventoryState(self.game)
       new_state.enter_state()
 
+  def close(self):
+    # The title screen creates a new world state for the next game
+    self.map_loader.close()
+
+  def start_transition(self, map_exit: MapExit):
+    self.map_loader.request_map(map_exit.dist)
+    self.transition = MapTransition(map_exit, self.game.MAP_FADE_TIME)
+    self.game.player.in_exit = True
+
+  def update_transition(self, delta_time: float):
+    transition = self.transition
+    transition.update(delta_time)
+    
+    if transition.can_switch() and self.map_loader.is_ready(transition.exit.dist):
+      self.map_loader.change_map(transition.exit.dist)
+      self.game.player.set_position(
+        *self.map_loader.get_tile_center(transition.exit.dist_x, transition.exit.dist_y)
+      )
+      transition.switch()
+      self.game.input_manager.pause(0.05)
+    elif transition.is_done():
+      self.transition = None
+
+  def update_camera(self):
+    player = self.game.player
+    
+    if self.camera_space is not self.map_loader.space:
+      self.camera_space = self.map_loader.space
+      self.camera.set_world_size(*self.map_loader.pixel_size)
+      self.camera.center_on(player.x, player.y)
+    else:
+      self.camera.follow(player.x, player.y)
+
   def render(self, surface: pygame.Surface):
+    is_top = self.game.state_stack[-1] is self
+    # Only interpolate while the world is actually updating
+    alpha = self.game.frame_pacer.alpha if is_top else 1.0
+    coin_count = self.game.inventory.count_item("coin")
+    offset = self.camera.get_offset(alpha)
+    
+    if self.transition is not None:
+      # Every pixel changes while fading
+      self.dirty_renderer.invalidate()
+      if self.transition.get_darkness() < 255:
+        self._render_world(surface, alpha, coin_count, offset)
+      self.transition.render(surface)
+      return
+    
+    if not (self.game.DIRTY_RECTS and is_top):
+      self._render_world(surface, alpha, coin_count, offset)
+      return
+    
+    if self.game.last_rendered_state is not self:
+      # Another state drew on the canvas last frame
+      self.dirty_renderer.invalidate()
+    
+    # Scrolling or a re-baked map changes every pixel, no point collecting items to compare
+    scene = (self.map_loader.get_scene_key(), offset)
+    if scene != self.dirty_renderer.scene:
+      self.dirty_renderer.skip(scene)
+      self._render_world(surface, alpha, coin_count, offset)
+      return
+    
+    player = self.game.player
+    items = {
+      npc: (npc.rect.move(-offset[0], -offset[1]), npc.image)
+      for npc in self.map_loader.npc_hash.query(self.camera.get_view(offset))
+    }
+    items[player] = (player.get_render_rect(alpha).move(-offset[0], -offset[1]), player.image)
+    items["coins"] = (self._get_coin_display_rect(coin_count), coin_count)
+    
+    self.game.dirty_rects = self.dirty_renderer.render(
+      surface,
+      scene,
+      items,
+      lambda target: self._render_world(target, alpha, coin_count, offset)
+    )
+  
+  def _render_world(self, surface: pygame.Surface, alpha: float, coin_count: int, offset: tuple[int, int]):
     surface.fill((255, 255, 255))
-    self.map_loader.render(surface)
+    self.map_loader.render(surface, offset)
     
-    for npc in self.map_loader.npcs:
-      npc.render(surface)
+    # Only what is in view, large maps cost the same as small ones
+    for npc in self.map_loader.npc_hash.query(self.camera.get_view(offset)):
+      npc.render(surface, offset)
     
-    self.game.player.render(surface)
+    self.game.player.render(surface, alpha, offset)
     
     # Draw coin display in top-right corner
-    self._draw_coin_display(surface)
+    self._draw_coin_display(surface, coin_count)
   
-  def _draw_coin_display(self, surface: pygame.Surface):
-    """Draw coin count in top-right corner"""
-    coin_count = self.game.inventory.count_item("coin")
-    
-    # Background box
+  def _get_coin_box(self) -> pygame.Rect:
     box_width = 120
     box_height = 35
-    box_x = self.game.GAME_W - box_width - 10
-    box_y = 10
+    return pygame.Rect(self.game.GAME_W - box_width - 10, 10, box_width, box_height)
+  
+  def _get_coin_display_rect(self, coin_count: int) -> pygame.Rect:
+    """Area the coin display draws on, the text can stick out of the box for large counts"""
+    box = self._get_coin_box()
+    text_surface = self.game.text_renderer.render(self.game.font, str(coin_count), (255, 215, 0))
+    text_rect = text_surface.get_rect(
+      center = (box.right - text_surface.get_width() // 2 - 10, box.centery)
+    )
+    return box.union(text_rect.inflate(4, 4))
+  
+  def _draw_coin_display(self, surface: pygame.Surface, coin_count: int):
+    """Draw coin count in top-right corner"""
+    # Background box
+    box_x, box_y, box_width, box_height = self._get_coin_box()
     
     pygame.draw.rect(
       surface,
@@ -89,7 +206,7 @@ class GameWorldState(State):
     text_y = box_y + box_height // 2
     # Calculate text width to properly right-align it
     coin_text = str(coin_count)
-    text_surface = self.game.font.render(coin_text, True, (255, 215, 0))
+    text_surface = self.game.text_renderer.render(self.game.font, coin_text, (255, 215, 0))
     text_width = text_surface.get_width()
     # Position text so it's right-aligned with some padding from the right edge
     text_x = box_x + box_width - text_width // 2 - 10
@@ -106,11 +223,7 @@ class GameWorldState(State):
     if not i_m.is_key_down_once(pygame.K_e):
       return
     
-    hit_npcs: list[Npc] = pygame.sprite.spritecollide(
-      self.game.player,
-      self.map_loader.npcs,
-      False
-    )
+    hit_npcs: list[Npc] = self.map_loader.npc_hash.query(self.game.player.rect)
     
     if len(hit_npcs) > 0:
       npc = hit_npcs[0]
@@ -120,36 +233,22 @@ class GameWorldState(State):
   def check_exit(self, delta_time: float):
     i_m = self.game.input_manager
     
-    hit_tiles = self.game.player.handle_movement(
+    hit_exits = self.game.player.handle_movement(
       delta_time,
       i_m,
-      self.map_loader.tiles,
-      self.map_loader.objects,
+      self.map_loader.collision_grid,
+      self.map_loader.solid_hash,
       self.map_loader.metadata
     )
     
-    hit_exit_tiles = list(
-      filter(
-        lambda t: self.map_loader.metadata.exits.get((t.x, t.y)) is not None,
-        hit_tiles
-      )
-    )
-    
-    if len(hit_exit_tiles) == 0:
+    if len(hit_exits) == 0:
       self.game.player.in_exit = False
       
       # Check for object exits
       if not self.game.player.in_exit:
-        for obj in self.map_loader.objects:
-          if obj.exit and pygame.sprite.collide_rect(self.game.player, obj):
-            self.map_loader.change_map(obj.exit.dist)
-            self.game.player.set_position(
-              obj.exit.dist_x * self.map_loader.map.tilewidth + self.map_loader.map.tilewidth / 2,
-              obj.exit.dist_y * self.map_loader.map.tileheight + self.map_loader.map.tileheight / 2
-            )
-            self.game.player.in_exit = True
-            self.game.input_manager.pause(0.05)
-            return
+        for obj in self.map_loader.exit_hash.query(self.game.player.rect):
+          self.start_transition(obj.exit)
+          return
     elif not self.game.player.in_exit:
       # Check if exit requires boss to be defeated
       if self.map_loader.metadata.boss_died_exit:
@@ -159,15 +258,6 @@ class GameWorldState(State):
           # Boss still alive, can't exit
           return
       
-      exit_tile = hit_exit_tiles[0]
-      hit_exit = self.map_loader.metadata.exits.get(
-        (exit_tile.x, exit_tile.y)
-      )
+      hit_exit = self.map_loader.metadata.exits.get(hit_exits[0])
       
-      self.map_loader.change_map(hit_exit.dist)
-      self.game.player.set_position(
-        hit_exit.dist_x * self.map_loader.map.tilewidth + self.map_loader.map.tilewidth / 2,
-        hit_exit.dist_y * self.map_loader.map.tileheight + self.map_loader.map.tileheight / 2
-      )
-      self.game.player.in_exit = True
-      self.game.input_manager.pause(0.05)
+      self.start_transition(hit_exit)
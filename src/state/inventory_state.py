@@ -29,11 +29,7 @@ class InventoryState(State):
       return
 
     # 獲取滑鼠位置（轉換到遊戲畫布坐標）
-    mouse_x, mouse_y = pygame.mouse.get_pos()
-    scale_x = self.game.GAME_W / self.game.SCREEN_WIDTH
-    scale_y = self.game.GAME_H / self.game.SCREEN_HEIGHT
-    game_mouse_x = int(mouse_x * scale_x)
-    game_mouse_y = int(mouse_y * scale_y)
+    game_mouse_x, game_mouse_y = self.game.to_canvas_pos(pygame.mouse.get_pos())
 
     # 更新滑鼠懸停狀態
     self.ui.update_hover(game_mouse_x, game_mouse_y)
@@ -57,9 +53,8 @@ class InventoryState(State):
 
   def render(self, surface: pygame.Surface):
     """渲染背包界面"""
-    # 先渲染下層狀態（遊戲畫面）
-    if self.prev_state:
-      self.prev_state.render(surface)
+    # 下層狀態（遊戲畫面）加上半透明背景，只在內容改變時重新渲染
+    self.render_prev_state(surface, dim_alpha = 150)
 
     # 在上面渲染背包 UI
     self.ui.render(surface)
@@ -106,6 +101,9 @@ class InventoryState(State):
         # 不同物品，交換
         self.swap_slots(clicked_slot, cursor)
 
+    self.sync_slot(slot_type, slot_index)
+    self.invalidate_prev_state()
+
   def handle_right_click(self, x: int, y: int):
     """處理右鍵點擊 - 拿起/放下一半物品"""
     result = self.ui.get_slot_at_position(x, y)
@@ -140,6 +138,19 @@ class InventoryState(State):
         # 不同物品，交換
         self.swap_slots(clicked_slot, cursor)
 
+    self.sync_slot(slot_type, slot_index)
+    self.invalidate_prev_state()
+
+  def sync_slot(self, slot_type: str, slot_index: int):
+    """同步道具欄物品索引（裝備欄不計入）"""
+    if slot_type == 'item':
+      self.game.inventory.sync_slot(slot_index)
+
+  def invalidate_prev_state(self):
+    """物品移動後金幣數量可能改變，下層畫面需要重新渲染"""
+    if self.prev_state:
+      self.prev_state.invalidate()
+
   def swap_slots(self, slot1, slot2):
     """交換兩個格子的內容"""
     temp_item = slot1.item
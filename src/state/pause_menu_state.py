@@ -10,6 +10,7 @@ from src.state.state import State
 class PauseMenuState(State):
   def __init__(self, game: "Game"):
     State.__init__(self, game)
+    self.low_power = True
     
     self.OPTIONS: list[str] = ["Resume", "Back to Main Menu", "Quit"]
     self.index: int = 0
@@ -39,12 +40,7 @@ class PauseMenuState(State):
         self.index += 1
 
   def render(self, surface: pygame.Surface):
-    self.prev_state.render(surface)
-    
-    game_over_screen_fade = pygame.Surface((self.game.GAME_W, self.game.GAME_H))
-    game_over_screen_fade.fill((0, 0, 0))
-    game_over_screen_fade.set_alpha(160)
-    surface.blit(game_over_screen_fade, (0, 0))
+    self.render_prev_state(surface, dim_alpha = 160)
     
     self.game.draw_text(
       surface,
@@ -10,6 +10,7 @@ from src.state.state import State
 class SettingsState(State):
   def __init__(self, game: "Game"):
     State.__init__(self, game)
+    self.low_power = True
 
   def update(self, delta_time: float):
     i_m = self.game.input_manager
@@ -7,6 +7,7 @@ if TYPE_CHECKING:
 from src.npc import Npc
 from src.state.state import State
 from src.shop_helper import ShopHelper
+from src.surface_pool import SurfacePool
 
 
 class ShopState(State):
@@ -56,14 +57,12 @@ class ShopState(State):
       )
       self.message = message
       self.message_timer = 2.0
+      if success:
+        # The coin display below changed
+        self.prev_state.invalidate()
 
   def render(self, surface: pygame.Surface):
-    self.prev_state.render(surface)
-
-    overlay = pygame.Surface((self.game.GAME_W, self.game.GAME_H))
-    overlay.fill((0, 0, 0))
-    overlay.set_alpha(150)
-    surface.blit(overlay, (0, 0))
+    self.render_prev_state(surface, dim_alpha = 150)
 
     shop_items = self.shop_helper.shop_items
 
@@ -78,12 +77,7 @@ class ShopState(State):
     panel_y = (self.game.GAME_H - panel_height) // 2
 
     panel_rect = pygame.Rect(panel_x, panel_y, panel_width, panel_height)
-    panel_surface = pygame.Surface((panel_width, panel_height))
-    panel_surface.fill((40, 40, 60))
-    panel_surface.set_alpha(230)
-    surface.blit(panel_surface, panel_rect)
-
-    pygame.draw.rect(surface, (100, 100, 140), panel_rect, 3, border_radius=8)
+    SurfacePool.draw_panel(surface, panel_rect)
 
     title_y = panel_y + self.panel_padding + 15
     self.game.draw_text(
@@ -123,11 +117,7 @@ class ShopState(State):
           highlight_rect = pygame.Rect(
             panel_x + 10, item_y - 5, panel_width - 20, self.item_height - 5
           )
-          highlight = pygame.Surface(
-            (highlight_rect.width, highlight_rect.height), pygame.SRCALPHA
-          )
-          highlight.fill((255, 255, 255, 30))
-          surface.blit(highlight, highlight_rect)
+          SurfacePool.fill(surface, highlight_rect, (255, 255, 255, 30), flags = pygame.SRCALPHA)
 
         if is_out_of_stock:
           name_color = (100, 100, 100)
@@ -149,12 +139,12 @@ class ShopState(State):
         prefix = "> " if is_selected else "  "
         name_x = panel_x + 40
         name_text = f"{prefix}{item.name}"
-        name_surface = self.game.font.render(name_text, True, name_color)
+        name_surface = self.game.text_renderer.render(self.game.font, name_text, name_color)
         surface.blit(name_surface, (name_x, item_y))
 
         price_text = self.shop_helper.get_price_text(item.price)
         price_x = panel_x + panel_width // 2
-        price_surface = self.game.font.render(price_text, True, price_color)
+        price_surface = self.game.text_renderer.render(self.game.font, price_text, price_color)
         surface.blit(price_surface, (price_x, item_y))
 
         if item.stock < 0:
@@ -164,7 +154,7 @@ class ShopState(State):
         else:
           stock_text = f"x{item.stock}"
         stock_x = panel_x + panel_width - 100
-        stock_surface = self.game.font.render(stock_text, True, stock_color)
+        stock_surface = self.game.text_renderer.render(self.game.font, stock_text, stock_color)
         surface.blit(stock_surface, (stock_x, item_y))
 
     message_y = panel_y + panel_height - 50
@@ -4,12 +4,21 @@ import pygame
 
 if TYPE_CHECKING:
   from src.game import Game
+from src.surface_pool import SurfacePool
 
 
 class State():
   def __init__(self, game: "Game"):
     self.game: "Game" = game
     self.prev_state: State | None = None
+    # Nothing animates while this state is on top, so the game loop can run at low FPS
+    self.low_power: bool = False
+
+    # Bumped by invalidate(), overlays redraw their snapshot of this state when it changes
+    self.render_version: int = 0
+    # prev_state as drawn by render_prev_state, with the key it was drawn for
+    self.snapshot: pygame.Surface | None = None
+    self.snapshot_key: tuple | None = None
 
   def update(self, delta_time: float):
     pass
@@ -17,6 +26,36 @@ class State():
   def render(self, surface: pygame.Surface):
     pass
 
+  def invalidate(self):
+    """Something this state draws changed while it is covered by an overlay"""
+    self.render_version += 1
+
+  def get_render_key(self) -> tuple:
+    prev_key = self.prev_state.get_render_key() if self.prev_state is not None else None
+    return (id(self), self.render_version, prev_key)
+
+  def render_prev_state(self, surface: pygame.Surface, dim_alpha: int = 0):
+    """
+    Draw prev_state under an overlay, dimmed with black at dim_alpha (0 - 255).
+    States below the top one don't update, so it is drawn once into a snapshot
+    that is blitted every frame until prev_state.invalidate() is called.
+    """
+    if self.prev_state is None:
+      return
+
+    key = (self.prev_state.get_render_key(), dim_alpha, surface.get_size())
+    if self.snapshot is not None and self.snapshot_key == key:
+      surface.blit(self.snapshot, (0, 0))
+      return
+
+    self.prev_state.render(surface)
+
+    if dim_alpha > 0:
+      SurfacePool.fill(surface, surface.get_rect(), (0, 0, 0), dim_alpha)
+
+    self.snapshot = surface.copy()
+    self.snapshot_key = key
+
   def enter_state(self):
     if len(self.game.state_stack) > 1:
       self.prev_state = self.game.state_stack[-1]
@@ -24,4 +63,9 @@ class State():
 
   def exit_state(self, pop_layer: int = 1):
     for _ in range(pop_layer):
-      self.game.state_stack.pop()
+      self.game.state_stack.pop().close()
+    self.snapshot = None
+
+  def close(self):
+    """Called when popped off the state stack, release what the state owns"""
+    pass
@@ -12,6 +12,7 @@ from src.state.state import State
 class TitleScreenState(State):
   def __init__(self, game: "Game"):
     State.__init__(self, game)
+    self.low_power = True
     
     self.OPTIONS: list[str] = ["Play", "Settings", "Quit"]
     self.index: int = 0
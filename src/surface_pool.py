@@ -0,0 +1,66 @@
+import pygame
+
+
+class SurfacePool():
+  """Filled UI surfaces (overlays, panels, highlights) shared between renderers instead of created every frame"""
+  surfaces: dict[tuple, pygame.Surface] = {}
+  # Panels sized by their content create a few keys, this only guards against unbounded growth
+  max_surfaces: int = 64
+
+  @staticmethod
+  def get(
+    size: tuple[int, int],
+    color: tuple[int, ...],
+    alpha: int | None = None,
+    flags: int = 0
+  ) -> pygame.Surface:
+    """A surface filled with color and set to alpha (0 - 255), shared so it must not be drawn on"""
+    key = (tuple(size), flags, tuple(color), alpha)
+    surface = SurfacePool.surfaces.get(key)
+    if surface is not None:
+      return surface
+
+    surface = pygame.Surface(size, flags)
+    surface.fill(color)
+    if alpha is not None:
+      surface.set_alpha(alpha)
+
+    if len(SurfacePool.surfaces) >= SurfacePool.max_surfaces:
+      # Oldest first, dicts keep insertion order
+      del SurfacePool.surfaces[next(iter(SurfacePool.surfaces))]
+    SurfacePool.surfaces[key] = surface
+
+    return surface
+
+  @staticmethod
+  def fill(
+    surface: pygame.Surface,
+    rect: pygame.Rect | tuple,
+    color: tuple[int, ...],
+    alpha: int | None = None,
+    flags: int = 0
+  ):
+    """Blend a translucent rectangle onto surface"""
+    rect = pygame.Rect(rect)
+    surface.blit(SurfacePool.get(rect.size, color, alpha, flags), rect)
+
+  @staticmethod
+  def draw_panel(
+    surface: pygame.Surface,
+    rect: pygame.Rect | tuple,
+    color: tuple[int, int, int] = (40, 40, 60),
+    alpha: int = 230,
+    border_color: tuple[int, int, int] | None = (100, 100, 140),
+    border_width: int = 3,
+    border_radius: int = 8
+  ):
+    """Translucent box with a rounded border, as used by dialogue and shop panels"""
+    rect = pygame.Rect(rect)
+    SurfacePool.fill(surface, rect, color, alpha)
+
+    if border_color is not None:
+      pygame.draw.rect(surface, border_color, rect, border_width, border_radius = border_radius)
+
+  @staticmethod
+  def clear():
+    SurfacePool.surfaces.clear()
@@ -0,0 +1,200 @@
+from collections import OrderedDict
+
+import pygame
+
+
+class TextRenderer():
+  """Rendered text cache shared by every state renderer"""
+
+  def __init__(self, max_lines: int = 512, max_blocks: int = 128, max_wraps: int = 256):
+    self.max_lines: int = max_lines
+    self.max_blocks: int = max_blocks
+    self.max_wraps: int = max_wraps
+
+    # (font, text, color, antialias) -> surface
+    self.lines: OrderedDict[tuple, pygame.Surface] = OrderedDict()
+    # (font, text, color, antialias, max_width) -> (surface with every line centered, line count)
+    self.blocks: OrderedDict[tuple, tuple[pygame.Surface, int]] = OrderedDict()
+    # (font, text, max_width) -> wrapped lines
+    self.wraps: OrderedDict[tuple, tuple[str, ...]] = OrderedDict()
+
+    self.hits: int = 0
+    self.misses: int = 0
+
+  @staticmethod
+  def _color_key(color: pygame.typing.ColorLike) -> tuple:
+    if isinstance(color, tuple):
+      return color
+    return tuple(pygame.Color(color))
+
+  @staticmethod
+  def _lookup(cache: OrderedDict, key: tuple):
+    value = cache.get(key)
+    if value is not None:
+      cache.move_to_end(key)
+    return value
+
+  @staticmethod
+  def _store(cache: OrderedDict, key: tuple, value, max_size: int):
+    cache[key] = value
+    while len(cache) > max_size:
+      cache.popitem(last = False)
+
+  def render(
+    self,
+    font: pygame.font.Font,
+    text: str,
+    color: pygame.typing.ColorLike,
+    antialias: bool = True
+  ) -> pygame.Surface:
+    """Render a single line, the returned surface is shared and must not be modified"""
+    key = (font, text, self._color_key(color), antialias)
+    surface = self._lookup(self.lines, key)
+
+    if surface is not None:
+      self.hits += 1
+      return surface
+
+    self.misses += 1
+    surface = font.render(text, antialias, color)
+    self._store(self.lines, key, surface, self.max_lines)
+    return surface
+
+  def render_block(
+    self,
+    font: pygame.font.Font,
+    text: str,
+    color: pygame.typing.ColorLike,
+    max_width: int | None = None,
+    antialias: bool = True
+  ) -> tuple[pygame.Surface, int]:
+    """
+    Render multi-line text into one surface, returns it with its number of lines.
+    Every line is centered on x = block width // 2, pixel for pixel like lines
+    rendered one by one and centered on the same point.
+    """
+    key = (font, text, self._color_key(color), antialias, max_width)
+    block = self._lookup(self.blocks, key)
+
+    if block is not None:
+      self.hits += 1
+      return block
+
+    self.misses += 1
+    lines = self.wrap(font, text, max_width)
+    line_height = font.get_height()
+
+    line_surfaces = [
+      font.render(line, antialias, color) if line.strip() else None
+      for line in lines
+    ]
+    block_width = max(
+      (s.get_width() for s in line_surfaces if s is not None),
+      default = 0
+    )
+
+    # Glyphs can reach below the line height, keep the last line unclipped
+    block_height = max(
+      (i * line_height + s.get_height() for i, s in enumerate(line_surfaces) if s is not None),
+      default = 0
+    )
+
+    surface = pygame.Surface((block_width, max(block_height, len(lines) * line_height)), pygame.SRCALPHA)
+    for i, line_surface in enumerate(line_surfaces):
+      if line_surface is None:
+        continue
+      # MAX copies the glyph pixels onto the transparent block without darkening the edges
+      surface.blit(
+        line_surface,
+        (block_width // 2 - line_surface.get_width() // 2, i * line_height),
+        special_flags = pygame.BLEND_RGBA_MAX
+      )
+
+    block = (surface, len(lines))
+    self._store(self.blocks, key, block, self.max_blocks)
+    return block
+
+  def wrap(self, font: pygame.font.Font, text: str, max_width: int | None = None) -> tuple[str, ...]:
+    """Split text into lines, wrapping at spaces or between CJK characters"""
+    if max_width is None:
+      return tuple(text.split("\n"))
+
+    key = (font, text, max_width)
+    lines = self._lookup(self.wraps, key)
+
+    if lines is not None:
+      return lines
+
+    wrapped: list[str] = []
+    for paragraph in text.split("\n"):
+      wrapped.extend(TextRenderer._wrap_paragraph(font, paragraph, max_width))
+
+    lines = tuple(wrapped)
+    self._store(self.wraps, key, lines, self.max_wraps)
+    return lines
+
+  @staticmethod
+  def _is_wide(char: str) -> bool:
+    # CJK characters and full-width punctuation can break anywhere
+    return ord(char) >= 0x2E80
+
+  @staticmethod
+  def _wrap_paragraph(font: pygame.font.Font, paragraph: str, max_width: int) -> list[str]:
+    tokens: list[str] = []
+    word = ""
+    for char in paragraph:
+      if char.isspace() or TextRenderer._is_wide(char):
+        if word:
+          tokens.append(word)
+          word = ""
+        tokens.append(char)
+      else:
+        word += char
+    if word:
+      tokens.append(word)
+
+    lines: list[str] = []
+    line = ""
+    for token in tokens:
+      candidate = line + token
+      if font.size(candidate.rstrip())[0] <= max_width:
+        line = candidate
+        continue
+
+      if line.strip():
+        lines.append(line.rstrip())
+      line = token.lstrip()
+
+      # A single word wider than the line, break it by character
+      while len(line) > 1 and font.size(line)[0] > max_width:
+        cut = len(line) - 1
+        while cut > 1 and font.size(line[:cut])[0] > max_width:
+          cut -= 1
+        lines.append(line[:cut])
+        line = line[cut:]
+
+    if line.strip() or not lines:
+      lines.append(line.rstrip())
+
+    return lines
+
+  def get_stats(self) -> dict[str, float]:
+    total = self.hits + self.misses
+    return {
+      "hits": self.hits,
+      "misses": self.misses,
+      "hit_rate": self.hits / total if total > 0 else 0.0,
+      "lines": len(self.lines),
+      "blocks": len(self.blocks),
+      "wraps": len(self.wraps)
+    }
+
+  def reset_stats(self):
+    self.hits = 0
+    self.misses = 0
+
+  def clear(self):
+    self.lines.clear()
+    self.blocks.clear()
+    self.wraps.clear()
+    self.reset_stats()
@@ -0,0 +1,209 @@
+import threading
+
+import pygame
+
+
+class TextureManager():
+  """
+  Shared, display format images keyed by path (and size / flip for derived variants).
+  Textures loaded without an owner (player, UI) stay loaded. Textures loaded for an
+  owner, a list the caller keeps (e.g. a map's), are freed by purge_unused once every
+  owner holding them was given back with release. Images decoded ahead by a worker
+  work the same way, a prefetched map holds them until it is finished or dropped.
+  """
+  # Map prefetching loads images on a worker thread
+  lock: threading.Lock = threading.Lock()
+
+  textures: dict[tuple, pygame.Surface] = {}
+  # Files decoded by a worker thread, converted to the display format by the next load
+  decoded: dict[str, pygame.Surface] = {}
+  # Bytes per texture, decoded files under (path, None)
+  sizes: dict[tuple, int] = {}
+  total_size: int = 0
+  # Loaded without an owner, never purged
+  permanent: set[tuple] = set()
+  # Number of owners holding each texture
+  owner_counts: dict[tuple, int] = {}
+
+  @staticmethod
+  def _acquire(key: tuple, owner: list[tuple] | None):
+    with TextureManager.lock:
+      if owner is None:
+        TextureManager.permanent.add(key)
+        return
+      TextureManager._hold(key, owner)
+
+  @staticmethod
+  def _hold(key: tuple, owner: list[tuple]):
+    # Called with the lock held
+    owner.append(key)
+    TextureManager.owner_counts[key] = TextureManager.owner_counts.get(key, 0) + 1
+
+  @staticmethod
+  def _is_loaded(path: str) -> bool:
+    # Called with the lock held
+    return (path, True) in TextureManager.textures or (path, False) in TextureManager.textures
+
+  @staticmethod
+  def release(owner: list[tuple]):
+    """Give back every texture loaded for owner, they can be purged once no other owner holds them"""
+    with TextureManager.lock:
+      for key in owner:
+        count = TextureManager.owner_counts.get(key, 0) - 1
+        if count > 0:
+          TextureManager.owner_counts[key] = count
+        else:
+          TextureManager.owner_counts.pop(key, None)
+    owner.clear()
+
+  @staticmethod
+  def _store(key: tuple, surface: pygame.Surface) -> pygame.Surface:
+    with TextureManager.lock:
+      # Another thread may have loaded the same texture meanwhile, keep the first one
+      existing = TextureManager.textures.get(key)
+      if existing is not None:
+        return existing
+
+      size = surface.get_width() * surface.get_height() * surface.get_bytesize()
+      TextureManager.textures[key] = surface
+      TextureManager.sizes[key] = size
+      TextureManager.total_size += size
+
+    return surface
+
+  @staticmethod
+  def _convert(surface: pygame.Surface, alpha: bool) -> pygame.Surface:
+    if pygame.display.get_surface() is None:
+      # No display yet (e.g. headless tools), keep the file's pixel format
+      return surface
+    return surface.convert_alpha() if alpha else surface.convert()
+
+  @staticmethod
+  def load(path: str, alpha: bool = True, owner: list[tuple] | None = None) -> pygame.Surface:
+    """Load an image once, the returned surface is shared and must not be modified"""
+    key = (path, alpha)
+    surface = TextureManager.textures.get(key)
+    if surface is None:
+      with TextureManager.lock:
+        surface = TextureManager.decoded.pop(path, None)
+        if surface is not None:
+          TextureManager.total_size -= TextureManager.sizes.pop((path, None))
+      if surface is None:
+        surface = pygame.image.load(path)
+
+      surface = TextureManager._store(key, TextureManager._convert(surface, alpha))
+
+    TextureManager._acquire(key, owner)
+    return surface
+
+  @staticmethod
+  def decode(path: str, owner: list[tuple] | None = None):
+    """
+    Read an image ahead of load without converting it, safe to run on a worker thread.
+    Without an owner the decoded image can be purged before it is loaded.
+    """
+    key = (path, None)
+
+    with TextureManager.lock:
+      if TextureManager._is_loaded(path):
+        return
+      if path in TextureManager.decoded:
+        if owner is not None:
+          TextureManager._hold(key, owner)
+        return
+
+    surface = pygame.image.load(path)
+
+    with TextureManager.lock:
+      # The main thread may have loaded or another worker decoded it meanwhile
+      if TextureManager._is_loaded(path):
+        return
+      if path not in TextureManager.decoded:
+        size = surface.get_width() * surface.get_height() * surface.get_bytesize()
+        TextureManager.decoded[path] = surface
+        TextureManager.sizes[key] = size
+        TextureManager.total_size += size
+      if owner is not None:
+        TextureManager._hold(key, owner)
+
+  @staticmethod
+  def load_scaled(
+    path: str,
+    size: tuple[int, int],
+    flip_x: bool = False,
+    flip_y: bool = False,
+    alpha: bool = True,
+    owner: list[tuple] | None = None
+  ) -> pygame.Surface:
+    """Load a scaled and / or flipped variant of an image"""
+    key = (path, alpha, tuple(size), flip_x, flip_y)
+    surface = TextureManager.textures.get(key)
+    if surface is None:
+      # The original is held for the same owner, variants are usually made again from it
+      surface = TextureManager.load(path, alpha, owner)
+      if surface.get_size() != tuple(size):
+        surface = pygame.transform.scale(surface, size)
+      if flip_x or flip_y:
+        surface = pygame.transform.flip(surface, flip_x, flip_y)
+
+      surface = TextureManager._store(key, surface)
+
+    TextureManager._acquire(key, owner)
+    return surface
+
+  @staticmethod
+  def load_scaled_by(
+    path: str,
+    factor: float,
+    alpha: bool = True,
+    owner: list[tuple] | None = None
+  ) -> pygame.Surface:
+    original = TextureManager.load(path, alpha, owner)
+    return TextureManager.load_scaled(
+      path,
+      (int(original.get_width() * factor), int(original.get_height() * factor)),
+      alpha = alpha,
+      owner = owner
+    )
+
+  @staticmethod
+  def purge_unused() -> int:
+    """Drop textures that are neither permanent nor held by an owner, returns bytes freed"""
+    freed = 0
+
+    with TextureManager.lock:
+      for key in list(TextureManager.textures.keys()):
+        if key in TextureManager.permanent or key in TextureManager.owner_counts:
+          continue
+
+        del TextureManager.textures[key]
+        size = TextureManager.sizes.pop(key)
+        TextureManager.total_size -= size
+        freed += size
+
+      # Decoded for a prefetch that was dropped before the map was finished
+      for path in list(TextureManager.decoded.keys()):
+        key = (path, None)
+        if key in TextureManager.owner_counts:
+          continue
+
+        del TextureManager.decoded[path]
+        size = TextureManager.sizes.pop(key)
+        TextureManager.total_size -= size
+        freed += size
+
+    return freed
+
+  @staticmethod
+  def get_memory_usage() -> int:
+    return TextureManager.total_size
+
+  @staticmethod
+  def clear():
+    with TextureManager.lock:
+      TextureManager.textures.clear()
+      TextureManager.decoded.clear()
+      TextureManager.sizes.clear()
+      TextureManager.permanent.clear()
+      TextureManager.owner_counts.clear()
+      TextureManager.total_size = 0
@@ -0,0 +1,345 @@
+from collections import deque
+import glob
+import json
+import os
+import xml.etree.ElementTree as ElementTree
+
+import pygame
+
+from src.audio_manager import AudioManager
+from src.map_loader import MapData, MapLoader, SpatialHash
+from src.texture_manager import TextureManager
+
+
+class WorldRegion():
+  """
+  Maps joined through "stitch" in map.meta.json, placed in one coordinate space:
+
+    "stitch": {"east": "bridge", "south": {"map": "spider_cave", "offset": 4}}
+
+  A neighbour shares the whole edge in that direction, offset moves it along the
+  edge by tiles of the declaring map. Declaring a stitch on one of the two maps is
+  enough. A map without stitches is a region on its own.
+  """
+  DIRECTIONS: tuple[str, ...] = ("north", "south", "east", "west")
+
+  # Map name -> (pixel size, tile size), read without parsing the whole TMX
+  layouts: dict[str, tuple[tuple[int, int], tuple[int, int]]] = {}
+  # Map name -> [(neighbour, dx, dy)] with both directions of every stitch, built once
+  links: dict[str, list[tuple[str, int, int]]] | None = None
+
+  def __init__(self, start: str):
+    self.origins: dict[str, tuple[int, int]] = {start: (0, 0)}
+    self.sizes: dict[str, tuple[int, int]] = {}
+
+    links = WorldRegion.get_links()
+    queue = deque([start])
+    while queue:
+      name = queue.popleft()
+      self.sizes[name] = WorldRegion.get_layout(name)[0]
+      x, y = self.origins[name]
+
+      for neighbour, dx, dy in links.get(name, []):
+        origin = (x + dx, y + dy)
+        placed = self.origins.get(neighbour)
+        if placed is None:
+          self.origins[neighbour] = origin
+          queue.append(neighbour)
+        elif placed != origin:
+          raise ValueError(
+            f"Map \"{neighbour}\" is stitched to \"{name}\" at {origin}, but was already placed at {placed}"
+          )
+
+    # Top-left of the region at (0, 0), the camera is clamped to (0, 0) - size
+    left = min(x for x, _ in self.origins.values())
+    top = min(y for _, y in self.origins.values())
+    self.origins = {name: (x - left, y - top) for name, (x, y) in self.origins.items()}
+
+    self.width: int = max(self.origins[name][0] + self.sizes[name][0] for name in self.origins)
+    self.height: int = max(self.origins[name][1] + self.sizes[name][1] for name in self.origins)
+
+  @staticmethod
+  def get_layout(name: str) -> tuple[tuple[int, int], tuple[int, int]]:
+    layout = WorldRegion.layouts.get(name)
+    if layout is not None:
+      return layout
+
+    # Only the <map> element's attributes are needed
+    for _, element in ElementTree.iterparse(f"./assets/map/{name}/map.tmx", events = ("start",)):
+      attributes = element.attrib
+      break
+
+    tile_size = (int(attributes["tilewidth"]), int(attributes["tileheight"]))
+    size = (int(attributes["width"]) * tile_size[0], int(attributes["height"]) * tile_size[1])
+
+    layout = (size, tile_size)
+    WorldRegion.layouts[name] = layout
+    return layout
+
+  @staticmethod
+  def get_links() -> dict[str, list[tuple[str, int, int]]]:
+    if WorldRegion.links is not None:
+      return WorldRegion.links
+
+    links: dict[str, list[tuple[str, int, int]]] = {}
+    for path in sorted(glob.glob("./assets/map/*/map.meta.json")):
+      name = os.path.basename(os.path.dirname(path))
+      with open(path, "r", encoding = "utf-8") as f:
+        stitches = json.load(f).get("stitch", {})
+
+      for direction, neighbour in stitches.items():
+        if isinstance(neighbour, str):
+          neighbour = {"map": neighbour}
+        dx, dy = WorldRegion._get_offset(name, direction, neighbour["map"], neighbour.get("offset", 0))
+        links.setdefault(name, []).append((neighbour["map"], dx, dy))
+        links.setdefault(neighbour["map"], []).append((name, -dx, -dy))
+
+    WorldRegion.links = links
+    return links
+
+  @staticmethod
+  def _get_offset(name: str, direction: str, neighbour: str, offset: int) -> tuple[int, int]:
+    """Position of the neighbour's top-left relative to the map's"""
+    size, tile_size = WorldRegion.get_layout(name)
+    neighbour_size, _ = WorldRegion.get_layout(neighbour)
+
+    match direction:
+      case "east":
+        return (size[0], offset * tile_size[1])
+      case "west":
+        return (-neighbour_size[0], offset * tile_size[1])
+      case "south":
+        return (offset * tile_size[0], size[1])
+      case "north":
+        return (offset * tile_size[0], -neighbour_size[1])
+
+    raise ValueError(f"Unknown stitch direction \"{direction}\" in map \"{name}\", expected one of {WorldRegion.DIRECTIONS}")
+
+  def __contains__(self, name: str) -> bool:
+    return name in self.origins
+
+  def get_bounds(self, name: str) -> pygame.Rect:
+    return pygame.Rect(self.origins[name], self.sizes[name])
+
+  def get_names(self, rect: pygame.Rect) -> list[str]:
+    """Maps overlapping a rect in world pixels"""
+    return [name for name in self.origins if self.get_bounds(name).colliderect(rect)]
+
+  def covers(self, rect: pygame.Rect) -> bool:
+    """The maps cover all of the rect, no part is in a gap between them or outside the region"""
+    uncovered = [rect]
+    for name in self.get_names(rect):
+      bounds = self.get_bounds(name)
+      remaining = []
+      for part in uncovered:
+        clip = part.clip(bounds)
+        if clip.width == 0 or clip.height == 0:
+          remaining.append(part)
+          continue
+        # What is left of the part around the clipped area, up to four rects
+        if clip.top > part.top:
+          remaining.append(pygame.Rect(part.left, part.top, part.width, clip.top - part.top))
+        if clip.bottom < part.bottom:
+          remaining.append(pygame.Rect(part.left, clip.bottom, part.width, part.bottom - clip.bottom))
+        if clip.left > part.left:
+          remaining.append(pygame.Rect(part.left, clip.top, clip.left - part.left, clip.height))
+        if clip.right < part.right:
+          remaining.append(pygame.Rect(clip.right, clip.top, part.right - clip.right, clip.height))
+      uncovered = remaining
+      if not uncovered:
+        return True
+    return False
+
+  def find(self, x: float, y: float) -> str | None:
+    for name in self.origins:
+      if self.get_bounds(name).collidepoint(x, y):
+        return name
+    return None
+
+
+class StitchedHash():
+  """One of the spatial hashes (npc_hash, solid_hash) of every streamed in map"""
+
+  def __init__(self, loader: "StreamingMapLoader", attribute: str):
+    self.loader: StreamingMapLoader = loader
+    self.attribute: str = attribute
+
+  def query(self, rect: pygame.Rect) -> list[pygame.sprite.Sprite]:
+    found = []
+    for data in self.loader.loaded.values():
+      spatial_hash: SpatialHash = getattr(data, self.attribute)
+      found.extend(spatial_hash.query(rect))
+    return found
+
+  def collides(self, rect: pygame.Rect) -> bool:
+    for data in self.loader.loaded.values():
+      if getattr(data, self.attribute).collides(rect):
+        return True
+    return False
+
+
+class StreamingMapLoader(MapLoader):
+  """
+  MapLoader for a region of stitched maps. Maps near the camera are loaded on the
+  map cache's worker thread and dropped again once far away, the cache's memory
+  budget decides how many dropped maps stay around for coming back. Collision and
+  NPCs come from every loaded map, exits and metadata from the map the player is on.
+  """
+
+  def __init__(
+    self,
+    name: str,
+    game = None,
+    load_margin: int = 640,
+    unload_margin: int = 1280
+  ):
+    self.region: WorldRegion | None = None
+    # Maps streamed in, in the order they were loaded
+    self.loaded: dict[str, MapData] = {}
+    # Pixels around the view where maps are loaded, and where they are kept once loaded
+    self.load_margin: int = load_margin
+    self.unload_margin: int = unload_margin
+    # Bumped when maps are loaded or dropped
+    self.version: int = 0
+
+    self.stitched_npcs: StitchedHash = StitchedHash(self, "npc_hash")
+    self.stitched_solids: StitchedHash = StitchedHash(self, "solid_hash")
+
+    MapLoader.__init__(self, name, game)
+
+  @property
+  def collision_grid(self) -> "StreamingMapLoader":
+    """is_blocked and get_exits over the loaded maps, like a CollisionGrid"""
+    return self
+
+  @property
+  def npc_hash(self) -> StitchedHash:
+    return self.stitched_npcs
+
+  @property
+  def solid_hash(self) -> StitchedHash:
+    return self.stitched_solids
+
+  @property
+  def pixel_size(self) -> tuple[int, int]:
+    return (self.region.width, self.region.height)
+
+  @property
+  def space(self) -> object:
+    return self.region
+
+  def get_scene_key(self) -> tuple:
+    return (self.region, self.version, tuple(data.bake_count for data in self.loaded.values()))
+
+  def build(self, name: str, defeated_npcs: frozenset[str] | None) -> MapData:
+    # Maps of another region are placed like change_map will place them
+    region = self.region if self.region is not None and name in self.region else WorldRegion(name)
+    return MapData.parse(name, defeated_npcs, region.origins[name])
+
+  def _attach(self, data: MapData) -> MapData:
+    defeated_npcs = self.get_defeated_npcs()
+    if data.defeated_npcs != defeated_npcs:
+      data.refresh(defeated_npcs)
+
+    self.loaded[data.name] = data
+    self.cache.pinned.add(data.name)
+    self.version += 1
+    return data
+
+  def _set_current(self, name: str):
+    previous_music = self.metadata.music if self.current is not None else ""
+
+    data = self.loaded.get(name)
+    if data is None:
+      # Not streamed in yet, e.g. teleported here, wait for it
+      data = self._attach(self.cache.get(name, self.get_defeated_npcs()))
+    self.current = data
+
+    # Neighbours often share their music, don't restart it
+    if self.metadata.music and self.metadata.music != previous_music:
+      AudioManager.play_background_music(self.metadata.music)
+
+  def change_map(self, name: str):
+    if self.region is None or name not in self.region:
+      self.region = WorldRegion(name)
+      self.loaded.clear()
+      self.cache.pinned.clear()
+      self.current = None
+      self.version += 1
+
+    self._set_current(name)
+    self.cache.prefetch(self.current.get_neighbours(), self.get_defeated_npcs())
+
+  def update(self, focus: pygame.Rect, view: pygame.Rect):
+    # Converting a map takes a few milliseconds, one per frame while walking
+    self.cache.collect(limit = 1)
+    defeated_npcs = self.get_defeated_npcs()
+
+    missing = []
+    for name in self.region.get_names(view.inflate(self.load_margin * 2, self.load_margin * 2)):
+      if name in self.loaded:
+        continue
+      data = self.cache.entries.get(name)
+      if data is not None:
+        self._attach(data)
+      else:
+        missing.append(name)
+    self.cache.prefetch(missing, defeated_npcs)
+
+    name = self.region.find(*focus.center)
+    if name is not None and name != self.current.name:
+      self._set_current(name)
+
+    keep = set(self.region.get_names(view.inflate(self.unload_margin * 2, self.unload_margin * 2)))
+    keep.add(self.current.name)
+    dropped = [name for name in self.loaded if name not in keep]
+    for name in dropped:
+      # Stays in the cache until the memory budget needs the space
+      del self.loaded[name]
+      self.cache.pinned.discard(name)
+      self.version += 1
+
+    if dropped:
+      TextureManager.purge_unused()
+
+  def is_blocked(self, rect: pygame.Rect) -> bool:
+    # Gaps between the maps and the outside of the region are walls
+    if not self.region.covers(rect):
+      return True
+    for name in self.region.get_names(rect):
+      data = self.loaded.get(name)
+      if data is None:
+        # Not streamed in yet, don't walk onto tiles that aren't there
+        return True
+      if data.collision_grid.is_blocked(rect):
+        return True
+    return False
+
+  def get_exits(self, rect: pygame.Rect) -> list[tuple[int, int]]:
+    """Exits of the current map, in its tiles like metadata.exits"""
+    return self.current.collision_grid.get_exits(rect)
+
+  def close(self):
+    self.loaded.clear()
+    MapLoader.close(self)
+
+  def remove_npc(self, name: str):
+    for data in self.loaded.values():
+      for npc in data.npcs:
+        if npc.name == name:
+          data.npcs.remove(npc)
+          data.npc_hash.remove(npc)
+          return
+
+  def reload_objects(self):
+    defeated_npcs = self.get_defeated_npcs()
+    for data in self.loaded.values():
+      data.refresh(defeated_npcs)
+
+  def render(self, surface: pygame.Surface, offset: tuple[int, int] = (0, 0)):
+    view = pygame.Rect(offset, surface.get_size())
+    for data in self.loaded.values():
+      if not data.bounds.colliderect(view):
+        continue
+      for rect, chunk in data.get_chunks(view):
+        surface.blit(chunk, (rect.x - offset[0], rect.y - offset[1]))
@@ -0,0 +1,22 @@
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(scope = "session", autouse = True)
+def display():
+  # Asset paths are relative to the repository root, images need a display to convert
+  os.chdir(ROOT)
+  pygame.init()
+  pygame.mixer.init()
+  screen = pygame.display.set_mode((1280, 720))
+  yield screen
+  pygame.quit()
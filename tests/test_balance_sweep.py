@@ -0,0 +1,48 @@
+from concurrent.futures import ThreadPoolExecutor
+import csv
+
+import pytest
+
+from src import balance_sweep
+
+
+@pytest.fixture(autouse = True)
+def thread_workers(monkeypatch):
+  # Forking the test process is unsafe once other tests started the map prefetch thread
+  monkeypatch.setattr(balance_sweep, "ProcessPoolExecutor", ThreadPoolExecutor)
+
+
+def read_keys(path) -> list[str]:
+  with open(path, "r", encoding = "utf-8", newline = "") as f:
+    return [row["key"] for row in csv.DictReader(f)]
+
+
+def sweep(path, *args: str):
+  balance_sweep.main(["-o", str(path), "--boss", "thief", "--battles", "20", "--workers", "1", *args])
+
+
+def test_resume_skips_finished_tasks(tmp_path):
+  path = tmp_path / "balance.csv"
+  sweep(path, "--levels", "1-2")
+  first = read_keys(path)
+
+  # Like a run that was interrupted after the first two levels
+  sweep(path, "--levels", "1-3")
+  keys = read_keys(path)
+
+  assert len(first) == 2
+  assert keys[:2] == first
+  assert len(keys) == 3
+  assert len(set(keys)) == len(keys)
+
+
+def test_other_seed_or_turn_limit_is_not_resumed(tmp_path):
+  path = tmp_path / "balance.jsonl"
+  sweep(path, "--levels", "1")
+  sweep(path, "--levels", "1", "--seed", "1")
+  sweep(path, "--levels", "1", "--max-turns", "10")
+  sweep(path, "--levels", "1", "--max-turns", "10")
+
+  with open(path, "r", encoding = "utf-8") as f:
+    lines = f.readlines()
+  assert len(lines) == 3
@@ -0,0 +1,91 @@
+import time
+
+import pytest
+
+from src.battle_ai import LookaheadAI
+from src.battle_helper import BattleData, BattleHelper
+from src.battle_simulator import BattleSimulator
+
+
+@pytest.fixture
+def reckless():
+  """A boss with a side skill that weakens itself, greedy uses it every turn"""
+  skill = {"magical_damage": 0, "heal": 0, "shield": 0, "purify": False, "cooldown": 0, "description": ""}
+  skills = {
+    "attack": dict(skill, name = "attack", physical_damage = 8, effect = []),
+    "reckless": dict(
+      skill,
+      name = "reckless",
+      physical_damage = 2,
+      effect = [{"type": "weakness", "target": "self", "chance": 1}]
+    )
+  }
+  BattleData.get_npc_template("test-ai-greedy", {"hp": 150, "skills": skills})
+  BattleData.get_npc_template("test-ai-lookahead", {
+    "hp": 150,
+    "skills": skills,
+    "ai": {"profile": "lookahead", "max_playouts": 64}
+  })
+
+  yield
+
+  for name in ("test-ai-greedy", "test-ai-lookahead"):
+    BattleData.npcs.pop(name)
+
+
+def test_lookahead_beats_greedy(reckless):
+  simulator = BattleSimulator(max_turns = 60)
+  greedy = simulator.simulate("test-ai-greedy", 1, battles = 20, seed = 1)
+  lookahead = simulator.simulate("test-ai-lookahead", 1, battles = 20, seed = 1)
+
+  assert lookahead.damage_taken_per_turn > greedy.damage_taken_per_turn
+  assert lookahead.wins < greedy.wins
+
+
+def test_lookahead_battle_replays():
+  helper = BattleHelper(
+    [BattleData.get_player_template().create_entity(78)],
+    BattleData.create_enemies("demon_king"),
+    4
+  )
+  assert isinstance(helper.enemy.ai, LookaheadAI)
+
+  while helper.execute_player_turn(["slay"]) is None and helper.execute_enemy_turn() is None:
+    pass
+
+  assert "ai" in [event.type for event in helper.log.get_events()]
+  BattleHelper.replay(helper.log)
+
+
+def test_logs_from_before_an_ai_replay_greedily():
+  helper = BattleHelper(
+    [BattleData.get_player_template().create_entity(78)],
+    BattleData.create_enemies("spider"),
+    4
+  )
+  helper.enemy.ai = None
+
+  while helper.execute_player_turn(["slay"]) is None and helper.execute_enemy_turn() is None:
+    pass
+
+  assert "ai" not in [event.type for event in helper.log.get_events()]
+  BattleHelper.replay(helper.log)
+
+
+def test_lookahead_stays_within_budget():
+  # Playouts alone would take far longer than the budget
+  ai = LookaheadAI({"budget_ms": 10, "max_playouts": 100000, "depth": 3})
+
+  for seed in range(10):
+    helper = BattleHelper(
+      [BattleData.get_player_template().create_entity(78)],
+      BattleData.create_enemies("demon_king"),
+      seed
+    )
+    start = time.perf_counter()
+    skill_ids = ai.choose_skills(helper, helper.enemy)
+    elapsed = time.perf_counter() - start
+
+    assert set(skill_ids) <= set(helper.enemy.skills.keys())
+    # The last playout may run past the deadline, one playout is well under a millisecond
+    assert elapsed < ai.budget + 0.01
@@ -0,0 +1,47 @@
+from src.battle_helper import BattleData, BattleEffect, BattleEvent, BattleHelper
+
+
+def test_effects_resolve_in_application_order():
+  # Burning takes 5% of the current HP, so it matters whether the heal lands between the two stacks
+  effects = [
+    {"type": "burning", "target": "self", "chance": 1},
+    {"type": "healing", "target": "self", "chance": 1, "value": 40, "duration": 2},
+    {"type": "burning", "target": "self", "chance": 1}
+  ]
+  template = BattleData.get_npc_template("test-effect-order", {
+    "hp": 300,
+    "skills": {
+      "kindle": {
+        "name": "kindle",
+        "description": "",
+        "physical_damage": 0,
+        "magical_damage": 0,
+        "heal": 0,
+        "shield": 0,
+        "purify": False,
+        "effect": effects,
+        "cooldown": 0
+      }
+    }
+  })
+  BattleData.npcs.pop("test-effect-order")
+
+  entity = template.create_entity()
+  entity.current_hp = 200
+  helper = BattleHelper([BattleData.get_player_template().create_entity(100)], [entity], 1)
+  for effect in entity.skills["kindle"].effect:
+    entity.effects.add(
+      BattleEffect(effect.type, effect.name, effect.negative, False, effect.value, effect.duration, effect.handler, effect.params)
+    )
+
+  helper._refresh_effects(entity)
+
+  # 200 - 10 + 40 - 12, stack by stack as they were applied
+  assert entity.current_hp == 218
+  assert [(event.type, event.key) for event in map(BattleEvent._make, helper.events)] == [
+    ("damage", "burning"),
+    ("heal", "healing"),
+    ("damage", "burning")
+  ]
+  assert [effect.type for effect in entity.effects] == ["burning", "healing", "burning"]
+  assert entity.effects.count("burning") == 2
@@ -0,0 +1,53 @@
+import pytest
+
+from src.battle_ai import BattleAI, EnemyAI
+from src.battle_helper import BattleData
+from src.battle_simulator import BattleSimulator
+
+
+class PassiveAI(EnemyAI):
+  """Never uses a skill"""
+
+  def choose_skills(self, helper, entity):
+    return []
+
+
+@pytest.fixture
+def passive_spider(monkeypatch):
+  """The spider with an AI profile that never attacks, registered under its own NPC id"""
+  monkeypatch.setitem(BattleAI.profiles, "test-passive", PassiveAI)
+  data = BattleData._read_json(BattleData.NPC_PATH.format(name = "spider"))
+  BattleData.get_npc_template("test-sim-passive", dict(data, ai = {"profile": "test-passive"}))
+
+  yield
+
+  BattleData.npcs.pop("test-sim-passive")
+
+
+def test_enemies_play_their_ai_profile(passive_spider):
+  simulator = BattleSimulator(max_turns = 40)
+  spider = simulator.simulate("spider", 1, battles = 30, seed = 3)
+  passive = simulator.simulate("test-sim-passive", 1, battles = 30, seed = 3)
+
+  assert spider.damage_taken > 0
+  assert passive.damage_taken == 0
+  assert passive.wins == passive.battles
+
+
+def test_same_seed_gives_same_result():
+  # The snowman searches with its lookahead profile, playouts don't depend on the time they take
+  simulator = BattleSimulator(max_turns = 30)
+  first = simulator.simulate("snowman", 2, battles = 10, policy = "random", seed = 5)
+  second = simulator.simulate("snowman", 2, battles = 10, policy = "random", seed = 5)
+  other = simulator.simulate("snowman", 2, battles = 10, policy = "random", seed = 6)
+
+  assert first == second
+  assert first.to_dict() == second.to_dict()
+  assert other != first
+
+
+def test_timeouts_count_as_losses():
+  result = BattleSimulator(max_turns = 1).simulate("test-boss", 1, battles = 20, seed = 1)
+
+  assert result.timeouts == result.battles - result.wins
+  assert result.turn_counts == {1: 20}
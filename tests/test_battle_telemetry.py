@@ -0,0 +1,42 @@
+import json
+
+from src.battle_helper import BattleData, BattleHelper
+from src.battle_telemetry import BattleTelemetry, FileSink, RingBufferSink
+
+
+def play_battle() -> BattleHelper:
+  helper = BattleHelper(
+    [BattleData.get_player_template().create_entity(35)],
+    BattleData.create_enemies("thief"),
+    3
+  )
+  while helper.execute_player_turn(["slay"]) is None and helper.execute_enemy_turn() is None:
+    pass
+  return helper
+
+
+def test_memory_sink_receives_every_event():
+  sink = BattleTelemetry.configure("memory")
+  try:
+    helper = play_battle()
+  finally:
+    BattleTelemetry.close()
+
+  assert isinstance(sink, RingBufferSink)
+  assert [event for _, _, event in sink.get_events()] == helper.events
+
+
+def test_file_sink_writes_one_line_per_turn(tmp_path):
+  path = tmp_path / "telemetry.jsonl"
+  sink = BattleTelemetry.configure("file", str(path))
+  try:
+    helper = play_battle()
+  finally:
+    BattleTelemetry.close()
+
+  lines = [json.loads(line) for line in path.read_text(encoding = "utf-8").splitlines()]
+
+  assert isinstance(sink, FileSink)
+  assert len(lines) == helper.turn
+  assert {line["battle"] for line in lines} == {helper.seed}
+  assert [tuple(event) for line in lines for event in line["events"]] == helper.events
@@ -0,0 +1,62 @@
+import pygame
+
+from src.dirty_renderer import DirtyRenderer
+
+
+def test_overlapping_changes_are_drawn_once():
+  positions = {"a": (10, 10), "b": (30, 20), "c": (200, 150)}
+  calls = []
+
+  def draw(target: pygame.Surface):
+    calls.append(target.get_clip())
+    target.fill((255, 255, 255))
+    for x, y in positions.values():
+      target.fill((200, 0, 0), (x, y, 40, 40))
+
+  def get_items() -> dict:
+    return {key: (pygame.Rect(x, y, 40, 40), None) for key, (x, y) in positions.items()}
+
+  surface = pygame.Surface((320, 240))
+  renderer = DirtyRenderer()
+  assert renderer.render(surface, "scene", get_items(), draw) is None
+
+  # a and b overlap after moving, c moves on its own
+  positions.update(a = (16, 12), b = (34, 24), c = (204, 150))
+  calls.clear()
+  dirty = renderer.render(surface, "scene", get_items(), draw)
+
+  assert sorted(map(tuple, dirty)) == [(10, 10, 64, 54), (200, 150, 44, 40)]
+  assert len(calls) == 2
+
+  expected = pygame.Surface((320, 240))
+  draw(expected)
+  assert pygame.image.tobytes(surface, "RGB") == pygame.image.tobytes(expected, "RGB")
+
+
+def test_many_changes_become_one_draw():
+  rects = [pygame.Rect(i * 20, 0, 10, 10) for i in range(DirtyRenderer.MAX_DRAWS + 1)]
+  renderer = DirtyRenderer()
+  surface = pygame.Surface((200, 50))
+  renderer.render(surface, "scene", {}, lambda target: None)
+
+  calls = []
+  dirty = renderer.render(surface, "scene", {i: (rect, None) for i, rect in enumerate(rects)}, calls.append)
+
+  assert dirty == [rects[0].unionall(rects[1:])]
+  assert len(calls) == 1
+
+
+def test_skipped_frames_draw_everything_once_they_stop_changing():
+  surface = pygame.Surface((200, 50))
+  items = {"a": (pygame.Rect(0, 0, 10, 10), None)}
+  calls = []
+  renderer = DirtyRenderer()
+  renderer.render(surface, ("map", (0, 0)), items, calls.append)
+
+  # The caller drew two scrolling frames itself
+  renderer.skip(("map", (4, 0)))
+  renderer.skip(("map", (8, 0)))
+
+  assert renderer.render(surface, ("map", (8, 0)), items, calls.append) is None
+  assert renderer.render(surface, ("map", (8, 0)), items, calls.append) == []
+  assert len(calls) == 2
@@ -0,0 +1,76 @@
+from types import SimpleNamespace
+
+from src import map_cache
+from src.map_loader import MapData, MapLoader
+
+
+def make_loader(name: str) -> tuple[MapLoader, SimpleNamespace]:
+  game = SimpleNamespace(defeated_npcs = set())
+  return MapLoader(name, game), game
+
+
+def win_battle(loader: MapLoader, game: SimpleNamespace, npc_name: str):
+  # What BattleState does after the player wins
+  game.defeated_npcs.add(npc_name)
+  loader.remove_npc(npc_name)
+  loader.reload_objects()
+
+
+def object_images(data: MapData) -> list[tuple]:
+  return sorted((obj.rect.topleft, obj.rect.size) for obj in data.objects)
+
+
+def test_revisit_after_battle_keeps_npc_defeated():
+  loader, game = make_loader("spider_cave")
+  before = object_images(loader.current)
+  win_battle(loader, game, "spider")
+
+  loader.change_map("village")
+  loader.change_map("spider_cave")
+
+  assert [npc.name for npc in loader.npcs] == []
+  assert loader.npc_hash.query(loader.current.bounds) == []
+  # The boss exit shows up, same as a map built from scratch
+  fresh = MapData.load("spider_cave", frozenset(game.defeated_npcs))
+  assert object_images(loader.current) == object_images(fresh)
+  assert object_images(loader.current) != before
+  fresh.release()
+  loader.close()
+
+
+def test_map_cached_before_battle_is_refreshed_on_revisit():
+  loader, game = make_loader("spider_cave")
+  loader.change_map("village")
+  # Defeated somewhere else while spider_cave sat in the cache
+  game.defeated_npcs.add("spider")
+
+  loader.change_map("spider_cave")
+
+  assert loader.current.defeated_npcs == frozenset({"spider"})
+  assert [npc.name for npc in loader.npcs] == []
+  loader.close()
+
+
+def test_refresh_restores_npcs_that_are_no_longer_defeated():
+  data = MapData.load("spider_cave", frozenset({"spider"}))
+  assert len(data.npcs) == 0
+
+  data.refresh(frozenset())
+
+  assert [npc.name for npc in data.npcs] == ["spider"]
+  assert data.npc_hash.query(data.bounds) == list(data.npcs)
+
+
+def test_close_drops_cached_maps_and_shares_the_worker():
+  first, _ = make_loader("village")
+  second, _ = make_loader("bridge")
+  first.request_map("spider_cave")
+
+  first.close()
+  second.close()
+
+  assert first.cache.entries == {} and first.cache.pending == {}
+  assert second.cache.entries == {}
+  # One worker thread for every cache, new games don't start more
+  assert map_cache.executor._max_workers == 1
+  assert len(map_cache.executor._threads) <= 1
@@ -0,0 +1,98 @@
+import pygame
+import pytest
+
+from src import map_cache
+from src.map_cache import MapCache
+from src.map_loader import MapData
+from src.texture_manager import TextureManager
+
+
+@pytest.fixture
+def image_path(tmp_path) -> str:
+  path = tmp_path / "image.png"
+  surface = pygame.Surface((8, 4), pygame.SRCALPHA)
+  surface.fill((200, 100, 50, 255))
+  pygame.image.save(surface, str(path))
+  return str(path)
+
+
+def test_textures_without_owner_are_never_purged(image_path):
+  TextureManager.load(image_path)
+  TextureManager.purge_unused()
+  assert (image_path, True) in TextureManager.textures
+
+
+def test_owned_textures_are_purged_once_every_owner_released(image_path):
+  first: list[tuple] = []
+  second: list[tuple] = []
+  TextureManager.load_scaled(image_path, (16, 8), owner = first)
+  TextureManager.load(image_path, owner = second)
+
+  TextureManager.release(first)
+  TextureManager.purge_unused()
+  assert (image_path, True) in TextureManager.textures
+  assert (image_path, True, (16, 8), False, False) not in TextureManager.textures
+
+  TextureManager.release(second)
+  TextureManager.purge_unused()
+  assert (image_path, True) not in TextureManager.textures
+  assert first == [] and second == []
+
+
+def test_map_textures_live_as_long_as_the_map():
+  data = MapData.load("village", frozenset())
+  keys = set(data.object_textures + data.npc_textures)
+  assert keys
+
+  # Still held while the map exists, even with no other reference around
+  TextureManager.purge_unused()
+  assert all(key in TextureManager.textures for key in keys)
+
+  data.release()
+  TextureManager.purge_unused()
+  for key in keys:
+    held = key in TextureManager.permanent or key in TextureManager.owner_counts
+    assert (key in TextureManager.textures) == held
+
+
+def test_refresh_does_not_hold_object_textures_twice():
+  data = MapData.load("village", frozenset())
+  count = len(data.object_textures)
+
+  data.refresh(frozenset())
+  data.refresh(frozenset())
+
+  assert len(data.object_textures) == count
+  data.release()
+
+
+def test_decoded_images_count_and_are_purged_without_owner(image_path):
+  TextureManager.purge_unused()
+  before = TextureManager.get_memory_usage()
+  TextureManager.decode(image_path)
+  assert TextureManager.get_memory_usage() == before + 8 * 4 * TextureManager.decoded[image_path].get_bytesize()
+
+  assert TextureManager.purge_unused() > 0
+  assert image_path not in TextureManager.decoded
+  assert TextureManager.get_memory_usage() == before
+
+
+def test_decode_after_load_keeps_nothing(image_path):
+  owner: list[tuple] = []
+  TextureManager.load(image_path, owner = owner)
+  TextureManager.decode(image_path)
+
+  assert image_path not in TextureManager.decoded
+  TextureManager.release(owner)
+
+
+def test_dropped_prefetch_gives_back_decoded_images():
+  cache = MapCache(lambda name, defeated_npcs: MapData.parse(name, defeated_npcs))
+  cache.prefetch(["village"], frozenset())
+  cache.clear()
+  # The worker runs one task at a time, this one starts once the prefetch is over
+  map_cache.executor.submit(lambda: None).result()
+
+  TextureManager.purge_unused()
+  assert TextureManager.decoded == {}
+  assert TextureManager.total_size == sum(TextureManager.sizes.values())
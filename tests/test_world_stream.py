@@ -0,0 +1,87 @@
+from types import SimpleNamespace
+import json
+import os
+import shutil
+import time
+
+import pygame
+import pytest
+
+from src.world_stream import StreamingMapLoader, WorldRegion
+
+
+@pytest.fixture
+def stitched_assets(tmp_path, monkeypatch):
+  """
+  The real assets plus two copies of test-map-right, the second stitched east of
+  the first and 4 tiles lower. That leaves a gap above the east map and one below
+  the west map.
+  """
+  root = os.getcwd()
+  assets = tmp_path / "assets"
+  (assets / "map").mkdir(parents = True)
+  for entry in os.listdir(os.path.join(root, "assets")):
+    if entry != "map":
+      os.symlink(os.path.join(root, "assets", entry), assets / entry)
+  for entry in os.listdir(os.path.join(root, "assets", "map")):
+    os.symlink(os.path.join(root, "assets", "map", entry), assets / "map" / entry)
+
+  for name, stitch in (("zz_west", {"east": {"map": "zz_east", "offset": 4}}), ("zz_east", {})):
+    shutil.copytree(os.path.join(root, "assets", "map", "test-map-right"), assets / "map" / name)
+    meta_path = assets / "map" / name / "map.meta.json"
+    meta = json.loads(meta_path.read_text(encoding = "utf-8"))
+    meta["stitch"] = stitch
+    meta["exit"] = []
+    meta["music"] = ""
+    meta_path.write_text(json.dumps(meta, ensure_ascii = False), encoding = "utf-8")
+
+  monkeypatch.chdir(tmp_path)
+  monkeypatch.setattr(WorldRegion, "links", None)
+  monkeypatch.setattr(WorldRegion, "layouts", {})
+
+
+def load_region(name: str) -> StreamingMapLoader:
+  loader = StreamingMapLoader(name, SimpleNamespace(defeated_npcs = set()))
+  view = pygame.Rect((0, 0), loader.pixel_size)
+
+  deadline = time.perf_counter() + 10
+  while len(loader.loaded) < len(loader.region.origins):
+    assert time.perf_counter() < deadline, "Neighbour maps were never streamed in"
+    loader.update(pygame.Rect(0, 0, 1, 1), view)
+    time.sleep(0.01)
+
+  return loader
+
+
+def test_walk_across_seam_but_not_into_gaps(stitched_assets):
+  loader = load_region("zz_west")
+  try:
+    west = loader.region.get_bounds("zz_west")
+    east = loader.region.get_bounds("zz_east")
+    assert east.topleft == (west.right, west.top + 4 * 40)
+
+    # A player sized rect walking east along the bottom row of the west map, which has no walls
+    rect = pygame.Rect(0, 0, 30, 30)
+    rect.center = (west.right - 100, west.bottom - 20)
+    for _ in range(10):
+      rect.x += 20
+      assert not loader.is_blocked(rect)
+    assert loader.region.find(*rect.center) == "zz_east"
+
+    # Further down would be the gap below the west map
+    rect.x = west.left + 100
+    assert not loader.is_blocked(rect)
+    rect.y += 20
+    assert loader.is_blocked(rect)
+
+    # The top row of the east map is free, north of it is the gap above
+    rect.topleft = (east.left + 100, east.top + 5)
+    assert not loader.is_blocked(rect)
+    rect.y -= 20
+    assert loader.is_blocked(rect)
+
+    # Past the region's edges
+    assert loader.is_blocked(pygame.Rect(east.right - 10, east.top + 5, 30, 30))
+    assert loader.is_blocked(pygame.Rect(west.left - 10, west.bottom - 35, 30, 30))
+  finally:
+    loader.close()